@@ -2,10 +2,23 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Any
 import os
+import sys
 import logging
 import logging
 import hashlib
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Root del progetto nel path: il backtest su tick usa core/ e utils/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+if os.path.dirname(os.path.abspath(__file__)) not in sys.path:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from search_strategies import SEARCH_STRATEGIES, create_search_strategy
+from result_cache import BacktestResultCache, files_version, source_version
 
 
 
@@ -34,12 +47,67 @@ import random
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Specifiche broker per il backtest su tick (l'archivio contiene solo prezzi); i simboli non elencati
+# usano i default di SimulatedMT5 (forex a 5 decimali, contratto 100000)
+BACKTEST_SYMBOL_SPECS = {
+    'USDJPY': {'point': 0.001, 'digits': 3},
+    'XAUUSD': {'point': 0.01, 'digits': 2, 'contract_size': 100.0},
+    'XAGUSD': {'point': 0.001, 'digits': 3, 'contract_size': 5000.0},
+    'SP500': {'point': 0.01, 'digits': 2, 'contract_size': 1.0},
+    'NAS100': {'point': 0.01, 'digits': 2, 'contract_size': 1.0},
+    'US30': {'point': 0.01, 'digits': 2, 'contract_size': 1.0},
+    'BTCUSD': {'point': 0.01, 'digits': 2, 'contract_size': 1.0},
+    'ETHUSD': {'point': 0.01, 'digits': 2, 'contract_size': 1.0},
+}
+
+
+# Parametri della griglia di run_parameter_optimization, nell'ordine dei cicli annidati originali
+PARAM_GRID_KEYS = ('risk_percent', 'max_daily_trades', 'stop_loss_pips', 'take_profit_pips', 'signal_threshold', 'spin_threshold')
+# Combinazioni per unità di lavoro inviata a un processo worker
+DEFAULT_OPTIMIZER_CHUNK_SIZE = 256
+# Percorso della cache persistente degli score quando è attivata con result_cache=True
+DEFAULT_RESULT_CACHE_PATH = os.path.join(PROJECT_ROOT, 'data', 'optimizer_cache.sqlite')
+# Sorgenti che determinano lo score: la loro modifica invalida la cache dei risultati
+BACKTEST_CODE_FILES = (
+    os.path.abspath(__file__),
+    os.path.join(PROJECT_ROOT, 'core', 'backtest_engine.py'),
+    os.path.join(PROJECT_ROOT, 'core', 'quantum_engine.py'),
+    os.path.join(PROJECT_ROOT, 'core', 'quantum_risk_manager.py'),
+    os.path.join(PROJECT_ROOT, 'core', 'simulated_mt5.py'),
+)
+
+_worker_optimizer = None
+
+
+def _init_worker(optimizer_kwargs: dict) -> None:
+    """Inizializzatore dei processi worker: un optimizer seriale per processo, riusato per tutte le unità."""
+    global _worker_optimizer
+    _worker_optimizer = AutonomousHighStakesOptimizer(**optimizer_kwargs)
+
+
+def _evaluate_unit(unit: tuple) -> tuple:
+    return _worker_optimizer.evaluate_work_unit(*unit)
+
+
+def _unit_seed(symbol: str, days: int, mode: str, unit_index: int) -> int:
+    """Seed deterministico dell'unità: stesso risultato con qualunque numero di worker e ordine di completamento."""
+    return int(hashlib.md5(f"{symbol}_{days}_{mode}_{unit_index}".encode()).hexdigest()[:8], 16)
+
+
 class AutonomousHighStakesOptimizer:
     def simulate_backtest_score(self, symbol, risk, trades, sl_pips, tp_pips, signal_th, days, spin_th):
         """
-        Simula uno score di backtest per la combinazione di parametri fornita.
-        Usa una funzione pseudo-casuale basata su hash per garantire ripetibilità.
+        Score di backtest per la combinazione di parametri fornita.
+        Con tick registrati per il simbolo (archivio self.tick_archive) esegue il backtest reale
+        sugli ultimi `days` giorni con la logica di produzione (core.backtest_engine); altrimenti
+        ripiega sullo score sintetico, pseudo-casuale ma ripetibile (hash dei parametri).
         """
+        backtest = self._get_backtest(symbol)
+        if backtest is not None:
+            config = self.build_backtest_config(symbol, risk, trades, sl_pips, tp_pips, signal_th, spin_th)
+            _, last_msc = backtest.time_range()
+            result = backtest.run(config, start_msc=last_msc - int(days) * 86400 * 1000)
+            return self.score_backtest_result(result)
         # Crea un seed unico per la combinazione di parametri
         seed_str = f"{symbol}_{risk}_{trades}_{sl_pips}_{tp_pips}_{signal_th}_{days}_{spin_th}"
         seed = int(hashlib.md5(seed_str.encode()).hexdigest()[:8], 16)
@@ -59,6 +127,85 @@ class AutonomousHighStakesOptimizer:
             score += 10
         return max(score, 0)
 
+    def _get_backtest(self, symbol, dataset=None):
+        """
+        BacktestEngine del simbolo (creato una volta), None se non ci sono tick: sul dataset condiviso
+        pubblicato dal processo principale se indicato (worker), altrimenti sui tick dell'archivio.
+        """
+        if symbol not in self._backtests:
+            self._backtests[symbol] = None
+            try:
+                from utils.tick_archive import archive_files
+                if dataset or (self.tick_archive and archive_files(self.tick_archive, symbol)):
+                    from core.backtest_engine import BacktestEngine
+                    from utils.hot_log import hot_log
+                    hot_log.configure('quiet')  # nessun log INFO per ordine durante migliaia di run
+                    options = dict(initial_balance=self.high_stakes_params['account_balance'],
+                                   leverage=self.high_stakes_params['leverage'],
+                                   symbol_specs=BACKTEST_SYMBOL_SPECS)
+                    if dataset:
+                        self._backtests[symbol] = BacktestEngine.from_shared({symbol: dataset}, [symbol], **options)
+                        logger.info(f"Backtest su tick reali per {symbol} (dataset condiviso {dataset})")
+                    else:
+                        self._backtests[symbol] = BacktestEngine.from_archive(self.tick_archive, [symbol], **options)
+                        logger.info(f"Backtest su tick reali per {symbol} ({self.tick_archive})")
+            except ImportError as e:
+                logger.warning(f"Backtest su tick non disponibile ({e}): score sintetico per {symbol}")
+            if self._backtests[symbol] is None:
+                logger.info(f"Nessun tick registrato per {symbol}: score sintetico")
+        return self._backtests[symbol]
+
+    def _shared_dataset(self, symbol):
+        """
+        Con più worker: tick dell'archivio del simbolo caricati una volta nel processo principale e
+        pubblicati come file in memory map (utils.shared_ticks), path passato ai worker; None altrimenti.
+        """
+        if self.workers <= 1:
+            return None
+        if symbol not in self._shared_paths:
+            self._shared_paths[symbol] = None
+            try:
+                from utils.tick_archive import archive_files
+                if self.tick_archive and archive_files(self.tick_archive, symbol):
+                    from core.backtest_engine import share_archive
+                    from utils.shared_ticks import SharedTickStore
+                    if self._tick_store is None:
+                        self._tick_store = SharedTickStore()
+                    self._shared_paths.update(share_archive(self._tick_store, self.tick_archive, [symbol]))
+                    logger.info(f"Tick di {symbol} condivisi con i worker ({self._shared_paths[symbol]})")
+            except ImportError as e:
+                logger.warning(f"Dataset condiviso non disponibile ({e}): ogni worker carica i tick di {symbol}")
+        return self._shared_paths[symbol]
+
+    def build_backtest_config(self, symbol, risk, trades, sl_pips, tp_pips, signal_th, spin_th) -> Dict:
+        """Config di produzione (template base) con i parametri della combinazione da valutare."""
+        config = self.create_base_config_template()
+        config['initial_balance'] = self.high_stakes_params['account_balance']
+        config['symbols'] = {symbol: {'enabled': True}}
+        qp = config['quantum_params']
+        qp['spin_threshold'] = spin_th
+        qp['entropy_thresholds'] = {'buy_signal': signal_th, 'sell_signal': round(1 - signal_th, 4)}
+        rp = config['risk_parameters']
+        rp['risk_percent'] = risk
+        rp['max_daily_trades'] = trades
+        rp['stop_loss_pips'] = sl_pips
+        rp['base_sl_pips'] = sl_pips
+        rp['profit_multiplier'] = tp_pips / max(sl_pips, 1)
+        return config
+
+    def score_backtest_result(self, result) -> float:
+        """
+        Score di un BacktestResult: rendimento % premiato, drawdown massimo % penalizzato,
+        bonus per profit factor > 1; penalità se il drawdown supera daily_loss_limit della challenge.
+        """
+        if result.n_trades == 0:
+            return 0.0
+        profit_factor = min(result.profit_factor, 3.0)
+        score = 10 * result.return_pct - 5 * result.max_drawdown_pct * 100 + 20 * (profit_factor - 1)
+        if result.max_drawdown > self.high_stakes_params['daily_loss_limit']:
+            score -= 30
+        return max(score, 0)
+
     def get_symbol_max_spread(self, symbol: str) -> float:
         """
         Restituisce lo spread massimo consentito per il simbolo specificato.
@@ -384,8 +531,40 @@ class AutonomousHighStakesOptimizer:
         raw_spin = (positive - negative) / total
         return raw_spin
 
-    def __init__(self, optimization_days=60, output_dir=None, mode="intraday"):
+    def __init__(self, optimization_days=60, output_dir=None, mode="intraday", tick_archive=None,
+                 workers=1, chunk_size=DEFAULT_OPTIMIZER_CHUNK_SIZE, search='grid', search_budget=None,
+                 search_patience=None, search_seed=0, result_cache=False):
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
+        # Cache persistente degli score, opt-in (path del file SQLite, True = DEFAULT_RESULT_CACHE_PATH):
+        # run ripetuti e incrementali valutano solo le combinazioni nuove
+        if result_cache is True:
+            result_cache = DEFAULT_RESULT_CACHE_PATH
+        self.result_cache = BacktestResultCache(result_cache) if result_cache else None
+        self._code_version = None
+        # Strategia di ricerca (search_strategies.SEARCH_STRATEGIES): budget in valutazioni sulla finestra
+        # completa, patience = valutazioni complete senza miglioramento prima dello stop
+        if search not in SEARCH_STRATEGIES:
+            raise ValueError(f"Strategia di ricerca non valida: {search}")
+        if search_budget is not None and search_budget < 1:
+            raise ValueError(f"search_budget deve essere almeno 1 (una valutazione sulla finestra completa): {search_budget}")
+        self.search = search
+        self.search_budget = search_budget
+        self.search_patience = search_patience
+        self.search_seed = search_seed
+        self.search_results = {}
+        # Ricerca parametri seriale per default; workers > 1 (opt-in) la distribuisce su più processi
+        self.workers = max(1, int(workers))
+        self.chunk_size = max(1, int(chunk_size))
+        self._executor = None
+        self._worker_kwargs = {'optimization_days': optimization_days, 'output_dir': output_dir, 'mode': mode,
+                               'tick_archive': tick_archive, 'workers': 1, 'chunk_size': chunk_size, 'search': search,
+                               'result_cache': False}
+        # Archivio tick del recorder (default data/ticks): se presente lo score viene da backtest reale
+        self.tick_archive = tick_archive or os.path.join(PROJECT_ROOT, 'data', 'ticks')
+        self._backtests = {}
+        # Tick condivisi con i worker: un dataset in memory map per simbolo, rimosso da close()
+        self._tick_store = None
+        self._shared_paths = {}
         # Imposta la directory di output su 'config' nella root del progetto
         config_dir = os.path.join(os.path.dirname(self.base_dir), "config")
         self.output_dir = output_dir or config_dir
@@ -588,34 +767,139 @@ class AutonomousHighStakesOptimizer:
         return base_config
 
     def run_parameter_optimization(self, symbol: str, days: int = 30, mode: str = "intraday") -> Dict:
-        seed_str = f"{symbol}_{days}_{mode}"
-        seed = int(hashlib.md5(seed_str.encode()).hexdigest()[:8], 16)
-        random.seed(seed)
-        best_params = {}
-        best_score = 0
-        # Usa i range specifici per la tipologia
+        return self.run_parameter_optimization_batch([symbol], days, mode)[symbol]
+
+    def run_parameter_optimization_batch(self, symbols: List[str], days: int = 30, mode: str = "intraday") -> Dict[str, Dict]:
+        """
+        Ricerca dei parametri (PARAM_GRID_KEYS sui range della tipologia) per più simboli con la strategia
+        self.search: a ogni giro le proposte di tutti i simboli sono divise in unità da chunk_size combinazioni
+        (stessa finestra di giorni) valutate dai processi worker, poi restituite alle strategie.
+        Con 'grid' il migliore è lo score più alto, a parità la combinazione che precede nell'ordine della
+        griglia (stesso esito della scansione seriale). {symbol: best_params}, {} se nessuna prova completa.
+        """
         param_ranges = self.get_param_ranges_for_mode(mode)
-        for risk in param_ranges['risk_percent']:
-            for trades in param_ranges['max_daily_trades']:
-                for sl_pips in param_ranges['stop_loss_pips']:
-                    for tp_pips in param_ranges['take_profit_pips']:
-                        for signal_th in param_ranges['signal_threshold']:
-                            for spin_th in param_ranges['spin_threshold']:
-                                score = self.simulate_backtest_score(
-                                    symbol, risk, trades, sl_pips, tp_pips, signal_th, days, spin_th
-                                )
-                                if score > best_score:
-                                    best_score = score
-                                    best_params = {
-                                        'risk_percent': risk,
-                                        'max_daily_trades': trades,
-                                        'stop_loss_pips': sl_pips,
-                                        'take_profit_pips': tp_pips,
-                                        'signal_threshold': signal_th,
-                                        'spin_threshold': spin_th,
-                                        'score': score
-                                    }
-        return best_params
+        space = {key: param_ranges[key] for key in PARAM_GRID_KEYS}
+        strategies = {
+            symbol: create_search_strategy(
+                self.search, space, days, budget=self.search_budget, patience=self.search_patience,
+                seed=_unit_seed(symbol, days, mode, -1) ^ self.search_seed, batch_size=max(8, 2 * self.workers))
+            for symbol in symbols
+        }
+        unit_counters = {symbol: 0 for symbol in symbols}
+        code_version = self.code_version()
+        data_versions = {symbol: self.data_version(symbol) for symbol in symbols}
+        cache_hits = self.result_cache.hits if self.result_cache is not None else 0
+        datasets = {symbol: self._shared_dataset(symbol) for symbol in symbols}
+        started = time.time()
+        last_report = started
+        evaluated = 0
+        while True:
+            proposals = {symbol: strategy.ask() for symbol, strategy in strategies.items() if not strategy.done}
+            proposals = {symbol: asked for symbol, asked in proposals.items() if asked}
+            if not proposals:
+                break
+            units, positions = [], {}
+            scores = {symbol: [None] * len(asked) for symbol, asked in proposals.items()}
+            for symbol, asked in proposals.items():
+                by_days = {}
+                for position, (combo, unit_days) in enumerate(asked):
+                    by_days.setdefault(unit_days, []).append(position)
+                for unit_days, indexes in by_days.items():
+                    if self.result_cache is not None:
+                        cached = self.result_cache.lookup(symbol, mode, unit_days, data_versions[symbol], code_version,
+                                                          [asked[i][0] for i in indexes])
+                        for i in indexes:
+                            if asked[i][0] in cached:
+                                scores[symbol][i] = cached[asked[i][0]]
+                        indexes = [i for i in indexes if scores[symbol][i] is None]
+                    for offset in range(0, len(indexes), self.chunk_size):
+                        chunk = indexes[offset:offset + self.chunk_size]
+                        unit_index = unit_counters[symbol]
+                        unit_counters[symbol] += 1
+                        positions[(symbol, unit_index)] = chunk
+                        units.append((symbol, unit_days, mode, unit_index, [asked[i][0] for i in chunk], datasets[symbol]))
+            for symbol, unit_index, unit_scores in self._map_units(units):
+                chunk = positions[(symbol, unit_index)]
+                for position, score in zip(chunk, unit_scores):
+                    scores[symbol][position] = score
+                if self.result_cache is not None:
+                    asked = proposals[symbol]
+                    self.result_cache.store(symbol, mode, asked[chunk[0]][1], data_versions[symbol], code_version,
+                                            [asked[i][0] for i in chunk], unit_scores)
+                evaluated += len(unit_scores)
+                now = time.time()
+                if now - last_report >= 10:
+                    last_report = now
+                    logger.info(f"[OPT] {self.search} {mode} {days}g: {evaluated} valutazioni, "
+                                f"{evaluated / max(now - started, 1e-9):.0f}/s")
+            for symbol, asked in proposals.items():
+                strategies[symbol].tell(asked, scores[symbol])
+        results = {}
+        for symbol, strategy in strategies.items():
+            result = strategy.result()
+            self.search_results[symbol] = result
+            logger.info(f"[OPT] {symbol} {self.search} {mode} {days}g: {result.evaluations} valutazioni "
+                        f"(budget {result.budget_used:.1f}), best {result.best_score:.2f} su {result.best_days}g, stop={result.stop_reason}, "
+                        f"{result.elapsed:.1f}s")
+            results[symbol] = strategy.best_params() or {}
+        if self.result_cache is not None:
+            logger.info(f"[OPT] cache {self.result_cache.path}: {self.result_cache.hits - cache_hits} score riusati, "
+                        f"{evaluated} calcolati")
+        return results
+
+    def code_version(self) -> str:
+        """Versione del codice di scoring (hash di BACKTEST_CODE_FILES), calcolata una volta per processo."""
+        if self._code_version is None:
+            self._code_version = source_version(BACKTEST_CODE_FILES)
+        return self._code_version
+
+    def data_version(self, symbol: str) -> str:
+        """Versione dei dati del simbolo: file dell'archivio tick, 'synthetic' se lo score è sintetico."""
+        try:
+            from utils.tick_archive import archive_files
+        except ImportError:
+            return 'synthetic'
+        files = archive_files(self.tick_archive, symbol) if self.tick_archive else []
+        return files_version(files) if files else 'synthetic'
+
+    def evaluate_work_unit(self, symbol: str, days: int, mode: str, unit_index: int, combos: list, dataset: str = None) -> tuple:
+        """
+        Valuta un blocco di combinazioni sulla finestra di `days` giorni: (symbol, unit_index, score nell'ordine di combos).
+        dataset: path dei tick condivisi del simbolo (_shared_dataset), usato al primo backtest del processo.
+        """
+        if dataset:
+            self._get_backtest(symbol, dataset)
+        random.seed(_unit_seed(symbol, days, mode, unit_index))
+        scores = [
+            self.simulate_backtest_score(symbol, risk, trades, sl_pips, tp_pips, signal_th, days, spin_th)
+            for risk, trades, sl_pips, tp_pips, signal_th, spin_th in combos
+        ]
+        return symbol, unit_index, scores
+
+    def _map_units(self, units: list):
+        """Esegue le unità sul pool di processi (risultati in ordine di completamento) o in serie con un solo worker."""
+        if self.workers <= 1 or len(units) <= 1:
+            for unit in units:
+                yield self.evaluate_work_unit(*unit)
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(self._worker_kwargs,))
+        futures = [self._executor.submit(_evaluate_unit, unit) for unit in units]
+        for future in as_completed(futures):
+            yield future.result()
+
+    def close(self) -> None:
+        """Chiude il pool di processi worker, la connessione alla cache e i dataset condivisi (ricreati alla prossima ricerca)."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self.result_cache is not None:
+            self.result_cache.close()
+        if self._tick_store is not None:
+            self._tick_store.close()
+            self._tick_store = None
+            self._shared_paths = {}
 
     def optimize_symbol_parameters(self, symbol: str, aggressiveness: str, mode: str = "intraday") -> Dict:
         base_params = self.run_parameter_optimization(symbol, self.optimization_days, mode)
@@ -714,10 +998,9 @@ class AutonomousHighStakesOptimizer:
         return optimized_params
 
     def select_optimal_symbols(self, aggressiveness: str, mode: str = "intraday") -> list:
-        symbol_scores = {}
-        for symbol in self.available_symbols:
-            params = self.run_parameter_optimization(symbol, 14, mode)
-            symbol_scores[symbol] = params['score']
+        # Griglie di tutti i simboli distribuite insieme sul pool
+        results = self.run_parameter_optimization_batch(self.available_symbols, 14, mode)
+        symbol_scores = {symbol: params['score'] for symbol, params in results.items()}
         sorted_symbols = sorted(symbol_scores.items(), key=lambda x: x[1], reverse=True)
         symbol_counts = {
             'conservative': 4,
@@ -1003,9 +1286,28 @@ def main():
                         default_days = giorni_ottimali.get(mode, 60)
                         days = input(f"📅 Giorni per ottimizzazione (default: {default_days}): ").strip()
                         optimization_days = int(days) if days.isdigit() else default_days
-                        optimizer = AutonomousHighStakesOptimizer(optimization_days)
+                        search = input(f"🔎 Strategia di ricerca ({'/'.join(SEARCH_STRATEGIES)}, default: grid): ").strip().lower() or 'grid'
+                        if search not in SEARCH_STRATEGIES:
+                            print("❌ Strategia non valida, uso grid.")
+                            search = 'grid'
+                        budget = input("💰 Budget valutazioni per simbolo (vuoto = illimitato): ").strip() if search != 'grid' else ''
+                        if budget and not (budget.isdigit() and int(budget) >= 1):
+                            print("❌ Budget non valido (intero >= 1), uso budget illimitato.")
+                            budget = ''
+                        workers = input(f"⚙️ Processi worker (default: 1 = seriale, max consigliato: {os.cpu_count() or 1}): ").strip()
+                        if workers and not (workers.isdigit() and int(workers) >= 1):
+                            print("❌ Numero di worker non valido, uso l'esecuzione seriale.")
+                            workers = ''
+                        use_cache = input(f"🗄️ Riusa gli score in cache ({DEFAULT_RESULT_CACHE_PATH})? (s/N): ").strip().lower() == 's'
+                        optimizer = AutonomousHighStakesOptimizer(optimization_days, search=search,
+                                                                  search_budget=int(budget) if budget.isdigit() else None,
+                                                                  workers=int(workers) if workers else 1,
+                                                                  result_cache=use_cache)
                         print(f"\n🔄 Generazione configurazioni per tipologia '{mode}' ({optimization_days} giorni)...")
-                        optimizer.generate_all_configs(mode)
+                        try:
+                            optimizer.generate_all_configs(mode)
+                        finally:
+                            optimizer.close()
                         print("\n📄 Tutte le configurazioni per tipologia trading generate e salvate.")
                         break
                 elif choice == "2":
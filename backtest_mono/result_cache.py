@@ -0,0 +1,110 @@
+# result_cache.py
+"""
+Modulo result_cache: cache persistente (SQLite) degli score dell'optimizer per simbolo, tipologia,
+finestra di giorni, combinazione di parametri, versione dei dati e versione del codice.
+Letture e scritture avvengono solo nel processo principale; i worker valutano le combinazioni mancanti.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    symbol TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    data_version TEXT NOT NULL,
+    code_version TEXT NOT NULL,
+    params TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (symbol, mode, days, data_version, code_version, params)
+)
+"""
+
+
+def source_version(paths: Iterable[str]) -> str:
+    """Hash del contenuto dei sorgenti che determinano lo score: cambia a ogni modifica della logica."""
+    digest = hashlib.md5()
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(os.path.basename(path).encode())
+    return digest.hexdigest()[:16]
+
+
+def files_version(paths: Sequence[str]) -> str:
+    """Versione di un insieme di file dati (nome, dimensione, mtime): cambia quando l'archivio viene aggiornato."""
+    digest = hashlib.md5()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+class BacktestResultCache:
+    """Score memoizzati su disco; le combinazioni sono serializzate come lista JSON nell'ordine di PARAM_GRID_KEYS."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _params_key(combo: Sequence) -> str:
+        return json.dumps(list(combo))
+
+    def lookup(self, symbol: str, mode: str, days: int, data_version: str, code_version: str,
+               combos: Sequence[tuple]) -> Dict[tuple, float]:
+        """Score già calcolati per le combinazioni richieste: {combo: score} solo per quelle in cache."""
+        wanted = {self._params_key(combo): combo for combo in combos}
+        found = {}
+        if wanted:
+            rows = self._connect().execute(
+                "SELECT params, score FROM scores WHERE symbol=? AND mode=? AND days=? AND data_version=? AND code_version=?",
+                (symbol, mode, int(days), data_version, code_version)
+            )
+            for params, score in rows:
+                combo = wanted.get(params)
+                if combo is not None:
+                    found[combo] = score
+        self.hits += len(found)
+        self.misses += len(wanted) - len(found)
+        return found
+
+    def store(self, symbol: str, mode: str, days: int, data_version: str, code_version: str,
+              combos: Sequence[tuple], scores: List[float]) -> None:
+        """Salva gli score calcolati (una transazione per blocco)."""
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(symbol, mode, int(days), data_version, code_version, self._params_key(combo), float(score))
+                 for combo, score in zip(combos, scores)]
+            )
+
+    def clear(self) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM scores")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
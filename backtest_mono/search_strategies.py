@@ -0,0 +1,322 @@
+# search_strategies.py
+"""
+Modulo search_strategies: strategie di ricerca dei parametri per l'optimizer (griglia, random,
+successive halving / Hyperband su finestre di tick ridotte, TPE) con interfaccia ask/tell comune,
+budget condiviso, early stopping e risultato uniforme.
+"""
+import math
+import random
+import time
+from itertools import product
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class Trial(NamedTuple):
+    params: tuple
+    days: int
+    score: float
+
+
+class SearchResult(NamedTuple):
+    """Esito di una ricerca: migliore combinazione (best_days = finestra su cui è stata valutata) e storico delle prove."""
+    strategy: str
+    best_params: Optional[tuple]
+    best_score: float
+    best_days: int
+    trials: Tuple[Trial, ...]
+    evaluations: int
+    budget_used: float
+    stop_reason: str
+    elapsed: float
+
+
+class SearchStrategy:
+    """
+    Base ask/tell: ask() propone una lista di (combinazione, giorni) da valutare, tell() riceve
+    gli score nello stesso ordine. Le proposte di un ask possono essere valutate in parallelo.
+
+    - budget: costo massimo in valutazioni equivalenti alla finestra completa (una prova su
+      `days` giorni costa days / max_days); None = nessun limite.
+    - patience: stop dopo tante valutazioni sulla finestra completa senza miglioramento del best.
+    Il best considera le prove sulla finestra completa; a parità vince la prima valutata. Se il budget
+    finisce prima che una prova arrivi alla finestra completa (halving/hyperband con budget piccolo)
+    il risultato ripiega sulla migliore prova della finestra più lunga valutata.
+    """
+
+    name = 'base'
+
+    def __init__(self, space: Dict[str, Sequence], max_days: int, budget: Optional[float] = None,
+                 patience: Optional[int] = None, seed: int = 0, batch_size: int = 64):
+        self.space = {key: list(values) for key, values in space.items()}
+        self.keys = tuple(self.space)
+        self.max_days = int(max_days)
+        if budget is not None and budget < 1:
+            raise ValueError(f"Budget di ricerca troppo piccolo: {budget} (minimo 1 valutazione sulla finestra completa)")
+        self.budget = budget
+        self.patience = patience
+        self.batch_size = max(1, int(batch_size))
+        self.rng = random.Random(seed)
+        self.trials: List[Trial] = []
+        self.spent = 0.0
+        self.best: Optional[Trial] = None
+        self.stop_reason: Optional[str] = None
+        self._since_improvement = 0
+        self._seen = set()
+        self._started = time.time()
+
+    @property
+    def size(self) -> int:
+        return math.prod(len(values) for values in self.space.values())
+
+    @property
+    def done(self) -> bool:
+        return self.stop_reason is not None
+
+    def _cost(self, days: int) -> float:
+        return days / self.max_days
+
+    def _random_combo(self) -> tuple:
+        return tuple(self.rng.choice(self.space[key]) for key in self.keys)
+
+    def _sample_unseen(self, count: int) -> List[tuple]:
+        """Fino a `count` combinazioni casuali mai proposte (senza ripetizioni)."""
+        remaining = self.size - len(self._seen)
+        combos = []
+        attempts = 0
+        while len(combos) < min(count, remaining) and attempts < 50 * count:
+            attempts += 1
+            combo = self._random_combo()
+            if combo not in self._seen:
+                self._seen.add(combo)
+                combos.append(combo)
+        return combos
+
+    def _propose(self) -> List[Tuple[tuple, int]]:
+        raise NotImplementedError
+
+    def _observe(self, proposals: List[Tuple[tuple, int]], scores: List[float]) -> None:
+        pass
+
+    def ask(self) -> List[Tuple[tuple, int]]:
+        if self.done:
+            return []
+        proposals = self._propose()
+        if self.budget is not None:
+            allowed = []
+            cost = self.spent
+            for combo, days in proposals:
+                if cost + self._cost(days) > self.budget + 1e-9:
+                    break
+                cost += self._cost(days)
+                allowed.append((combo, days))
+            if not allowed and proposals:
+                self.stop_reason = 'budget'
+            proposals = allowed
+        if not proposals and not self.done:
+            self.stop_reason = 'exhausted'
+        return proposals
+
+    def tell(self, proposals: List[Tuple[tuple, int]], scores: List[float]) -> None:
+        for (combo, days), score in zip(proposals, scores):
+            self.trials.append(Trial(combo, days, score))
+            self.spent += self._cost(days)
+            if days >= self.max_days:
+                if self.best is None or score > self.best.score:
+                    self.best = Trial(combo, days, score)
+                    self._since_improvement = 0
+                else:
+                    self._since_improvement += 1
+        self._observe(proposals, scores)
+        if self.budget is not None and self.spent >= self.budget - 1e-9:
+            self.stop_reason = 'budget'
+        elif self.patience is not None and self._since_improvement >= self.patience:
+            self.stop_reason = 'patience'
+
+    def best_trial(self) -> Optional[Trial]:
+        """Migliore prova sulla finestra completa, altrimenti sulla finestra più lunga valutata (None senza prove)."""
+        if self.best is not None or not self.trials:
+            return self.best
+        longest = max(trial.days for trial in self.trials)
+        return max((trial for trial in self.trials if trial.days == longest), key=lambda trial: trial.score)
+
+    def result(self) -> SearchResult:
+        best = self.best_trial()
+        return SearchResult(
+            strategy=self.name,
+            best_params=best.params if best else None,
+            best_score=best.score if best else float('-inf'),
+            best_days=best.days if best else 0,
+            trials=tuple(self.trials),
+            evaluations=len(self.trials),
+            budget_used=self.spent,
+            stop_reason=self.stop_reason or 'exhausted',
+            elapsed=time.time() - self._started,
+        )
+
+    def best_params(self) -> Optional[Dict]:
+        """Migliore combinazione (best_trial) come dict chiave -> valore con 'score', None senza prove."""
+        best = self.best_trial()
+        if best is None:
+            return None
+        return dict(zip(self.keys, best.params), score=best.score)
+
+
+class GridSearch(SearchStrategy):
+    """Prodotto cartesiano completo nell'ordine delle chiavi (la ricerca storica dell'optimizer)."""
+
+    name = 'grid'
+
+    def _propose(self):
+        if self._seen:
+            return []
+        self._seen.add(None)
+        return [(combo, self.max_days) for combo in product(*(self.space[key] for key in self.keys))]
+
+
+class RandomSearch(SearchStrategy):
+    """Combinazioni casuali senza ripetizioni, batch_size per ask, sulla finestra completa."""
+
+    name = 'random'
+
+    def _propose(self):
+        return [(combo, self.max_days) for combo in self._sample_unseen(self.batch_size)]
+
+
+class SuccessiveHalving(SearchStrategy):
+    """
+    Successive halving sulla finestra di tick: n combinazioni casuali valutate su max_days / eta^s
+    giorni, il miglior 1/eta passa alla finestra eta volte più lunga, fino a max_days.
+    Con budget residuo ricomincia con nuove combinazioni.
+    """
+
+    name = 'halving'
+
+    def __init__(self, space, max_days, eta: int = 3, min_days: int = 1, **kwargs):
+        super().__init__(space, max_days, **kwargs)
+        self.eta = max(2, int(eta))
+        self.min_days = max(1, min(int(min_days), self.max_days))
+        self.s_max = int(math.floor(math.log(self.max_days / self.min_days, self.eta) + 1e-9))
+        self._rung = []       # combinazioni del gradino corrente
+        self._rung_days = 0
+        self._rung_left = 0   # gradini ancora da valutare nel bracket corrente
+        self._bracket = 0
+
+    def _brackets(self) -> List[int]:
+        return [self.s_max]
+
+    def _days(self, s: int) -> int:
+        return max(self.min_days, int(round(self.max_days / self.eta ** s)))
+
+    def _start_bracket(self) -> bool:
+        brackets = self._brackets()
+        s = brackets[self._bracket % len(brackets)]
+        if self._bracket >= len(brackets) and self.budget is None:
+            return False
+        self._bracket += 1
+        n = int(math.ceil((self.s_max + 1) / (s + 1) * self.eta ** s))
+        self._rung = self._sample_unseen(n)
+        self._rung_days = self._days(s)
+        self._rung_left = s
+        return bool(self._rung)
+
+    def _propose(self):
+        if not self._rung and not self._start_bracket():
+            return []
+        return [(combo, self._rung_days) for combo in self._rung]
+
+    def _observe(self, proposals, scores):
+        if self._rung_left == 0:
+            self._rung = []
+            return
+        ranked = sorted(range(len(proposals)), key=lambda i: -scores[i])
+        keep = max(1, len(proposals) // self.eta)
+        self._rung = [proposals[i][0] for i in sorted(ranked[:keep])]
+        self._rung_left -= 1
+        self._rung_days = self._days(self._rung_left)
+
+
+class Hyperband(SuccessiveHalving):
+    """Hyperband: successive halving ripetuto su tutti i bracket, da molte prove su finestre brevi a poche complete."""
+
+    name = 'hyperband'
+
+    def _brackets(self):
+        return list(range(self.s_max, -1, -1))
+
+
+class TPESearch(SearchStrategy):
+    """
+    Tree-structured Parzen Estimator su parametri discreti: dopo n_startup prove casuali le prove
+    sono divise in buone (quantile gamma migliore) e cattive; per ogni chiave si stimano le frequenze
+    dei valori (con prior uniforme) e tra n_candidates combinazioni estratte dalla distribuzione
+    buona si propone quella con rapporto l(x)/g(x) massimo.
+    """
+
+    name = 'tpe'
+
+    def __init__(self, space, max_days, n_startup: int = 20, gamma: float = 0.25, n_candidates: int = 24, **kwargs):
+        super().__init__(space, max_days, **kwargs)
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+
+    def _densities(self, trials: List[Trial]) -> Dict[str, List[float]]:
+        densities = {}
+        for k, key in enumerate(self.keys):
+            values = self.space[key]
+            counts = [1.0] * len(values)
+            for trial in trials:
+                counts[values.index(trial.params[k])] += 1.0
+            total = sum(counts)
+            densities[key] = [count / total for count in counts]
+        return densities
+
+    def _propose(self):
+        if len(self.trials) < self.n_startup:
+            return [(combo, self.max_days) for combo in self._sample_unseen(min(self.batch_size, self.n_startup - len(self.trials)))]
+        ranked = sorted(self.trials, key=lambda trial: -trial.score)
+        n_good = max(1, int(math.ceil(self.gamma * len(ranked))))
+        good = self._densities(ranked[:n_good])
+        bad = self._densities(ranked[n_good:])
+        proposals = []
+        for _ in range(self.batch_size):
+            if len(self._seen) >= self.size:
+                break
+            best_combo, best_ratio = None, float('-inf')
+            for _ in range(self.n_candidates):
+                combo = tuple(
+                    self.rng.choices(self.space[key], weights=good[key])[0] for key in self.keys
+                )
+                if combo in self._seen:
+                    continue
+                ratio = sum(
+                    math.log(good[key][self.space[key].index(value)]) - math.log(bad[key][self.space[key].index(value)])
+                    for key, value in zip(self.keys, combo)
+                )
+                if ratio > best_ratio:
+                    best_combo, best_ratio = combo, ratio
+            if best_combo is None:
+                unseen = self._sample_unseen(1)
+                if not unseen:
+                    break
+                proposals.append((unseen[0], self.max_days))
+                continue
+            self._seen.add(best_combo)
+            proposals.append((best_combo, self.max_days))
+        return proposals
+
+
+SEARCH_STRATEGIES = {
+    'grid': GridSearch,
+    'random': RandomSearch,
+    'halving': SuccessiveHalving,
+    'hyperband': Hyperband,
+    'tpe': TPESearch,
+}
+
+
+def create_search_strategy(name: str, space: Dict[str, Sequence], max_days: int, **kwargs) -> SearchStrategy:
+    """Istanzia la strategia per nome (chiavi di SEARCH_STRATEGIES)."""
+    if name not in SEARCH_STRATEGIES:
+        raise ValueError(f"Strategia di ricerca non valida: {name} (disponibili: {', '.join(SEARCH_STRATEGIES)})")
+    return SEARCH_STRATEGIES[name](space, max_days, **kwargs)
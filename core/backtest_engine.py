@@ -0,0 +1,523 @@
+# backtest_engine.py
+"""
+Modulo backtest_engine: backtest su tick reali (archivio del recorder o CSV) con la logica di produzione.
+Segnale di QuantumEngine, livelli di QuantumRiskManager.calculate_dynamic_levels, trailing stop e timeout
+come in QuantumTradingSystem; esecuzione al bid/ask (spread incluso) e chiusure su SL/TP.
+"""
+import copy
+import logging
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from core.simulated_mt5 import SimulatedMT5, ORDER_TYPE_BUY, ORDER_TYPE_SELL
+from core.symbol_registry import SymbolRegistry
+
+DAY_MS = 86400 * 1000
+# Tick del simulatore con prezzo medio precalcolato: formato dei dataset condivisi con i processi worker
+SERIES_DTYPE = np.dtype([('time_msc', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('mid', '<f8')])
+EXIT_SCAN_CHUNK = 1024  # tick esaminati per blocco nella ricerca dell'uscita (raddoppia a ogni blocco)
+
+EXIT_SL = 'sl'
+EXIT_TP = 'tp'
+EXIT_TRAILING = 'trailing'
+EXIT_TIMEOUT = 'timeout'
+EXIT_END = 'end'
+
+
+class BacktestTrade(NamedTuple):
+    symbol: str
+    type: str
+    open_msc: int
+    close_msc: int
+    price_open: float
+    price_close: float
+    sl: float
+    tp: float
+    volume: float
+    pips: float
+    profit: float
+    reason: str
+
+
+class BacktestResult(NamedTuple):
+    """Esito di un backtest: trade in ordine di chiusura, curva equity sulle chiusure e statistiche."""
+    trades: Tuple[BacktestTrade, ...]
+    equity_curve: np.ndarray
+    initial_balance: float
+    final_balance: float
+    net_profit: float
+    max_drawdown: float
+    max_drawdown_pct: float
+    win_rate: float
+    profit_factor: float
+    ticks: int
+    elapsed: float
+
+    @property
+    def n_trades(self) -> int:
+        return len(self.trades)
+
+    @property
+    def return_pct(self) -> float:
+        return self.net_profit / self.initial_balance * 100 if self.initial_balance else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            'trades': self.n_trades,
+            'net_profit': round(self.net_profit, 2),
+            'return_pct': round(self.return_pct, 3),
+            'max_drawdown': round(self.max_drawdown, 2),
+            'max_drawdown_pct': round(self.max_drawdown_pct * 100, 3),
+            'win_rate': round(self.win_rate, 4),
+            'profit_factor': round(self.profit_factor, 4) if np.isfinite(self.profit_factor) else self.profit_factor,
+            'ticks': self.ticks,
+            'elapsed_s': round(self.elapsed, 3),
+        }
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Somma sulle ultime `window` voci (finestra parziale all'inizio), via somme cumulative."""
+    csum = np.concatenate(([0], np.cumsum(values)))
+    upper = np.arange(1, len(values) + 1)
+    return csum[upper] - csum[np.maximum(upper - window, 0)]
+
+
+def _mid_prices(bid: np.ndarray, ask: np.ndarray) -> np.ndarray:
+    # Stesso prezzo inserito dal trading system: medio se bid e ask validi, altrimenti bid
+    return np.where((bid != 0) & (ask != 0), (bid + ask) / 2, bid)
+
+
+def series_ticks(ticks: np.ndarray) -> np.ndarray:
+    """Tick del simulatore (time_msc, bid, ask) in SERIES_DTYPE, con il prezzo medio usato dai segnali."""
+    out = np.empty(len(ticks), dtype=SERIES_DTYPE)
+    out['time_msc'] = ticks['time_msc']
+    out['bid'] = ticks['bid']
+    out['ask'] = ticks['ask']
+    out['mid'] = _mid_prices(out['bid'], out['ask'])
+    return out
+
+
+class _TickSeries:
+    """
+    Tick di un simbolo come array (tempo, bid, ask, prezzo medio) e, per combinazione di
+    buffer_size/finestra/coalesce, lo stato incrementale dell'engine ricostruito per ogni tick
+    in forma vettoriale (stesse grandezze di QuantumEngine._read_symbol_state).
+    """
+
+    def __init__(self, ticks: np.ndarray):
+        if 'mid' in (ticks.dtype.names or ()):
+            # Dataset SERIES_DTYPE (anche memory map condivisa): viste sui campi, nessuna copia per processo
+            self.time_msc, self.bid, self.ask, self.mid = ticks['time_msc'], ticks['bid'], ticks['ask'], ticks['mid']
+        else:
+            self.time_msc = np.ascontiguousarray(ticks['time_msc'], dtype=np.int64)
+            self.bid = np.ascontiguousarray(ticks['bid'], dtype=np.float64)
+            self.ask = np.ascontiguousarray(ticks['ask'], dtype=np.float64)
+            self.mid = _mid_prices(self.bid, self.ask)
+        self._states = {}
+
+    def __len__(self) -> int:
+        return len(self.time_msc)
+
+    def accepted(self, coalesce: bool) -> np.ndarray:
+        """Indici dei tick che process_tick inserirebbe nel buffer (time_msc nuovo, prezzo valido, eventuale coalesce)."""
+        keep = np.ones(len(self), dtype=bool)
+        keep[1:] = self.time_msc[1:] != self.time_msc[:-1]
+        keep &= self.mid > 0
+        idx = np.flatnonzero(keep)
+        if coalesce and len(idx) > 1:
+            prices = self.mid[idx]
+            changed = np.ones(len(idx), dtype=bool)
+            changed[1:] = prices[1:] != prices[:-1]
+            idx = idx[changed]
+        return idx
+
+    def state(self, buffer_size: int, window: int, coalesce: bool) -> tuple:
+        key = (buffer_size, window, coalesce)
+        if key not in self._states:
+            idx = self.accepted(coalesce)
+            prices = self.mid[idx]
+            deltas = np.zeros(len(idx))
+            deltas[1:] = np.diff(prices)
+            values = np.abs(deltas)
+            values[values <= 1e-10] = 0.0  # RollingEntropy.min_delta
+            positive = values > 0
+            xlogx = np.zeros(len(idx))
+            xlogx[positive] = values[positive] * np.log(values[positive])
+            count = np.arange(1, len(idx) + 1)
+            self._states[key] = (
+                idx,
+                np.minimum(count, buffer_size),
+                np.minimum(count, window),
+                _rolling_sum((deltas > 0).astype(np.int64), window),
+                _rolling_sum((deltas < 0).astype(np.int64), window),
+                _rolling_sum(positive.astype(np.int64), window),
+                _rolling_sum(values, window),
+                _rolling_sum(xlogx, window),
+            )
+        return self._states[key]
+
+
+class _SymbolRun:
+    """Stato di un simbolo durante un run: candidati all'ingresso e vincoli (posizione, cooldown, limiti)."""
+
+    def __init__(self, symbol: str, series: _TickSeries, accepted: np.ndarray, cand_pos: np.ndarray,
+                 cand_signal: np.ndarray, end_idx: int):
+        self.symbol = symbol
+        self.series = series
+        self.accepted = accepted
+        self.cand_pos = cand_pos                      # posizione del candidato nei tick accettati
+        self.cand_idx = accepted[cand_pos]            # indice del candidato nei tick grezzi
+        self.cand_t = series.time_msc[self.cand_idx]
+        self.cand_signal = cand_signal
+        self.end_idx = end_idx
+        self.info = None
+        self.min_idx = 0
+        self.min_t = np.iinfo(np.int64).min
+        self.last_open = None
+        self.last_close = None
+
+    def next_candidate(self, signal_cooldown_ms: int, position_cooldown_ms: int) -> Optional[int]:
+        bound = self.min_t
+        if self.last_open is not None:
+            bound = max(bound, self.last_open + signal_cooldown_ms)
+        if self.last_close is not None:
+            bound = max(bound, self.last_close + position_cooldown_ms)
+        k = max(int(np.searchsorted(self.cand_idx, self.min_idx, side='left')),
+                int(np.searchsorted(self.cand_t, bound, side='left')))
+        return k if k < len(self.cand_idx) else None
+
+
+class BacktestEngine:
+    """
+    Backtest a tick su un backend SimulatedMT5 (che fornisce tick e specifiche dei simboli).
+
+    mode='vectorized' (default): lo stato dell'engine (buffer, conteggi spin, somme entropia) viene
+    ricostruito per ogni tick con somme cumulative NumPy e passato a QuantumEngine.signal_components,
+    la stessa formula di get_signals; il ciclo Python gira solo sugli ingressi effettivi.
+    mode='replay': ogni tick passa da QuantumEngine.process_tick + get_signal (riferimento esatto, più lento).
+
+    Per ogni ingresso: ordine al prezzo ask/bid del tick, SL/TP da QuantumRiskManager.calculate_dynamic_levels
+    sul buffer dell'engine a quel tick, size a rischio fisso (risk_percent dell'equity realizzata sulla
+    distanza dello SL). L'uscita è cercata in blocchi vettoriali sui tick successivi: SL/TP del broker,
+    trailing stop (risk_parameters.trailing_stop: enable, activation_pips, distance_pips) e timeout
+    (position_timeout_hours) come in QuantumTradingSystem. Si applicano cooldown segnale/posizione,
+    max_positions, max_daily_trades (giorno UTC) e max_spread come in can_trade.
+    """
+
+    def __init__(self, backend: SimulatedMT5, symbols: Iterable[str] = None):
+        self.backend = backend
+        self.logger = logging.getLogger("phoenix_quantum")
+        names = list(symbols) if symbols else [s.name for s in backend.symbols_get()]
+        self._series = {}
+        for symbol in names:
+            ticks = backend.tick_data(symbol)
+            if ticks is None or not len(ticks):
+                self.logger.warning(f"[BACKTEST] Nessun tick per {symbol}: simbolo escluso")
+                continue
+            self._series[symbol] = _TickSeries(ticks)
+        self.symbols = list(self._series)
+
+    @classmethod
+    def from_archive(cls, root: str, symbols: Iterable[str] = None, start_msc: int = None,
+                     end_msc: int = None, **kwargs) -> 'BacktestEngine':
+        """Backtest sui tick dell'archivio del recorder (kwargs: initial_balance, leverage, symbol_specs...)."""
+        return cls(SimulatedMT5.from_archive(root, symbols, start_msc, end_msc, speed=0, **kwargs), symbols)
+
+    @classmethod
+    def from_shared(cls, paths: Dict[str, str], symbols: Iterable[str] = None, **kwargs) -> 'BacktestEngine':
+        """Backtest sui dataset condivisi pubblicati da share_archive (viste in memory map di sola lettura)."""
+        from utils.shared_ticks import open_shared
+        ticks = {symbol: open_shared(path) for symbol, path in paths.items()}
+        return cls(SimulatedMT5(ticks, speed=0, **kwargs), symbols)
+
+    @classmethod
+    def from_files(cls, paths, symbols: Iterable[str] = None, **kwargs) -> 'BacktestEngine':
+        """Backtest su file tick CSV (time_msc,symbol,bid,ask, anche .gz)."""
+        return cls(SimulatedMT5.from_files(paths, speed=0, **kwargs), symbols)
+
+    def time_range(self) -> Tuple[int, int]:
+        return (min(int(s.time_msc[0]) for s in self._series.values()),
+                max(int(s.time_msc[-1]) for s in self._series.values()))
+
+    @staticmethod
+    def _prepare_config(config: dict) -> dict:
+        # Nessun log segnali né registrazione tick durante il backtest
+        cfg = copy.deepcopy(config.config if hasattr(config, 'config') else config)
+        cfg.setdefault('logging', {})
+        cfg['logging']['signal_log_format'] = 'none'
+        cfg['logging']['hold_log_mode'] = 'all'
+        cfg['tick_recorder'] = {'enabled': False}
+        return cfg
+
+    # ------------------------------------------------------------------
+    # Segnali
+    # ------------------------------------------------------------------
+    def _raw_signals(self, engine, series: _TickSeries, coalesce: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """(indici dei tick accettati, segnale senza cooldown per ciascuno: 1 BUY, -1 SELL, 0 HOLD)."""
+        window = min(engine.spin_window, engine.buffer_size)
+        (accepted, buffer_len, window_count, up, down,
+         nonzero, sum_abs, sum_xlogx) = series.state(engine.buffer_size, window, coalesce)
+        (_, _, _, insufficient, low_confidence,
+         buy, sell) = engine.signal_components(buffer_len, window_count, up, down, nonzero, sum_abs, sum_xlogx)
+        ok = ~insufficient & ~low_confidence
+        signals = np.where(ok & buy, 1, np.where(ok & sell, -1, 0)).astype(np.int8)
+        return accepted, signals
+
+    def _replay_signals(self, config: dict, symbol: str, series: _TickSeries,
+                        registry: SymbolRegistry) -> Tuple[np.ndarray, np.ndarray]:
+        from core.quantum_engine import QuantumEngine
+        now = [0.0]
+        engine = QuantumEngine(config, clock=lambda: now[0], registry=registry, client=self.backend)
+        accepted = []
+        signals = []
+        for i in range(len(series)):
+            now[0] = series.time_msc[i] / 1000.0
+            if not engine.process_tick(symbol, float(series.mid[i]), int(series.time_msc[i]),
+                                       float(series.bid[i]), float(series.ask[i])):
+                continue
+            signal, _ = engine.get_signal(symbol)
+            accepted.append(i)
+            signals.append(1 if signal == "BUY" else (-1 if signal == "SELL" else 0))
+        return np.array(accepted, dtype=np.int64), np.array(signals, dtype=np.int8)
+
+    # ------------------------------------------------------------------
+    # Uscita
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _find_exit(series: _TickSeries, entry: int, end_idx: int, direction: int, price_open: float,
+                   sl: float, tp: float, pip_size: float, trailing: dict, timeout_ms: float) -> Tuple[int, float, str, float]:
+        """
+        Primo tick dopo `entry` che chiude la posizione: (indice, prezzo, motivo, ultimo SL).
+        Lo SL di un tick è quello impostato dal trailing sui tick precedenti (il broker controlla
+        gli stop all'arrivo del tick, il monitor aggiorna lo SL dopo).
+        """
+        buy = direction > 0
+        initial_sl = sl if sl else (-np.inf if buy else np.inf)
+        current_sl = initial_sl
+        activation = trailing.get('activation_pips', 150) if trailing.get('enable', False) else None
+        distance = trailing.get('distance_pips', 100) * pip_size
+        open_msc = series.time_msc[entry]
+        start = entry + 1
+        size = EXIT_SCAN_CHUNK
+        while start < end_idx:
+            stop = min(end_idx, start + size)
+            price = series.bid[start:stop] if buy else series.ask[start:stop]
+            if activation is not None:
+                profit_pips = (price - price_open) / pip_size * direction
+                if buy:
+                    moved = np.where(profit_pips >= activation, price - distance, -np.inf)
+                    sl_after = np.maximum(np.maximum.accumulate(moved), current_sl)
+                else:
+                    moved = np.where(profit_pips >= activation, price + distance, np.inf)
+                    sl_after = np.minimum(np.minimum.accumulate(moved), current_sl)
+                sl_before = np.concatenate(([current_sl], sl_after[:-1]))
+            else:
+                sl_after = sl_before = np.full(len(price), current_sl)
+            if buy:
+                sl_hit = price <= sl_before
+                tp_hit = (price >= tp) if tp else np.zeros(len(price), dtype=bool)
+            else:
+                sl_hit = price >= sl_before
+                tp_hit = (price <= tp) if tp else np.zeros(len(price), dtype=bool)
+            timeout_hit = (series.time_msc[start:stop] - open_msc) > timeout_ms
+            hit = sl_hit | tp_hit | timeout_hit
+            if hit.any():
+                k = int(np.argmax(hit))
+                if sl_hit[k]:
+                    reason = EXIT_SL if sl_before[k] == initial_sl else EXIT_TRAILING
+                elif tp_hit[k]:
+                    reason = EXIT_TP
+                else:
+                    reason = EXIT_TIMEOUT
+                final_sl = float(sl_before[k]) if np.isfinite(sl_before[k]) else 0.0
+                return start + k, float(price[k]), reason, final_sl
+            current_sl = float(sl_after[-1])
+            start = stop
+            size *= 2
+        last = end_idx - 1
+        price = series.bid[last] if buy else series.ask[last]
+        return last, float(price), EXIT_END, float(current_sl) if np.isfinite(current_sl) else 0.0
+
+    # ------------------------------------------------------------------
+    # Run
+    # ------------------------------------------------------------------
+    def run(self, config: dict, mode: str = 'vectorized', start_msc: int = None, end_msc: int = None) -> BacktestResult:
+        """
+        Esegue il backtest con la config di produzione indicata; gli ingressi sono cercati tra
+        start_msc ed end_msc (i tick precedenti servono da riscaldamento del buffer).
+        """
+        if mode not in ('vectorized', 'replay'):
+            raise ValueError(f"Modalità backtest non valida: {mode}")
+        from core.quantum_engine import QuantumEngine
+        from core.quantum_risk_manager import QuantumRiskManager
+        started = time.perf_counter()
+        cfg = self._prepare_config(config)
+        # Simulatore e registry privato passati ai componenti: backend attivo e registry condiviso
+        # del processo restano quelli del live (il backtest può girare dentro il trading system)
+        registry = SymbolRegistry(client=self.backend)
+        registry.configure(cfg)
+        engine = QuantumEngine(cfg, registry=registry, client=self.backend)
+        risk_manager = QuantumRiskManager(cfg, engine, registry=registry, client=self.backend)
+        trades = self._simulate(cfg, engine, risk_manager, mode, start_msc, end_msc)
+        initial = float(cfg.get('initial_balance', self.backend.account_info().balance))
+        ticks = sum(len(s) for s in self._series.values())
+        return self._result(trades, initial, ticks, time.perf_counter() - started)
+
+    def _simulate(self, cfg: dict, engine, risk_manager, mode: str,
+                  start_msc: Optional[int], end_msc: Optional[int]) -> List[BacktestTrade]:
+        risk_params = cfg.get('risk_parameters', {})
+        signal_cooldown_ms = int(max(engine.signal_cooldown, cfg.get('quantum_params', {}).get('signal_cooldown', 900)) * 1000)
+        position_cooldown_ms = int(risk_params.get('position_cooldown', 1800) * 1000)
+        max_positions = risk_params.get('max_positions', 1)
+        daily_limit = risk_params.get('max_daily_trades', 5)
+        per_symbol_limit = risk_params.get('daily_trade_limit_mode', 'global') != 'global'
+        balance = float(cfg.get('initial_balance', self.backend.account_info().balance))
+
+        runs = {}
+        for symbol, series in self._series.items():
+            if mode == 'replay':
+                accepted, signals = self._replay_signals(cfg, symbol, series, engine.symbol_registry)
+            else:
+                accepted, signals = self._raw_signals(engine, series, engine.coalesce_unchanged_ticks)
+            times = series.time_msc[accepted]
+            pip_size = engine._get_pip_size(symbol)
+            symbol_config = cfg.get('symbols', {}).get(symbol, {})
+            max_spread = symbol_config.get('max_spread', risk_params.get('max_spread', {}))
+            if isinstance(max_spread, dict):
+                max_spread = max_spread.get(symbol, max_spread.get('default', 20))
+            spread = (series.ask[accepted] - series.bid[accepted]) / pip_size
+            mask = (signals != 0) & (spread <= max_spread)
+            if start_msc is not None:
+                mask &= times >= start_msc
+            if end_msc is not None:
+                mask &= times <= end_msc
+            end_idx = len(series) if end_msc is None else int(np.searchsorted(series.time_msc, end_msc, side='right'))
+            cand_pos = np.flatnonzero(mask)
+            runs[symbol] = _SymbolRun(symbol, series, accepted, cand_pos, signals[cand_pos], end_idx)
+            runs[symbol].info = self.backend.symbol_info(symbol)
+
+        trades = []
+        open_trades = []
+        daily_count = {}
+        while True:
+            best = None
+            for run in runs.values():
+                k = run.next_candidate(signal_cooldown_ms, position_cooldown_ms)
+                if k is not None and (best is None or run.cand_t[k] < best[0].cand_t[best[1]]):
+                    best = (run, k)
+            if best is None:
+                break
+            run, k = best
+            t = int(run.cand_t[k])
+            i = int(run.cand_idx[k])
+            # Posizioni chiuse entro t: profitto realizzato
+            still_open = []
+            for trade in open_trades:
+                if trade.close_msc <= t:
+                    balance += trade.profit
+                else:
+                    still_open.append(trade)
+            open_trades = still_open
+            if len(open_trades) >= max_positions:
+                run.min_t = min(trade.close_msc for trade in open_trades)
+                continue
+            day_key = (run.symbol if per_symbol_limit else None, t // DAY_MS)
+            if daily_count.get(day_key, 0) >= daily_limit:
+                run.min_t = (t // DAY_MS + 1) * DAY_MS
+                continue
+
+            opened = self._open_trade(run, k, engine, risk_manager, balance)
+            if opened is None:
+                run.min_idx = i + 1
+                continue
+            trade, exit_idx = opened
+            run.min_idx = exit_idx + 1
+            run.last_open = t
+            run.last_close = trade.close_msc
+            daily_count[day_key] = daily_count.get(day_key, 0) + 1
+            open_trades.append(trade)
+            trades.append(trade)
+        return trades
+
+    def _open_trade(self, run: _SymbolRun, k: int, engine, risk_manager, balance: float) -> Optional[Tuple[BacktestTrade, int]]:
+        """Apre il candidato k e ne calcola l'uscita: (trade, indice del tick di chiusura), None se scartato."""
+        symbol = run.symbol
+        series = run.series
+        i = int(run.cand_idx[k])
+        pos = int(run.cand_pos[k])
+        direction = int(run.cand_signal[k])
+        # Buffer dell'engine allineato al tick di ingresso: la volatilità dei livelli è quella di produzione
+        lo = max(0, pos - engine.buffer_size)
+        window = run.accepted[lo:pos + 1]
+        engine.ingest_ticks(symbol, series.mid[window], series.time_msc[window])
+        order_type = ORDER_TYPE_BUY if direction > 0 else ORDER_TYPE_SELL
+        sl, tp = risk_manager.calculate_dynamic_levels(symbol, order_type, float(series.mid[i]))
+        if not sl and not tp:
+            return None
+        price_open = float(series.ask[i] if direction > 0 else series.bid[i])
+        if (sl >= price_open) if direction > 0 else (sl <= price_open):
+            return None
+        info = run.info
+        risk_config = risk_manager.get_risk_config(symbol)
+        volume = balance * risk_config.get('risk_percent', 0.02) / (abs(price_open - sl) * info.trade_contract_size)
+        volume = round(volume / info.volume_step) * info.volume_step
+        volume = round(min(max(volume, info.volume_min), info.volume_max), 8)
+        pip_size = engine._get_pip_size(symbol)
+        timeout_ms = risk_config.get('position_timeout_hours', 24) * 3600 * 1000
+        exit_idx, price_close, reason, _ = self._find_exit(
+            series, i, run.end_idx, direction, price_open, sl, tp, pip_size,
+            risk_config.get('trailing_stop', {}), timeout_ms
+        )
+        diff = (price_close - price_open) * direction
+        trade = BacktestTrade(
+            symbol=symbol, type='BUY' if direction > 0 else 'SELL',
+            open_msc=int(series.time_msc[i]), close_msc=int(series.time_msc[exit_idx]),
+            price_open=price_open, price_close=price_close, sl=sl, tp=tp, volume=volume,
+            pips=diff / pip_size, profit=diff * volume * info.trade_contract_size, reason=reason
+        )
+        return trade, exit_idx
+
+    @staticmethod
+    def _result(trades: List[BacktestTrade], initial: float, ticks: int, elapsed: float) -> BacktestResult:
+        trades = sorted(trades, key=lambda trade: trade.close_msc)
+        profits = np.array([trade.profit for trade in trades], dtype=np.float64)
+        equity = initial + np.cumsum(profits)
+        peaks = np.maximum.accumulate(np.concatenate(([initial], equity)))[1:]
+        drawdown = peaks - equity
+        wins = profits[profits > 0]
+        losses = profits[profits < 0]
+        if len(losses):
+            profit_factor = float(wins.sum() / -losses.sum())
+        else:
+            profit_factor = float('inf') if len(wins) else 0.0
+        return BacktestResult(
+            trades=tuple(trades),
+            equity_curve=equity,
+            initial_balance=initial,
+            final_balance=float(equity[-1]) if len(equity) else initial,
+            net_profit=float(profits.sum()),
+            max_drawdown=float(drawdown.max()) if len(drawdown) else 0.0,
+            max_drawdown_pct=float((drawdown / peaks).max()) if len(drawdown) else 0.0,
+            win_rate=float(len(wins) / len(profits)) if len(profits) else 0.0,
+            profit_factor=profit_factor,
+            ticks=ticks,
+            elapsed=elapsed,
+        )
+
+
+def share_archive(store, root: str, symbols: Iterable[str], start_msc: int = None,
+                  end_msc: int = None) -> Dict[str, str]:
+    """
+    Carica una volta i tick dell'archivio e li pubblica nello store (utils.shared_ticks.SharedTickStore)
+    in SERIES_DTYPE, per BacktestEngine.from_shared nei processi worker: {symbol: path}.
+    """
+    symbols = list(symbols)
+    backend = SimulatedMT5.from_archive(root, symbols, start_msc, end_msc, speed=0)
+    paths = {}
+    for symbol in symbols:
+        ticks = backend.tick_data(symbol)
+        if ticks is not None:
+            paths[symbol] = store.publish(symbol, series_ticks(ticks))
+    return paths
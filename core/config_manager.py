@@ -10,11 +10,12 @@ import threading
 from collections import defaultdict
 from typing import Optional, Dict
 import logging
-import MetaTrader5 as mt5
+from core.mt5_backend import mt5
 from utils.utils import validate_config
 from utils.constants import DEFAULT_SPREADS
 from core.quantum_engine import QuantumEngine
 from core.quantum_risk_manager import QuantumRiskManager
+from core.symbol_registry import symbol_registry
 from core.trading_metrics import TradingMetrics
 
 class ConfigManager:
@@ -59,6 +60,7 @@ class ConfigManager:
         self.logger.info("🧠 Inizializzazione Quantum Engine...")
         self.engine = QuantumEngine(self)
         self.logger.info("✅ Quantum Engine pronto")
+        symbol_registry.configure(self.config)
         self.risk_manager = QuantumRiskManager(self, self.engine, self)  # Passa self come terzo parametro
         self.max_positions = self.get_risk_params().get('max_positions', 4)
         # Locks per variabili runtime
@@ -0,0 +1,51 @@
+# decision_record.py
+"""
+Modulo decision_record: record immutabili della valutazione segnale e della decisione di trading per ciclo.
+"""
+from typing import NamedTuple, Optional
+
+
+class SignalEvaluation(NamedTuple):
+    """Esito di QuantumEngine._evaluate_signals per un simbolo, con le metriche effettivamente calcolate."""
+    timestamp: float
+    signal: str
+    price: float
+    reason: str
+    entropy: float
+    spin: float
+    confidence: float
+    buffer_size: int
+
+
+class DecisionRecord(NamedTuple):
+    """
+    Decisione di trading di un simbolo in un ciclo: input (tick, posizioni), metriche della
+    valutazione segnale e primo gate fallito (`gate`, 'ok' se tutte le condizioni sono passate).
+    Prodotto una sola volta da _process_single_symbol e letto da diagnostica e report.
+    """
+    symbol: str
+    timestamp: float
+    gate: str
+    detail: str
+    bid: Optional[float]
+    ask: Optional[float]
+    current_positions: int
+    evaluation: Optional[SignalEvaluation]
+
+    @property
+    def signal(self) -> str:
+        return self.evaluation.signal if self.evaluation is not None else 'N/A'
+
+    def report_extra(self) -> str:
+        """Colonna extra del report: motivo tecnico e metriche nello stesso formato della diagnostica completa."""
+        evaluation = self.evaluation
+        if evaluation is None:
+            return "Confidence: N/A; Entropia: N/A; Spin: N/A"
+        parts = []
+        if evaluation.signal == "HOLD" and evaluation.reason:
+            parts.append(f"Motivo tecnico: {evaluation.reason}")
+        parts.append(f"Confidence: {evaluation.confidence:.3f}")
+        parts.append(f"Entropia: {evaluation.entropy:.3f}")
+        parts.append(f"Spin: {evaluation.spin:.3f}")
+        parts.append(f"Buffer tick: {evaluation.buffer_size}")
+        return "; ".join(parts)
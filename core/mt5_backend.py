@@ -0,0 +1,90 @@
+# mt5_backend.py
+"""
+Modulo mt5_backend: punto unico di accesso al broker. I moduli core usano `mt5` da qui invece di
+importare MetaTrader5, così il backend (terminale reale o simulato) si sceglie a runtime.
+"""
+import logging
+
+try:
+    import MetaTrader5 as _terminal
+except ImportError:  # Linux/CI: nessun terminale, serve un backend simulato
+    _terminal = None
+
+# Funzioni e costanti MT5 usate dal sistema: un backend alternativo deve fornirle tutte
+BACKEND_FUNCTIONS = (
+    'initialize', 'shutdown', 'last_error', 'terminal_info', 'account_info',
+    'symbols_get', 'symbol_select', 'symbol_info', 'symbol_info_tick', 'copy_ticks_range',
+    'positions_get', 'order_send', 'order_calc_margin', 'history_deals_get',
+)
+BACKEND_CONSTANTS = (
+    'ORDER_TYPE_BUY', 'ORDER_TYPE_SELL', 'TRADE_ACTION_DEAL', 'TRADE_ACTION_SLTP',
+    'ORDER_TIME_GTC', 'ORDER_FILLING_FOK', 'ORDER_FILLING_IOC', 'ORDER_FILLING_RETURN',
+    'TRADE_RETCODE_DONE', 'COPY_TICKS_INFO',
+)
+
+
+class BrokerBackend:
+    """
+    Proxy verso il backend attivo: `mt5.symbol_info_tick(...)`, `mt5.ORDER_TYPE_BUY` ecc.
+    vengono risolti sul backend corrente a ogni accesso, quindi set_backend() vale anche
+    per i moduli già importati.
+    """
+
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        return self._backend
+
+    def use(self, backend):
+        """Attiva un backend e restituisce il precedente."""
+        missing = missing_backend_attributes(backend)
+        if missing:
+            logging.getLogger("phoenix_quantum").warning(f"[BROKER] Backend {type(backend).__name__} incompleto: mancano {missing}")
+        previous, self._backend = self._backend, backend
+        return previous
+
+    def __getattr__(self, name):
+        backend = self.__dict__.get('_backend')
+        if backend is None:
+            raise RuntimeError(
+                f"Nessun backend broker attivo (mt5.{name}): MetaTrader5 non installato, "
+                "configura broker_backend.type = 'simulated' o usa set_backend()"
+            )
+        return getattr(backend, name)
+
+
+def missing_backend_attributes(backend) -> list:
+    return [name for name in BACKEND_FUNCTIONS + BACKEND_CONSTANTS if not hasattr(backend, name)]
+
+
+mt5 = BrokerBackend(_terminal)
+
+
+def get_backend():
+    return mt5.backend
+
+
+def set_backend(backend):
+    """Sostituisce il backend broker per tutto il processo; restituisce il precedente."""
+    return mt5.use(backend)
+
+
+def configure_backend(backend_config: dict = None):
+    """
+    Applica la sezione `broker_backend` della config:
+      type: 'mt5' (default, terminale MetaTrader5) | 'simulated'
+      tick_files, speed, initial_balance, leverage, currency, symbols: vedi SimulatedMT5.from_config
+    Se un backend è già stato impostato con set_backend() e type non è indicato, resta quello.
+    """
+    backend_config = backend_config or {}
+    backend_type = backend_config.get('type')
+    if backend_type == 'simulated':
+        from core.simulated_mt5 import SimulatedMT5
+        set_backend(SimulatedMT5.from_config(backend_config))
+    elif backend_type == 'mt5':
+        if _terminal is None:
+            raise RuntimeError("broker_backend.type = 'mt5' ma il pacchetto MetaTrader5 non è installato")
+        set_backend(_terminal)
+    return mt5.backend
@@ -0,0 +1,123 @@
+# mt5_snapshot.py
+"""
+Modulo mt5_snapshot: snapshot per ciclo di posizioni, account e symbol_info MT5 condiviso da
+engine, risk manager e trading system.
+"""
+import threading
+import time
+from typing import Dict, Iterable
+
+from core.mt5_backend import mt5
+
+from utils.constants import DEFAULT_MT5_SNAPSHOT_MAX_AGE
+
+_MISSING = object()
+
+
+class MT5Snapshot:
+    """
+    Una chiamata MT5 per tipo di dato per ciclo: `refresh(symbols)` all'inizio dell'iterazione
+    legge posizioni, account e symbol_info dei simboli; positions_get/account_info/symbol_info
+    rispondono poi dalla memoria, con la stessa firma delle funzioni MT5.
+
+    Dopo ogni order_send va chiamato `invalidate()`: posizioni e account vengono riletti al
+    primo accesso successivo. Fuori dal ciclo principale (worker di ingestion, dashboard) un
+    dato più vecchio di `max_age` secondi viene comunque riletto.
+    """
+
+    def __init__(self, client=mt5, max_age: float = DEFAULT_MT5_SNAPSHOT_MAX_AGE):
+        self.client = client
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._positions = (_MISSING, 0.0)
+        self._account = (_MISSING, 0.0)
+        self._symbols: Dict[str, tuple] = {}
+        self._generation = 0
+        self._stats = {'hits': 0, 'fetches': 0, 'refreshes': 0, 'invalidations': 0}
+
+    # ------------------------------------------------------------------
+    # Ciclo
+    # ------------------------------------------------------------------
+    def refresh(self, symbols: Iterable[str] = ()) -> None:
+        """Rilegge tutto lo snapshot: posizioni, account e symbol_info dei simboli indicati."""
+        now = time.time()
+        with self._lock:
+            generation = self._generation
+        # Nuovo ciclo per i backend a replay (SimulatedMT5 a speed = 0); il terminale reale non ha l'hook
+        begin_cycle = getattr(self.client, 'begin_cycle', None)
+        if begin_cycle is not None:
+            begin_cycle()
+        positions = self.client.positions_get()
+        account = self.client.account_info()
+        infos = {symbol: (self.client.symbol_info(symbol), now) for symbol in symbols}
+        with self._lock:
+            if generation == self._generation:
+                self._positions = (positions, now)
+                self._account = (account, now)
+            self._symbols = infos
+            self._stats['refreshes'] += 1
+            self._stats['fetches'] += 2 + len(infos)
+
+    def invalidate(self, symbols: bool = False) -> None:
+        """Scarta posizioni e account (e con symbols=True anche i symbol_info), es. dopo order_send."""
+        with self._lock:
+            self._positions = (_MISSING, 0.0)
+            self._account = (_MISSING, 0.0)
+            if symbols:
+                self._symbols = {}
+            self._generation += 1
+            self._stats['invalidations'] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats)
+
+    # ------------------------------------------------------------------
+    # Accesso (stessa firma delle funzioni MT5)
+    # ------------------------------------------------------------------
+    def positions_get(self, symbol: str = None, ticket: int = None):
+        """Posizioni aperte dallo snapshot, filtrate per simbolo o ticket; None se MT5 ha restituito errore."""
+        positions = self._get('_positions', self.client.positions_get)
+        if positions is None or (symbol is None and ticket is None):
+            return positions
+        return tuple(
+            p for p in positions
+            if (symbol is None or p.symbol == symbol) and (ticket is None or p.ticket == ticket)
+        )
+
+    def account_info(self):
+        return self._get('_account', self.client.account_info)
+
+    def symbol_info(self, symbol: str):
+        now = time.time()
+        with self._lock:
+            entry = self._symbols.get(symbol)
+            if entry is not None and now - entry[1] <= self.max_age:
+                self._stats['hits'] += 1
+                return entry[0]
+        info = self.client.symbol_info(symbol)
+        with self._lock:
+            self._symbols[symbol] = (info, now)
+            self._stats['fetches'] += 1
+        return info
+
+    def _get(self, attr: str, fetch):
+        now = time.time()
+        with self._lock:
+            value, fetched_at = getattr(self, attr)
+            if value is not _MISSING and now - fetched_at <= self.max_age:
+                self._stats['hits'] += 1
+                return value
+            generation = self._generation
+        # Lettura MT5 fuori dal lock: i thread concorrenti al massimo rileggono lo stesso dato.
+        # Una lettura iniziata prima di un invalidate() viene restituita ma non memorizzata.
+        value = fetch()
+        with self._lock:
+            if generation == self._generation:
+                setattr(self, attr, (value, now))
+            self._stats['fetches'] += 1
+        return value
+
+
+# Istanza condivisa: aggiornata dal loop principale con refresh() e invalidata dopo ogni ordine
+mt5_snapshot = MT5Snapshot()
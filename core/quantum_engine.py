@@ -2,18 +2,26 @@
 """
 Modulo QuantumEngine: motore principale per la generazione di segnali di trading quantistici.
 """
+import logging
+import os
 import threading
 import time
-from collections import defaultdict, deque
-from functools import lru_cache
 from typing import Tuple, List, Dict
 import numpy as np
 # Importa costanti e utilità
 
-from utils.constants import DEFAULT_SPREADS
 from utils.utils import log_signal_tick
-import MetaTrader5 as mt5
-import datetime
+from utils.async_writer import get_async_csv_writer, get_async_writers_stats
+from utils.signal_journal import get_signal_journal, HoldAggregator, HOLD_SUMMARY_HEADER
+from utils.hot_log import hot_log
+from utils.tick_archive import get_tick_recorder
+from core.tick_buffer import TickRingBuffer
+from core.decision_record import SignalEvaluation
+from core.rolling_stats import RollingSpinStats, RollingEntropy
+from core.symbol_cache import SymbolCache
+from core.mt5_snapshot import mt5_snapshot
+from core.symbol_registry import symbol_registry
+from core.mt5_backend import mt5
 
 class QuantumEngine:
     def check_tick_activity(self):
@@ -23,19 +31,19 @@ class QuantumEngine:
         warning_symbols = []
         heartbeat_data = []
         try:
-            if not mt5.terminal_info().connected:
+            if not self.client.terminal_info().connected:
                 self.logger.warning("Connessione MT5 non disponibile")
                 return False
         except Exception as e:
             self.logger.error(f"Errore accesso terminal_info MT5: {e}")
             return False
-        available_symbols = [s.name for s in mt5.symbols_get() or []]
+        available_symbols = [s.name for s in self.client.symbols_get() or []]
         symbols = list(self.config.get('symbols', {}).keys())
         for symbol in symbols:
             try:
-                tick = mt5.symbol_info_tick(symbol)
+                tick = self.client.symbol_info_tick(symbol)
                 if not tick:
-                    symbol_info = mt5.symbol_info(symbol)
+                    symbol_info = mt5_snapshot.symbol_info(symbol)
                     is_visible = symbol_info.visible if symbol_info else False
                     self.logger.warning(
                         f"{symbol}: Nessun dato tick disponibile | "
@@ -44,19 +52,20 @@ class QuantumEngine:
                     )
                     issues.append(f"{symbol}: Nessun dato tick disponibile")
                     continue
-                spread = (mt5.symbol_info(symbol).ask - mt5.symbol_info(symbol).bid) / self._get_pip_size(symbol) if mt5.symbol_info(symbol) else 0
-                ticks = list(self.get_tick_buffer(symbol))[-self.spin_window:]
-                if len(ticks) >= self.min_spin_samples:
-                    deltas = tuple(t['delta'] for t in ticks if abs(t['delta']) > 1e-10)
-                    entropy = self.calculate_entropy(deltas)
-                    if len(ticks) == 0:
+                symbol_info = mt5_snapshot.symbol_info(symbol)
+                spread = (symbol_info.ask - symbol_info.bid) / self._get_pip_size(symbol) if symbol_info else 0
+                buf = self.get_tick_buffer(symbol)
+                directions = buf.directions(self.spin_window)
+                if len(directions) >= self.min_spin_samples:
+                    entropy = self.get_entropy(symbol)
+                    if len(directions) == 0:
                         spin = 0
                         confidence = 0.0
                         volatility = 1.0
                         self.logger.warning(f"[BUFFER EMPTY] {symbol}: buffer tick vuoto - nessuna metrica calcolata, nessun segnale generabile. Possibili cause: feed dati assente, connessione MT5, mercato chiuso o errore precedente. Verifica log errori e stato connessione.")
                     else:
-                        spin = sum(1 for t in ticks if t['direction'] > 0) / len(ticks) * 2 - 1
-                        confidence = min(1.0, abs(spin) * np.sqrt(len(ticks)))
+                        spin = np.count_nonzero(directions > 0) / len(directions) * 2 - 1
+                        confidence = min(1.0, abs(spin) * np.sqrt(len(directions)))
                         volatility = 1 + abs(spin) * entropy
                 else:
                     entropy, spin, confidence, volatility = 0.0, 0.0, 0.0, 1.0
@@ -89,24 +98,11 @@ class QuantumEngine:
             except Exception as e:
                 self.logger.error(f"Errore monitoraggio {symbol}: {str(e)}", exc_info=True)
         if heartbeat_data:
-            hb_msg = ("\n==================== [HEARTBEAT] ====================\n" +
-                "\n".join(
-                    f"Symbol: {d['symbol']}\n"
-                    f"  Bid: {d['bid']:.5f}\n"
-                    f"  Ask: {d['ask']:.5f}\n"
-                    f"  Spread: {d['spread']:.1f} pips\n"
-                    f"  Buffer Size: {d['buffer_size']}\n"
-                    f"  Entropy (E): {d['E']:.2f}\n"
-                    f"  Spin (S): {d['S']:.2f}\n"
-                    f"  Confidence (C): {d['C']:.2f}\n"
-                    f"  Volatility (V): {d['V']:.2f}\n"
-                    "------------------------------------------------------"
-                for d in heartbeat_data[:5]) +
-                "\n======================================================\n"
-            )
-            self.logger.info(hb_msg)
+            for d in heartbeat_data[:5]:
+                hot_log.record(logging.INFO, "HEARTBEAT", symbol=d['symbol'], bid=d['bid'], ask=d['ask'], spread=d['spread'],
+                               buffer_size=d['buffer_size'], E=d['E'], S=d['S'], C=d['C'], V=d['V'])
             try:
-                positions_count = len(mt5.positions_get() or [])
+                positions_count = len(mt5_snapshot.positions_get() or [])
                 self.logger.info(f"Sistema attivo - Posizioni: {positions_count}/1")
             except Exception:
                 pass
@@ -116,7 +112,7 @@ class QuantumEngine:
                             "Possibile problema di connessione, dati o mercato chiuso.\n"
                             "======================================================\n")
             try:
-                positions_count = len(mt5.positions_get() or [])
+                positions_count = len(mt5_snapshot.positions_get() or [])
                 self.logger.info(f"Sistema attivo - Posizioni: {positions_count}/1")
             except Exception:
                 pass
@@ -124,18 +120,46 @@ class QuantumEngine:
             self.logger.warning(f"Buffer insufficiente: {', '.join(warning_symbols[:3])}")
         if issues:
             self.logger.warning(f"Problemi: {' | '.join(issues[:3])}")
+        self.logger.info(
+            "[CACHE] " + " | ".join(
+                f"{name}: hit_rate={st['hit_rate']:.2f} hits={st['hits']} misses={st['misses']} evictions={st['evictions']} entries={st['entries']}"
+                for name, st in self.get_cache_stats().items()
+            )
+        )
+        for name, st in get_async_writers_stats().items():
+            self.logger.info(
+                f"[ASYNC-CSV] {name}: written={st['written']} dropped={st['dropped']} queue={st['queue_depth']} "
+                f"flush_ms={st['last_flush_ms']:.1f} max_flush_ms={st['max_flush_ms']:.1f} rotations={st['rotations']}"
+            )
+        st = mt5_snapshot.stats()
+        self.logger.info(
+            f"[MT5-SNAPSHOT] hits={st['hits']} fetches={st['fetches']} refreshes={st['refreshes']} invalidations={st['invalidations']}"
+        )
         return True
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, clock=None, registry=None, client=None):
         self.config_manager = config_manager
         self.config = config_manager.config if hasattr(config_manager, 'config') else config_manager
+        # Orologio dei cooldown: tempo reale in produzione, tempo dei tick nel replay del backtest
+        self._clock = clock or time.time
+        # Broker e registry dei simboli: quelli condivisi del processo, o privati (backtest sul simulatore)
+        self.client = client if client is not None else mt5
+        self.symbol_registry = registry if registry is not None else symbol_registry
         self._runtime_lock = threading.RLock()
-        self._tick_buffer = defaultdict(deque)
-        self._position_cooldown = {}
-        self._last_signal_time = {}
+        # Stato per simbolo: creato una sola volta in _ensure_symbol, poi letto/scritto senza lock globale
+        self._tick_buffer = {}
+        self._spin_stats = {}
+        self._entropy_stats = {}
+        self._symbol_locks = {}
+        self._symbol_version = {}
+        self._last_time_msc = {}
         self._volatility_cache = {}
         self._spin_cache = {}
+        self._entropy_cache = {}
+        self._position_cooldown = {}
+        self._last_signal_time = {}
         self._signal_stats = {'BUY': 0, 'SELL': 0}
         self._last_warning_time = {}
+        self._last_evaluation = {}  # symbol -> SignalEvaluation dell'ultima valutazione
         qp = self.config.get('quantum_params', {})
         self.buffer_size = qp.get('buffer_size', 100)
         self.spin_window = qp.get('spin_window', 20)
@@ -143,20 +167,110 @@ class QuantumEngine:
         self.spin_threshold = qp.get('spin_threshold', 0.25)
         self.signal_cooldown = qp.get('signal_cooldown', 300)
         self.entropy_thresholds = qp.get('entropy_thresholds', {'buy_signal': 0.55, 'sell_signal': 0.45})
-        for symbol in self.config.get('symbols', {}):
-            self._tick_buffer[symbol] = deque(maxlen=self.buffer_size)
+        # Quotazioni a prezzo invariato accorpate nel tick precedente (contatore repeats) invece di nuove voci
+        self.coalesce_unchanged_ticks = qp.get('coalesce_unchanged_ticks', False)
+        # Formato log segnali: 'journal' (binario tipizzato, default); 'csv' o 'both' solo per i tool sul CSV storico
+        self.signal_log_format = self.config.get('logging', {}).get('signal_log_format', 'journal')
+        # HOLD: 'all' = una riga per valutazione, 'aggregate' = un riepilogo per simbolo/motivo/intervallo
+        self._hold_aggregator = None
+        if self.config.get('logging', {}).get('hold_log_mode', 'all') == 'aggregate':
+            project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+            summary_writer = get_async_csv_writer(os.path.join(project_root, 'logs', 'signals_hold_summary.csv'), HOLD_SUMMARY_HEADER)
+            self._hold_aggregator = HoldAggregator(
+                summary_writer.write,
+                interval=self.config.get('logging', {}).get('hold_aggregate_interval', 60)
+            )
+        # Registrazione dei tick accettati nell'archivio compresso per simbolo/giorno (replay e backtest)
+        self._tick_recorder = None
+        recorder_cfg = self.config.get('tick_recorder', {})
+        if recorder_cfg.get('enabled', False):
+            self._tick_recorder = get_tick_recorder(
+                recorder_cfg.get('path'),
+                batch_size=recorder_cfg.get('batch_size', 5000),
+                flush_interval=recorder_cfg.get('flush_interval', 5.0)
+            )
         self._cache_timeout = 60
+        self._cache_max_entries = 64
+        for symbol in self.config.get('symbols', {}):
+            self._ensure_symbol(symbol)
         self.warning_cooldown = 300
         self.last_confidence = None
-        import logging
         self.logger = logging.getLogger("phoenix_quantum")
 
-    def get_tick_buffer(self, symbol):
+    def _ensure_symbol(self, symbol):
+        """Crea (una sola volta) buffer, accumulatori, cache e lock di scrittura del simbolo."""
+        if symbol in self._tick_buffer:
+            return
+        with self._runtime_lock:
+            if symbol in self._tick_buffer:
+                return
+            window = min(self.spin_window, self.buffer_size)
+            self._spin_stats[symbol] = RollingSpinStats(window)
+            self._entropy_stats[symbol] = RollingEntropy(window)
+            self._volatility_cache[symbol] = SymbolCache(self._cache_timeout, self._cache_max_entries)
+            self._spin_cache[symbol] = SymbolCache(self._cache_timeout, self._cache_max_entries)
+            self._entropy_cache[symbol] = SymbolCache(self._cache_timeout, self._cache_max_entries)
+            self._symbol_locks[symbol] = threading.RLock()  # Rientrante: process_tick calcola la delta sotto lo stesso lock di _push_tick
+            self._symbol_version[symbol] = 0
+            # Il buffer per ultimo: la sua presenza indica che lo stato del simbolo è completo
+            self._tick_buffer[symbol] = TickRingBuffer(self.buffer_size)
+
+    def get_tick_buffer(self, symbol) -> TickRingBuffer:
+        self._ensure_symbol(symbol)
         return self._tick_buffer[symbol]
 
     def append_tick(self, symbol, tick):
-        with self._runtime_lock:
-            self._tick_buffer[symbol].append(tick)
+        self._push_tick(symbol, tick['price'], tick.get('delta', 0.0), tick.get('direction', 0), tick.get('time', time.time()))
+
+    def _push_tick(self, symbol, price, delta, direction, ts):
+        """
+        Scrive il tick nel ring buffer e aggiorna gli accumulatori incrementali del simbolo.
+        Serializza solo gli scrittori dello stesso simbolo; la versione dispari segnala ai
+        lettori (_read_symbol_state) che una scrittura è in corso.
+        """
+        self._ensure_symbol(symbol)
+        with self._symbol_locks[symbol]:
+            version = self._symbol_version[symbol]
+            self._symbol_version[symbol] = version + 1
+            self._tick_buffer[symbol].append(price, delta, direction, ts)
+            self._spin_stats[symbol].push(direction)
+            self._entropy_stats[symbol].push(delta)
+            self._symbol_version[symbol] = version + 2
+
+    def _read_symbol_state(self, symbol, max_retries: int = 100) -> tuple:
+        """
+        Snapshot coerente dello stato incrementale del simbolo senza bloccare gli scrittori:
+        rilegge finché la versione è pari e invariata (seqlock). Dopo max_retries ripiega
+        sul lock di scrittura del solo simbolo.
+        """
+        self._ensure_symbol(symbol)
+        buf = self._tick_buffer[symbol]
+        spin_stats = self._spin_stats[symbol]
+        entropy_stats = self._entropy_stats[symbol]
+
+        def _read():
+            return (len(buf), spin_stats.count, spin_stats.up, spin_stats.down,
+                    entropy_stats.nonzero, entropy_stats.sum_abs, entropy_stats.sum_xlogx,
+                    buf.last_price or 0.0)
+
+        for _ in range(max_retries):
+            before = self._symbol_version[symbol]
+            if before % 2:
+                continue
+            state = _read()
+            if self._symbol_version[symbol] == before:
+                return state
+        with self._symbol_locks[symbol]:
+            return _read()
+
+    def get_spin_stats(self, symbol) -> RollingSpinStats:
+        self._ensure_symbol(symbol)
+        return self._spin_stats[symbol]
+
+    def get_entropy(self, symbol: str) -> float:
+        """Entropia normalizzata sugli ultimi spin_window tick del simbolo, aggiornata a ogni tick."""
+        self._ensure_symbol(symbol)
+        return self._entropy_stats[symbol].entropy()
 
     def get_position_cooldown(self, symbol=None):
         with self._runtime_lock:
@@ -178,6 +292,10 @@ class QuantumEngine:
         with self._runtime_lock:
             self._last_signal_time[symbol] = value
 
+    def get_last_evaluation(self, symbol: str):
+        """Ultima SignalEvaluation del simbolo (metriche già calcolate nel ciclo), None se mai valutato."""
+        return self._last_evaluation.get(symbol)
+
     def get_signal_stats(self):
         with self._runtime_lock:
             return dict(self._signal_stats)
@@ -189,21 +307,39 @@ class QuantumEngine:
             else:
                 self._signal_stats[signal] = 1
 
-    def get_volatility_cache(self):
-        with self._runtime_lock:
-            return dict(self._volatility_cache)
+    def get_volatility_cache(self, symbol=None):
+        if symbol is not None:
+            self._ensure_symbol(symbol)
+            return self._volatility_cache[symbol].snapshot()
+        return {s: cache.snapshot() for s, cache in list(self._volatility_cache.items())}
 
-    def set_volatility_cache(self, key, value):
-        with self._runtime_lock:
-            self._volatility_cache[key] = value
+    def set_volatility_cache(self, symbol, value, window: int = 50):
+        self._ensure_symbol(symbol)
+        self._volatility_cache[symbol].set((window, self._symbol_version[symbol]), value)
 
-    def get_spin_cache(self):
-        with self._runtime_lock:
-            return dict(self._spin_cache)
+    def get_spin_cache(self, symbol=None):
+        if symbol is not None:
+            self._ensure_symbol(symbol)
+            return self._spin_cache[symbol].snapshot()
+        return {s: cache.snapshot() for s, cache in list(self._spin_cache.items())}
 
-    def set_spin_cache(self, key, value):
-        with self._runtime_lock:
-            self._spin_cache[key] = value
+    def set_spin_cache(self, symbol, key, value):
+        self._ensure_symbol(symbol)
+        self._spin_cache[symbol].set(key, value)
+
+    def get_cache_stats(self) -> dict:
+        """Contatori hit/miss/eviction aggregati per cache (spin, volatility, entropy) su tutti i simboli."""
+        result = {}
+        for name, caches in (('spin', self._spin_cache), ('volatility', self._volatility_cache), ('entropy', self._entropy_cache)):
+            totals = {'entries': 0, 'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+            for cache in list(caches.values()):
+                for key, value in cache.stats().items():
+                    if key in totals:
+                        totals[key] += value
+            lookups = totals['hits'] + totals['misses']
+            totals['hit_rate'] = totals['hits'] / lookups if lookups else 0.0
+            result[name] = totals
+        return result
 
     def get_last_warning_time(self, symbol=None):
         with self._runtime_lock:
@@ -218,14 +354,15 @@ class QuantumEngine:
 
     def is_in_cooldown_period(self, symbol: str) -> bool:
         last_close = self.get_position_cooldown(symbol)
+        now = self._clock()
         position_cooldown = self.config.get('risk_parameters', {}).get('position_cooldown', 1800)
-        if time.time() - last_close < position_cooldown:
-            self.logger.info(f"Cooldown normale attivo per {symbol} - {position_cooldown - (time.time() - last_close):.0f}s rimanenti")
+        if now - last_close < position_cooldown:
+            self.logger.info(f"Cooldown normale attivo per {symbol} - {position_cooldown - (now - last_close):.0f}s rimanenti")
             return True
         signal_cooldown = self.config.get('quantum_params', {}).get('signal_cooldown', 900)
         last_signal = self.get_last_signal_time(symbol)
-        if time.time() - last_signal < signal_cooldown:
-            self.logger.debug(f"Cooldown segnale attivo per {symbol} - {signal_cooldown - (time.time() - last_signal):.0f}s rimanenti")
+        if now - last_signal < signal_cooldown:
+            self.logger.debug(f"Cooldown segnale attivo per {symbol} - {signal_cooldown - (now - last_signal):.0f}s rimanenti")
             return True
         return False
 
@@ -240,7 +377,7 @@ class QuantumEngine:
         if self.is_in_cooldown_period(symbol):
             return False
         try:
-            symbol_info = mt5.symbol_info(symbol)
+            symbol_info = mt5_snapshot.symbol_info(symbol)
             if not symbol_info:
                 self.logger.error(f"Impossibile ottenere info simbolo {symbol}")
                 return False
@@ -257,20 +394,20 @@ class QuantumEngine:
         except Exception as e:
             self.logger.error(f"Errore verifica spread {symbol}: {e}")
             return False
-        positions = mt5.positions_get()
+        positions = mt5_snapshot.positions_get()
         if positions and len(positions) >= self.config.get('risk_parameters', {}).get('max_positions', 1):
             self.logger.warning(f"Massimo numero posizioni raggiunto: {len(positions)}")
             return False
         return True
 
     def record_trade_close(self, symbol: str):
-        if mt5.positions_get(symbol=symbol) is None or len(mt5.positions_get(symbol=symbol)) == 0:
-            self.set_position_cooldown(symbol, time.time())
+        if not mt5_snapshot.positions_get(symbol=symbol):
+            self.set_position_cooldown(symbol, self._clock())
             self.logger.info(f"Cooldown registrato per {symbol} (1800s)")
 
     @staticmethod
-    @lru_cache(maxsize=1000)
     def calculate_entropy(deltas: Tuple[float]) -> float:
+        """Implementazione di riferimento (ricalcolo completo); il percorso caldo usa get_entropy()."""
         deltas_arr = np.array(deltas)
         abs_deltas = np.abs(deltas_arr)
         sum_abs_deltas = np.sum(abs_deltas) + 1e-10
@@ -281,22 +418,22 @@ class QuantumEngine:
         entropy = -np.sum(valid_probs * np.log(valid_probs + 1e-10)) / np.log(len(valid_probs) + 1e-10)
         return float(np.clip(entropy, 0.0, 1.0))
 
-    def calculate_spin(self, ticks: List[Dict]) -> Tuple[float, float]:
-        if not ticks or len(ticks) < self.min_spin_samples:
+    def calculate_spin(self, symbol: str) -> Tuple[float, float]:
+        """Spin e confidence sugli ultimi spin_window tick del simbolo, in O(1) dall'accumulatore incrementale."""
+        stats = self.get_spin_stats(symbol)
+        if stats.count < self.min_spin_samples:
             return 0.0, 0.0
-        cache_key = hash(tuple((t['price'], t['direction']) for t in ticks[-self.spin_window:]))
-        return self._get_cached(self._spin_cache, cache_key, self._calculate_spin_impl, ticks[-self.spin_window:])
+        return stats.spin()
 
-    def _calculate_spin_impl(self, ticks: List[Dict]) -> Tuple[float, float]:
+    def _calculate_spin_impl(self, directions: np.ndarray) -> Tuple[float, float]:
         try:
-            if len(ticks) < 5:
+            if len(directions) < 5:
                 return 0.0, 0.0
-            valid_ticks = [t for t in ticks if t.get('direction', 0) != 0]
-            if len(valid_ticks) < 3:
+            positive = int(np.count_nonzero(directions > 0))
+            negative = int(np.count_nonzero(directions < 0))
+            total = positive + negative
+            if total < 3:
                 return 0.0, 0.0
-            positive = sum(1 for t in valid_ticks if t.get('direction', 0) > 0)
-            negative = sum(1 for t in valid_ticks if t.get('direction', 0) < 0)
-            total = len(valid_ticks)
             raw_spin = (positive - negative) / total
             balance_deviation = abs(positive - negative) / total
             confidence = min(1.0, balance_deviation * np.sqrt(total))
@@ -304,126 +441,238 @@ class QuantumEngine:
         except Exception:
             return 0.0, 0.0
 
+    def _window_spin(self, symbol: str) -> Tuple[float, float]:
+        """Spin sull'intero buffer del simbolo, in cache finché non arriva un nuovo tick."""
+        buf = self.get_tick_buffer(symbol)
+        key = ('buffer', self._symbol_version[symbol])
+        return self._spin_cache[symbol].get_or_compute(key, lambda: self._calculate_spin_impl(buf.directions()), default=(0.0, 0.0))
+
+    def _window_entropy(self, symbol: str, window: int) -> float:
+        """Entropia delle ultime `window` delta (normalizzata su log(window)), in cache finché non arriva un nuovo tick."""
+        buf = self.get_tick_buffer(symbol)
+        def _calculate():
+            abs_deltas = np.abs(buf.deltas(window))
+            prob_dist = abs_deltas / (np.sum(abs_deltas) + 1e-10)
+            return float(-np.sum(prob_dist * np.log(prob_dist + 1e-10)) / np.log(window))
+        key = (window, self._symbol_version[symbol])
+        return self._entropy_cache[symbol].get_or_compute(key, _calculate, default=0.0)
+
     def calculate_quantum_volatility(self, symbol: str, window: int = 50) -> float:
         def _calculate():
-            ticks = list(self.get_tick_buffer(symbol))
-            if len(ticks) < window:
+            if len(self.get_tick_buffer(symbol)) < window:
                 return 1.0
-            deltas = np.array([t['delta'] for t in ticks[-window:]])
-            prob_dist = np.abs(deltas) / (np.sum(np.abs(deltas)) + 1e-10)
-            entropy = -np.sum(prob_dist * np.log(prob_dist + 1e-10)) / np.log(window)
-            spin, _ = self._calculate_spin_impl(ticks)
+            entropy = self._window_entropy(symbol, window)
+            spin, _ = self._window_spin(symbol)
             return 1 + abs(spin) * entropy
-        return self._get_cached(self._volatility_cache, symbol, _calculate)
+        self._ensure_symbol(symbol)
+        # Chiave con la versione del simbolo: un nuovo tick invalida il valore (come spin ed entropia di finestra)
+        key = (window, self._symbol_version[symbol])
+        return self._volatility_cache[symbol].get_or_compute(key, _calculate, default=1.0)
 
-    def process_tick(self, symbol: str, price: float):
+    def process_tick(self, symbol: str, price: float, time_msc: int = None,
+                     bid: float = None, ask: float = None, flags: int = 0) -> bool:
+        """
+        Inserisce un tick nel buffer del simbolo. Con `time_msc` (identità del tick MT5) un tick
+        già inserito viene ignorato; con coalesce_unchanged_ticks un prezzo invariato incrementa
+        solo il contatore repeats dell'ultimo tick. Restituisce False se non è stata aggiunta una voce.
+        Con tick_recorder attivo ogni tick non duplicato viene accodato all'archivio (bid/ask, o price se assenti).
+        """
         buf = self.get_tick_buffer(symbol)
         if price <= 0:
             self.logger.warning(f"[process_tick] Prezzo non valido per {symbol}: {price}")
-            return
-        if len(buf) > 0:
-            last_price = buf[-1]['price']
-            delta = price - last_price
-            direction = 1 if delta > 0 else (-1 if delta < 0 else 0)
-        else:
-            delta = 0
-            direction = 0
-        tick = {
-            'price': price,
-            'delta': delta,
-            'direction': direction,
-            'time': time.time()
-        }
-        self.append_tick(symbol, tick)
-        self.logger.debug(f"[TICK] {symbol}: price={price}, delta={delta}, direction={direction}, buffer_size={len(self.get_tick_buffer(symbol))}")
-        if len(self.get_tick_buffer(symbol)) == 0:
+            return False
+        with self._symbol_locks[symbol]:
+            if time_msc is not None:
+                if self._last_time_msc.get(symbol) == time_msc:
+                    return False
+                self._last_time_msc[symbol] = time_msc
+            if self._tick_recorder is not None:
+                self._tick_recorder.record(
+                    symbol, time_msc if time_msc is not None else int(time.time() * 1000),
+                    price if bid is None else bid, price if ask is None else ask, flags
+                )
+            if len(buf) > 0:
+                last_price = buf.last_price
+                delta = price - last_price
+                direction = 1 if delta > 0 else (-1 if delta < 0 else 0)
+                if direction == 0 and self.coalesce_unchanged_ticks:
+                    # Nessuna informazione nuova: metriche e cache restano valide, versione invariata
+                    buf.bump_last(time.time())
+                    return False
+            else:
+                delta = 0
+                direction = 0
+            self._push_tick(symbol, price, delta, direction, time.time())
+        hot_log.debug("TICK", symbol=symbol, price=price, delta=delta, direction=direction, buffer_size=len(buf))
+        if len(buf) == 0:
             self.logger.warning(f"[process_tick] Buffer vuoto dopo inserimento per {symbol}.")
+        return True
 
-    def get_signal(self, symbol: str) -> Tuple[str, float]:
-        ticks = list(self.get_tick_buffer(symbol))
-        if len(ticks) < self.min_spin_samples:
-            signal = "HOLD"
-            last_tick_price = 0.0
-            # Log anche i casi HOLD per buffer insufficiente
-            log_signal_tick(symbol, {
-                'price': last_tick_price,
-                'entropy': 0.0,
-                'spin': 0.0,
-                'confidence': 0.0,
-                'signal': signal
-            }, reason="Buffer tick insufficiente")
-            self.logger.debug(f"[CSV] {symbol}, {last_tick_price}, 0.0, 0.0, 0.0, {signal}, Buffer tick insufficiente")
-            return signal, last_tick_price
-        spin_window = min(self.spin_window, len(ticks))
-        recent_ticks = ticks[-spin_window:]
-        spin, confidence = self.calculate_spin(recent_ticks)
-        last_tick_price = recent_ticks[-1]['price'] if recent_ticks else 0.0
-        if confidence < 0.8:
-            signal = "HOLD"
-            log_signal_tick(symbol, {
-                'price': last_tick_price,
-                'entropy': 0.0,
-                'spin': spin,
-                'confidence': confidence,
-                'signal': signal
-            }, reason="Confidence troppo bassa")
-            self.logger.debug(f"[CSV] {symbol}, {last_tick_price}, 0.0, {spin}, {confidence}, {signal}, Confidence troppo bassa")
-            return signal, last_tick_price
-        last_signal_time = self.get_last_signal_time(symbol)
-        if self._check_signal_cooldown(symbol, last_signal_time):
-            signal = "HOLD"
-            log_signal_tick(symbol, {
-                'price': last_tick_price,
-                'entropy': 0.0,
-                'spin': spin,
-                'confidence': confidence,
-                'signal': signal
-            }, reason="Cooldown segnale attivo")
-            self.logger.debug(f"[CSV] {symbol}, {last_tick_price}, 0.0, {spin}, {confidence}, {signal}, Cooldown segnale attivo")
-            return signal, last_tick_price
-        deltas = tuple(t['delta'] for t in recent_ticks if abs(t['delta']) > 1e-10)
-        entropy = self.calculate_entropy(deltas)
-        volatility = 1 + abs(spin) * entropy
+    def get_last_time_msc(self, symbol: str):
+        """time_msc dell'ultimo tick inserito con identità (None se mai visto)."""
+        return self._last_time_msc.get(symbol)
+
+    def ingest_ticks(self, symbol: str, prices, times_msc) -> int:
+        """
+        Inserimento batch di tick storici (backfill) in ordine cronologico, sotto un'unica
+        acquisizione del lock del simbolo. Vengono scartati i tick con time_msc non successivo
+        all'ultimo già inserito e quelli con prezzo non valido. Restituisce i tick inseriti.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        times_msc = np.asarray(times_msc, dtype=np.int64)
+        buf = self.get_tick_buffer(symbol)
+        inserted = 0
+        with self._symbol_locks[symbol]:
+            last_msc = self._last_time_msc.get(symbol)
+            mask = prices > 0
+            if last_msc is not None:
+                mask &= times_msc > last_msc
+            prices = prices[mask]
+            times_msc = times_msc[mask]
+            if len(prices) == 0:
+                return 0
+            # Solo le ultime buffer_size delta restano in finestra: le più vecchie non servono
+            if len(prices) > self.buffer_size + 1:
+                prices = prices[-(self.buffer_size + 1):]
+                times_msc = times_msc[-(self.buffer_size + 1):]
+            last_price = buf.last_price if len(buf) > 0 else None
+            for price, time_msc in zip(prices.tolist(), times_msc.tolist()):
+                delta = 0.0 if last_price is None else price - last_price
+                direction = 1 if delta > 0 else (-1 if delta < 0 else 0)
+                if direction == 0 and last_price is not None and self.coalesce_unchanged_ticks:
+                    buf.bump_last(time_msc / 1000.0)
+                    continue
+                self._push_tick(symbol, price, delta, direction, time_msc / 1000.0)
+                last_price = price
+                inserted += 1
+            self._last_time_msc[symbol] = int(times_msc[-1])
+        self.logger.debug(f"[BACKFILL] {symbol}: inseriti {inserted} tick, buffer_size={len(buf)}")
+        return inserted
+
+    def get_signal(self, symbol: str, for_trading: bool = False, motivo_for_csv: list = None) -> Tuple[str, float]:
+        """Segnale per un singolo simbolo: stesso percorso vettoriale di get_signals."""
+        signal, price, reason = self._evaluate_signals([symbol])[0]
+        if motivo_for_csv is not None and signal == "HOLD":
+            motivo_for_csv.append(reason)
+        return signal, price
+
+    def get_signals(self, symbols) -> Dict[str, Tuple[str, float]]:
+        """
+        Valuta BUY/SELL/HOLD per tutti i simboli in un'unica passata NumPy.
+        Restituisce {symbol: (signal, price)}.
+        """
+        symbols = list(symbols)
+        return {symbol: (signal, price) for symbol, (signal, price, _) in zip(symbols, self._evaluate_signals(symbols))}
+
+    def _evaluate_signals(self, symbols: List[str]) -> List[Tuple[str, float, str]]:
+        n = len(symbols)
+        if n == 0:
+            return []
+        buffer_len = np.empty(n, dtype=np.int64)
+        window_count = np.empty(n, dtype=np.int64)
+        up = np.empty(n, dtype=np.int64)
+        down = np.empty(n, dtype=np.int64)
+        nonzero = np.empty(n, dtype=np.int64)
+        sum_abs = np.empty(n, dtype=np.float64)
+        sum_xlogx = np.empty(n, dtype=np.float64)
+        last_price = np.empty(n, dtype=np.float64)
+        last_signal = np.empty(n, dtype=np.float64)
+        # Snapshot dello stato incrementale per simbolo (una riga per simbolo, senza lock globale)
+        for i, symbol in enumerate(symbols):
+            (buffer_len[i], window_count[i], up[i], down[i], nonzero[i],
+             sum_abs[i], sum_xlogx[i], last_price[i]) = self._read_symbol_state(symbol)
+            last_signal[i] = self._last_signal_time.get(symbol, 0)
+
+        (entropy, spin, confidence, insufficient, low_confidence,
+         buy_condition, sell_condition) = self.signal_components(buffer_len, window_count, up, down, nonzero, sum_abs, sum_xlogx)
+
+        now = self._clock()
+        in_cooldown = ~insufficient & ~low_confidence & (now - last_signal < self.signal_cooldown)
+
+        results = []
+        for i, symbol in enumerate(symbols):
+            price = float(last_price[i])
+            if insufficient[i]:
+                signal, reason, price = "HOLD", "Buffer tick insufficiente", 0.0
+                values = (0.0, 0.0, 0.0)
+            elif low_confidence[i]:
+                signal, reason = "HOLD", "Confidence troppo bassa"
+                values = (0.0, float(spin[i]), float(confidence[i]))
+            elif in_cooldown[i]:
+                hot_log.info("COOLDOWN", symbol=symbol, remaining=int(self.signal_cooldown - (now - last_signal[i])))
+                signal, reason = "HOLD", "Cooldown segnale attivo"
+                values = (0.0, float(spin[i]), float(confidence[i]))
+            else:
+                if buy_condition[i]:
+                    signal, reason = "BUY", "Condizioni BUY"
+                elif sell_condition[i]:
+                    signal, reason = "SELL", "Condizioni SELL"
+                else:
+                    signal, reason = "HOLD", "Nessuna condizione BUY/SELL"
+                values = (float(entropy[i]), float(spin[i]), float(confidence[i]))
+            self._log_signal(symbol, price, *values, signal, reason)
+            self._last_evaluation[symbol] = SignalEvaluation(
+                now, signal, price, reason, float(entropy[i]), float(spin[i]), float(confidence[i]), int(buffer_len[i])
+            )
+            results.append((signal, price, reason))
+        return results
+
+    def signal_components(self, buffer_len, window_count, up, down, nonzero, sum_abs, sum_xlogx) -> tuple:
+        """
+        Formula del segnale su array di stato (una riga per simbolo in get_signals, una per tick nel
+        backtest vettoriale). Restituisce (entropy, spin, confidence, insufficient, low_confidence,
+        buy_condition, sell_condition); il cooldown segnale resta a carico del chiamante.
+        """
+        # Spin e confidence (stessa semantica di RollingSpinStats.spin)
+        total = up + down
+        imbalance = up - down
+        safe_total = np.maximum(total, 1)
+        spin_ok = (window_count >= self.min_spin_samples) & (window_count >= 5) & (total >= 3)
+        spin = np.where(spin_ok, imbalance / safe_total, 0.0)
+        confidence = np.where(spin_ok, np.minimum(1.0, np.abs(imbalance) / safe_total * np.sqrt(total)), 0.0)
+
+        # Entropia normalizzata (stessa semantica di RollingEntropy.entropy)
+        entropy_ok = (nonzero > 1) & (sum_abs > 0.0)
+        safe_sum = np.where(entropy_ok, sum_abs, 1.0)
+        safe_log_n = np.log(np.where(entropy_ok, nonzero, 2))
+        entropy = np.where(entropy_ok, (np.log(safe_sum) - sum_xlogx / safe_sum) / safe_log_n, 0.0)
+        entropy = np.clip(entropy, 0.0, 1.0)
+
+        volatility = 1 + np.abs(spin) * entropy
         buy_thresh, sell_thresh = self._calculate_signal_thresholds(volatility)
-        buy_condition = entropy > buy_thresh and spin > self.spin_threshold * confidence
-        sell_condition = entropy < sell_thresh and spin < -self.spin_threshold * confidence
-        if buy_condition:
-            signal = "BUY"
-            log_signal_tick(symbol, {
-                'price': last_tick_price,
-                'entropy': entropy,
-                'spin': spin,
-                'confidence': confidence,
-                'signal': signal
-            }, reason="Condizioni BUY")
-            self.logger.debug(f"[CSV] {symbol}, {last_tick_price}, {entropy}, {spin}, {confidence}, {signal}, Condizioni BUY")
-            return signal, last_tick_price
-        elif sell_condition:
-            signal = "SELL"
+        buy_condition = (entropy > buy_thresh) & (spin > self.spin_threshold * confidence)
+        sell_condition = (entropy < sell_thresh) & (spin < -self.spin_threshold * confidence)
+
+        insufficient = buffer_len < self.min_spin_samples
+        low_confidence = ~insufficient & (confidence < 0.8)
+        return entropy, spin, confidence, insufficient, low_confidence, buy_condition, sell_condition
+
+    def _log_signal(self, symbol: str, price: float, entropy: float, spin: float, confidence: float, signal: str, reason: str):
+        if signal == "HOLD" and self._hold_aggregator is not None:
+            self._hold_aggregator.add(symbol, reason, confidence, price)
+            return
+        if self.signal_log_format in ('journal', 'both'):
+            get_signal_journal().record(symbol, price, entropy, spin, confidence, signal, reason)
+        if self.signal_log_format in ('csv', 'both'):
             log_signal_tick(symbol, {
-                'price': last_tick_price,
+                'price': price,
                 'entropy': entropy,
                 'spin': spin,
                 'confidence': confidence,
                 'signal': signal
-            }, reason="Condizioni SELL")
-            self.logger.debug(f"[CSV] {symbol}, {last_tick_price}, {entropy}, {spin}, {confidence}, {signal}, Condizioni SELL")
-            return signal, last_tick_price
-        signal = "HOLD"
-        log_signal_tick(symbol, {
-            'price': last_tick_price,
-            'entropy': entropy,
-            'spin': spin,
-            'confidence': confidence,
-            'signal': signal
-        }, reason="Nessuna condizione BUY/SELL")
-        self.logger.debug(f"[CSV] {symbol}, {last_tick_price}, {entropy}, {spin}, {confidence}, {signal}, Nessuna condizione BUY/SELL")
-        return signal, last_tick_price
+            }, reason=reason)
+        hot_log.debug("CSV", symbol=symbol, price=price, entropy=entropy, spin=spin, confidence=confidence, signal=signal, reason=reason)
+
+    def flush_signal_logs(self) -> None:
+        """Emette i riepiloghi HOLD ancora aperti (chiamato all'arresto del sistema)."""
+        if self._hold_aggregator is not None:
+            self._hold_aggregator.flush()
 
     def _check_signal_cooldown(self, symbol: str, last_signal_time: float) -> bool:
-        if time.time() - last_signal_time < self.signal_cooldown:
-            remaining = int(self.signal_cooldown - (time.time() - last_signal_time))
-            self.logger.info(f"{symbol}: Cooldown segnale attivo ({remaining}s rimanenti)")
+        now = self._clock()
+        if now - last_signal_time < self.signal_cooldown:
+            remaining = int(self.signal_cooldown - (now - last_signal_time))
+            hot_log.info("COOLDOWN", symbol=symbol, remaining=remaining)
             return True
         return False
 
@@ -435,44 +684,9 @@ class QuantumEngine:
         sell_thresh = base_sell_thresh * (1 - (volatility - 1) * 0.5)
         return buy_thresh, sell_thresh
 
-    def _get_cached(self, cache_dict, key, calculate_func, *args):
-        acquired = self._runtime_lock.acquire(timeout=2.0)
-        if not acquired:
-            return (0.0, 0.0)
-        try:
-            now = time.time()
-            cache = cache_dict
-            if key in cache:
-                value, timestamp = cache[key]
-                if now - timestamp < self._cache_timeout:
-                    return value
-            try:
-                value = calculate_func(*args)
-            except Exception:
-                value = (0.0, 0.0)
-            cache[key] = (value, now)
-            return value
-        finally:
-            self._runtime_lock.release()
-
     def _get_pip_size(self, symbol: str) -> float:
-        with self._runtime_lock:
-            try:
-                info = mt5.symbol_info(symbol)
-                if info and info.point > 0:
-                    return info.point
-                pip_map = {
-                    'BTCUSD': 1.0,
-                    'ETHUSD': 0.1,
-                    'XAUUSD': 0.01,
-                    'SP500': 0.1,
-                    'NAS100': 0.1,
-                    'default': 0.0001
-                }
-                base_symbol = symbol.split('.')[0]
-                return pip_map.get(base_symbol, pip_map['default'])
-            except Exception:
-                return 0.0001
+        """Point del simbolo dal registro metadati: nessun lock né chiamata MT5 dopo il primo caricamento."""
+        return self.symbol_registry.point(symbol)
 
     def get_quantum_params(self, symbol: str) -> dict:
         base_params = self.config.get('quantum_params', {})
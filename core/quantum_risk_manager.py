@@ -1,5 +1,5 @@
 from core.daily_drawdown_tracker import DailyDrawdownTracker
-import MetaTrader5 as mt5
+from core.mt5_backend import mt5
 import threading
 # Fix: aggiungo import numpy as np
 import numpy as np
@@ -9,6 +9,9 @@ Modulo QuantumRiskManager: gestisce la logica di risk management per il sistema
 """
 import logging
 from typing import Tuple, Any
+from utils.hot_log import hot_log
+from core.mt5_snapshot import mt5_snapshot
+from core.symbol_registry import symbol_registry
 
 
 
@@ -28,14 +31,19 @@ class QuantumRiskManager:
         Alias per il calcolo della size del lotto, compatibile con il main.
         order_type: mt5.ORDER_TYPE_BUY/SELL -> convertito in stringa 'BUY'/'SELL'
         """
-        signal = 'BUY' if order_type == mt5.ORDER_TYPE_BUY else 'SELL'
+        signal = 'BUY' if order_type == self.client.ORDER_TYPE_BUY else 'SELL'
         return self.calculate_position_size(symbol, price, signal, risk_percent)
     # ... qui prosegue la classe con i metodi che ora useranno self.config_manager.symbols invece di self.symbols ...
     """
     1. Inizializzazione
     """
-    def __init__(self, config, engine, trading_system=None):
-        """Initialize with either ConfigManager or dict, thread-safe runtime"""
+    def __init__(self, config, engine, trading_system=None, registry=None, client=None):
+        """
+        Initialize with either ConfigManager or dict, thread-safe runtime.
+        `registry`: SymbolRegistry già configurato da chi crea il risk manager (default: il registry
+        condiviso, configurato una sola volta dal setup del sistema; qui non viene mai riconfigurato).
+        `client`: backend broker (default: il backend attivo del processo; il backtest passa il simulatore).
+        """
         self._lock = threading.Lock()
         if hasattr(config, 'get_risk_params'):
             self._config_manager = config
@@ -45,8 +53,10 @@ class QuantumRiskManager:
             self._config = config
         self.engine = engine
         self.trading_system = trading_system
-        account_info = mt5.account_info()
+        self.client = client if client is not None else mt5
+        account_info = self.client.account_info()
         config_dict = self._config.config if hasattr(self._config, 'config') else self._config
+        self.symbol_registry = registry if registry is not None else symbol_registry
         self.drawdown_tracker = DailyDrawdownTracker(
             account_info.equity if account_info else 10000,
             config_dict
@@ -98,7 +108,7 @@ class QuantumRiskManager:
                 return 0.0
 
             risk_config = self.get_risk_config(symbol)
-            account = mt5.account_info()
+            account = mt5_snapshot.account_info()
             if not account:
                 self.logger.debug(f"[SIZE-DEBUG-TRACE] Blocco su account_info None per {symbol}")
                 self.logger.error("Impossibile ottenere info account")
@@ -131,7 +141,8 @@ class QuantumRiskManager:
             # Normalizza per target_pip_value (opzionale, per rendere P&L simile tra simboli)
             size = size * (pip_value / target_pip_value)
 
-            self.logger.warning(f"[SIZE-DEBUG-TRACE] {symbol} | risk_amount={risk_amount} | sl_pips={sl_pips} | pip_value={pip_value} | size_raw={size} | max_size_limit={self._get_config(symbol, 'max_size_limit', None)} | volume_min={volume_min} | volume_max={volume_max}")
+            hot_log.debug("SIZE-DEBUG-TRACE", symbol=symbol, risk_amount=risk_amount, sl_pips=sl_pips, pip_value=pip_value,
+                          size_raw=size, volume_min=volume_min, volume_max=volume_max)
 
             # Limite massimo assoluto per simbolo
             max_size_limit = self._get_config(symbol, 'max_size_limit', None)
@@ -164,37 +175,11 @@ class QuantumRiskManager:
             # Salva la size calcolata per uso futuro (esposizione globale)
             self._symbol_data[symbol]['last_size'] = size
 
-            symbol_type = 'Metallo' if symbol in ['XAUUSD', 'XAGUSD'] else ('Indice' if symbol in ['SP500', 'NAS100', 'US30', 'DAX40', 'FTSE100', 'JP225'] else 'Forex')
-            
-            self.logger.debug(
-                f"\n-------------------- [SIZE-DEBUG] --------------------\n"
-                f"Symbol: {symbol} ({symbol_type})\n"
-                f"Risk Config: {risk_config}\n"
-                f"Account Equity: {account.equity}\n"
-                f"Risk Percent: {risk_percent}\n"
-                f"Risk Amount: {risk_amount}\n"
-                f"SL Pips: {sl_pips}\n"
-                f"Pip Size: {pip_size}\n"
-                f"Contract Size: {contract_size}\n"
-                f"Pip Value: {pip_value}\n"
-                f"Target Pip Value: {target_pip_value}\n"
-                f"Volume Min: {volume_min}\n"
-                f"Volume Max: {volume_max}\n"
-                f"Volume Step: {volume_step}\n"
-                f"Size (post-normalizzazione): {size}\n"
-                "------------------------------------------------------\n"
-            )
-            
-            self.logger.info(
-                f"\n==================== [SIZE-DEBUG] ====================\n"
-                f"Symbol: {symbol} ({symbol_type})\n"
-                f"Risk Amount: ${risk_amount:.2f} ({risk_percent*100:.2f}%)\n"
-                f"SL: {sl_pips:.2f} pips\n"
-                f"Pip Value: {pip_value}\n"
-                f"Target Pip Value: {target_pip_value}\n"
-                f"Size: {size:.4f}\n"
-                "======================================================\n"
-            )
+            if hot_log.debug_enabled:
+                hot_log.debug("SIZE-DEBUG", symbol=symbol, risk_config=risk_config, equity=account.equity,
+                              pip_size=pip_size, contract_size=contract_size, volume_step=volume_step)
+            hot_log.info("SIZE", symbol=symbol, risk_amount=risk_amount, risk_percent=risk_percent,
+                         sl_pips=sl_pips, pip_value=pip_value, target_pip_value=target_pip_value, size=size)
             return size
         except Exception as e:
             
@@ -206,7 +191,7 @@ class QuantumRiskManager:
     def _apply_size_limits(self, symbol: str, size: float) -> float:
         """Applica limiti di dimensione con controllo margine e logging robusto"""
         try:
-            info = mt5.symbol_info(symbol)
+            info = mt5_snapshot.symbol_info(symbol)
             if not info:
                 
                 self.logger.error(f"[_apply_size_limits] Info simbolo non disponibile per {symbol}")
@@ -218,11 +203,11 @@ class QuantumRiskManager:
             size = max(size, info.volume_min)
             size = min(size, info.volume_max)
             # CONTROLLO MARGINE: Verifica che la posizione sia sostenibile
-            account = mt5.account_info()
+            account = mt5_snapshot.account_info()
             if account and size > 0:
                 try:
-                    margin_required = mt5.order_calc_margin(
-                        mt5.ORDER_TYPE_BUY,
+                    margin_required = self.client.order_calc_margin(
+                        self.client.ORDER_TYPE_BUY,
                         symbol,
                         size,
                         info.ask
@@ -239,13 +224,7 @@ class QuantumRiskManager:
                         size = safe_size
                 except Exception as e:
                     self.logger.error(f"[_apply_size_limits] Errore calcolo margine per {symbol}: {e}", exc_info=True)
-            self.logger.info(
-            
-                "\n==================== [SIZE-FINALE] ====================\n"
-                f"Symbol: {symbol}\n"
-                f"Size finale: {size:.2f}\n"
-                "======================================================\n"
-            )
+            hot_log.info("SIZE-FINALE", symbol=symbol, size=size)
             return size
             
         except Exception as e:
@@ -283,12 +262,12 @@ class QuantumRiskManager:
             profit_multiplier = self._get_config(symbol, 'profit_multiplier', 2.2)
             profit_multiplier_source = 'profit_multiplier (override/symbol/global)'
 
-            symbol_info = mt5.symbol_info(symbol)
-            if not symbol_info:
+            meta = self.symbol_registry.get(symbol)
+            if not meta:
                 self.logger.error(f"Simbolo {symbol} non trovato")
                 return 0.0, 0.0
             pip_size = self.engine._get_pip_size(symbol)
-            digits = symbol_info.digits
+            digits = meta.digits
 
             try:
                 volatility = float(self.engine.calculate_quantum_volatility(symbol))
@@ -311,7 +290,8 @@ class QuantumRiskManager:
             tp_pips = int(round(sl_pips * profit_multiplier))
 
             # --- Trailing stop activation mode support ---
-            trailing_stop = self._get_config(symbol, 'trailing_stop', {})
+            # Sezione annidata: _get_config ridurrebbe il dict al primo valore numerico (es. enable)
+            trailing_stop = self.get_risk_config(symbol).get('trailing_stop', {})
             activation_mode = trailing_stop.get('activation_mode', 'fixed')
             activation_pips = trailing_stop.get('activation_pips', 150)
             if activation_mode == 'percent_tp':
@@ -319,7 +299,7 @@ class QuantumRiskManager:
                 activation_pips = int(round(tp_pips * tp_percentage))
             self._last_trailing_activation_pips = activation_pips  # per debug o uso esterno
 
-            if position_type == mt5.ORDER_TYPE_BUY:
+            if position_type == self.client.ORDER_TYPE_BUY:
                 sl_price = entry_price - (sl_pips * pip_size)
                 tp_price = entry_price + (tp_pips * pip_size)
             else:
@@ -327,24 +307,12 @@ class QuantumRiskManager:
                 tp_price = entry_price - (tp_pips * pip_size)
             sl_price = round(sl_price, digits)
             tp_price = round(tp_price, digits)
-            self.logger.info(
-                "\n==================== [LEVELS-DEBUG] ====================\n"
-                f"Symbol: {symbol}\n"
-                f"SL: {sl_pips} pips\n"
-                f"TP: {tp_pips} pips\n"
-                f"Entry Price: {entry_price}\n"
-                f"SL Price: {sl_price}\n"
-                f"TP Price: {tp_price}\n"
-                f"Pip Size: {pip_size} (from config: {self.engine._get_pip_size(symbol)})\n"
-                f"Digits: {digits}\n"
-                f"Volatility: {volatility:.2f}\n"
-                f"Min SL: {min_sl} [{min_sl_source}]\n"
-                f"Base SL: {base_sl} [{base_sl_source}]\n"
-                f"Multiplier: {profit_multiplier} [{profit_multiplier_source}]\n"
-                f"Trailing Activation Mode: {activation_mode}\n"
-                f"Trailing Activation Pips: {activation_pips}\n"
-                "======================================================\n"
-            )
+            hot_log.info("LEVELS", symbol=symbol, sl_pips=sl_pips, tp_pips=tp_pips, entry=entry_price, sl=sl_price, tp=tp_price,
+                         pip_size=pip_size, digits=digits, volatility=volatility, activation_mode=activation_mode,
+                         activation_pips=activation_pips)
+            if hot_log.debug_enabled:
+                hot_log.debug("LEVELS-SOURCE", symbol=symbol, min_sl=f"{min_sl} [{min_sl_source}]", base_sl=f"{base_sl} [{base_sl_source}]",
+                              multiplier=f"{profit_multiplier} [{profit_multiplier_source}]")
             return sl_price, tp_price
         except Exception as e:
             self.logger.error(f"Errore calcolo livelli per {symbol}: {str(e)}")
@@ -501,50 +469,30 @@ class QuantumRiskManager:
     """
     
     def _load_symbol_data(self, symbol: str) -> bool:
-        """Calcolo preciso del pip size per tutti i tipi di strumenti, con supporto pip_size_map da config"""
+        """Aggiorna _symbol_data del simbolo dal registro metadati (pip size da config/pip_size_map, volumi e digits dal broker)"""
         try:
-            if symbol in self._symbol_data:
-                return True
-
-            info = mt5.symbol_info(symbol)
-            if not info:
+            meta = self.symbol_registry.get(symbol)
+            if meta is None:
                 self.logger.error(f"Impossibile ottenere info MT5 per {symbol}")
                 return False
 
-            # Accesso alla configurazione universale
-            config = self.config.config if hasattr(self.config, 'config') else self.config
-            symbol_config = config.get('symbols', {}).get(symbol, {})
-            risk_config = symbol_config.get('risk_management', {})
-            contract_size = risk_config.get('contract_size', 1.0)
-            point = info.point
-
-            # 1. Cerca pip_size per simbolo in config (override per simbolo)
-            pip_size = None
-            if 'pip_size' in risk_config:
-                pip_size = float(risk_config['pip_size'])
-            else:
-                # 2. Cerca pip_size_map globale
-                pip_map = config.get('pip_size_map', {})
-                pip_size = pip_map.get(symbol)
-                if pip_size is None:
-                    pip_size = pip_map.get('default', 0.0001)
-                pip_size = float(pip_size)
-
-            self._symbol_data[symbol] = {
-                'pip_size': pip_size,
-                'volume_step': info.volume_step,
-                'digits': info.digits,
-                'volume_min': info.volume_min,
-                'volume_max': info.volume_max,
-                'contract_size': contract_size
-            }
-
-            self.logger.debug(f"Dati caricati per {symbol}: PipSize={pip_size}, ContractSize={contract_size}, Point={point}")
-            self.logger.info(f"SYMBOL CONFIG LOADED - {symbol}: "
-                        f"Type={'Forex' if symbol not in ['XAUUSD','XAGUSD','SP500','NAS100','US30'] else 'Special'} | "
-                        f"ContractSize={contract_size} | "
-                        f"PipSize={pip_size} | "
-                        f"Point={point}")
+            data = self._symbol_data.get(symbol)
+            if data is None:
+                data = self._symbol_data[symbol] = {}
+                self.logger.info(f"SYMBOL CONFIG LOADED - {symbol}: "
+                            f"Type={'Forex' if symbol not in ['XAUUSD','XAGUSD','SP500','NAS100','US30'] else 'Special'} | "
+                            f"ContractSize={meta.contract_size} | "
+                            f"PipSize={meta.pip_size} | "
+                            f"Point={meta.point}")
+            # Ricopiati a ogni chiamata: un refresh del registro si riflette subito sul calcolo size
+            data.update(
+                pip_size=meta.pip_size,
+                volume_step=meta.volume_step,
+                digits=meta.digits,
+                volume_min=meta.volume_min,
+                volume_max=meta.volume_max,
+                contract_size=meta.contract_size
+            )
             return True
         except Exception as e:
 
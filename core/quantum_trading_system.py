@@ -11,10 +11,17 @@ import threading
 import datetime
 from datetime import datetime, timedelta
 from collections import defaultdict
-import MetaTrader5 as mt5
+import numpy as np
+from core.mt5_backend import mt5, configure_backend
 from core.trading_metrics import TradingMetrics
 from core.daily_drawdown_tracker import DailyDrawdownTracker
 from core.quantum_engine import QuantumEngine
+from core.tick_ingestion import TickIngestor
+from core.decision_record import DecisionRecord
+from core.mt5_snapshot import mt5_snapshot
+from core.symbol_registry import symbol_registry
+from utils.hot_log import hot_log
+from utils.decision_report import get_decision_report
 
 
 class QuantumTradingSystem:
@@ -44,6 +51,11 @@ class QuantumTradingSystem:
         )
         self._load_configuration(config_path)  # Questo inizializza self._config
         self.logger.info("✅ Configurazione caricata")
+        # Backend broker: terminale MetaTrader5 (default) o simulato da tick registrati (broker_backend.type)
+        configure_backend(self._config.config.get('broker_backend', {}))
+        # Profilo log del percorso per-tick: 'quiet' = nessuna stringa di log sotto WARNING
+        hot_log.configure(self._config.config.get('logging', {}).get('hot_path_profile', 'normal'))
+        get_decision_report().repeat_interval = self._config.config.get('logging', {}).get('decision_report_repeat_interval', 300)
         if not hasattr(self._config, 'config') or 'symbols' not in self._config.config:
             self.logger.error("Configurazione simboli non valida nel file di configurazione")
         else:
@@ -62,7 +74,11 @@ class QuantumTradingSystem:
         self.logger.info("🧠 Inizializzazione Quantum Engine...")
         self.engine = QuantumEngine(self._config.config)
         self.logger.info("✅ Quantum Engine pronto")
+        # Registry dei simboli condiviso: configurato una sola volta qui, non dai singoli risk manager
+        symbol_registry.configure(self._config.config)
         self.risk_manager = QuantumRiskManager(self._config.config, self.engine, self)  # Passa il dict config
+        self.tick_ingestor = None  # Creato in start() se tick_ingestion.enabled
+        self.last_decisions = {}  # symbol -> DecisionRecord dell'ultimo ciclo
         self.max_positions = self._config.config.get('risk_parameters', {}).get('max_positions', 4)
         self.current_positions = 0
         self.trade_count = defaultdict(int)
@@ -151,26 +167,17 @@ class QuantumTradingSystem:
     
     
     
-    def debug_trade_decision(self, symbol):
-        """Debug step-by-step della decisione di trading per un simbolo: logga ogni condizione e mostra il motivo per cui un ordine viene o non viene messo. Esporta anche i motivi in un file CSV."""
-        def write_report_row(step, detail, extra=None):
-            try:
-                report_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs', 'trade_decision_report.csv')
-                file_exists = os.path.isfile(report_path)
-                with open(report_path, 'a', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    if not file_exists:
-                        writer.writerow(['timestamp', 'symbol', 'step', 'detail', 'extra'])
-                    
-                    writer.writerow([
-                        datetime.datetime.now().isoformat(sep=' ', timespec='seconds'),
-                        symbol,
-                        step,
-                        detail,
-                        extra if extra is not None else ''
-                    ])
-            except Exception as e:
-                logger.error(f"Errore scrittura report trade decision: {str(e)}")
+    def debug_trade_decision(self, symbol, record: DecisionRecord = None):
+        """
+        Debug della decisione di trading per un simbolo, esportata anche nel report CSV.
+        Con `record` (percorso per-tick) usa il DecisionRecord del ciclo senza ricalcolare nulla;
+        senza record esegue la diagnostica completa step-by-step (uso manuale).
+        """
+        report = get_decision_report()
+        if record is not None:
+            report.write(symbol, record.gate, record.detail, record.report_extra())
+            hot_log.info("DEBUG-TRADE-DECISION", symbol=symbol, blocco=record.gate, signal=record.signal, detail=record.detail)
+            return
         try:
             logger.info(f"\n==================== [DEBUG TRADE DECISION] ====================\nSymbol: {symbol}\n--------------------")
             # 1. Può fare trading?
@@ -179,19 +186,16 @@ class QuantumTradingSystem:
             if not can_trade:
                 msg = "Motivo: can_trade() = False (cooldown, spread, max posizioni, ecc.)"
                 # Dettagli tecnici anche qui
-                ticks = list(self.engine.get_tick_buffer(symbol))
-                buffer_tick = len(ticks)
+                buf = self.engine.get_tick_buffer(symbol)
+                buffer_tick = len(buf)
                 spin = None
                 confidence = None
                 entropy = None
                 spin_window = min(getattr(self.engine, 'spin_window', 20), buffer_tick)
-                recent_ticks = ticks[-spin_window:]
-                deltas = tuple(t['delta'] for t in recent_ticks if abs(t['delta']) > 1e-10) if recent_ticks else ()
                 try:
-                    if deltas:
-                        entropy = self.engine.calculate_entropy(deltas)
-                    if recent_ticks:
-                        spin, confidence = self.engine.calculate_spin(recent_ticks)
+                    if spin_window:
+                        entropy = self.engine.get_entropy(symbol)
+                        spin, confidence = self.engine.calculate_spin(symbol)
                 except Exception as e:
                     logger.warning(f"Errore calcolo diagnostica can_trade: {e}")
                 motivi = []
@@ -210,7 +214,7 @@ class QuantumTradingSystem:
                 motivi.append(f"Buffer tick: {buffer_tick}")
                 extra = "; ".join(motivi)
                 logger.info(msg + (f" | Dettaglio: {extra}" if extra else ""))
-                write_report_row('can_trade', msg, extra)
+                report.write(symbol, 'can_trade', msg, extra)
                 return
 
             # 2. Orari di trading
@@ -219,19 +223,16 @@ class QuantumTradingSystem:
             if not trading_hours:
                 msg = "Motivo: fuori orario di trading"
                 # Dettagli tecnici anche qui
-                ticks = list(self.engine.get_tick_buffer(symbol))
-                buffer_tick = len(ticks)
+                buf = self.engine.get_tick_buffer(symbol)
+                buffer_tick = len(buf)
                 spin = None
                 confidence = None
                 entropy = None
                 spin_window = min(getattr(self.engine, 'spin_window', 20), buffer_tick)
-                recent_ticks = ticks[-spin_window:]
-                deltas = tuple(t['delta'] for t in recent_ticks if abs(t['delta']) > 1e-10) if recent_ticks else ()
                 try:
-                    if deltas:
-                        entropy = self.engine.calculate_entropy(deltas)
-                    if recent_ticks:
-                        spin, confidence = self.engine.calculate_spin(recent_ticks)
+                    if spin_window:
+                        entropy = self.engine.get_entropy(symbol)
+                        spin, confidence = self.engine.calculate_spin(symbol)
                 except Exception as e:
                     logger.warning(f"Errore calcolo diagnostica trading_hours: {e}")
                 motivi = []
@@ -250,26 +251,26 @@ class QuantumTradingSystem:
                 motivi.append(f"Buffer tick: {buffer_tick}")
                 extra = "; ".join(motivi)
                 logger.info(msg + (f" | Dettaglio: {extra}" if extra else ""))
-                write_report_row('trading_hours', msg, extra)
+                report.write(symbol, 'trading_hours', msg, extra)
                 return
 
             # 3. Posizioni già aperte
-            existing_positions = mt5.positions_get(symbol=symbol)
+            existing_positions = mt5_snapshot.positions_get(symbol=symbol)
             has_position = existing_positions and len(existing_positions) > 0
             logger.info(f"has_position: {has_position}")
             if has_position:
                 msg = "Motivo: posizione già aperta su questo simbolo"
                 logger.info(msg)
-                write_report_row('has_position', msg)
+                report.write(symbol, 'has_position', msg)
                 return
 
             # 4. Limite posizioni totali
-            current_positions = len(mt5.positions_get() or [])
+            current_positions = len(mt5_snapshot.positions_get() or [])
             logger.info(f"current_positions: {current_positions} / max_positions: {self.max_positions}")
             if current_positions >= self.max_positions:
                 msg = "Motivo: raggiunto limite massimo posizioni totali"
                 logger.info(msg)
-                write_report_row('max_positions', msg)
+                report.write(symbol, 'max_positions', msg)
                 return
 
             # 5. Limite trade giornalieri
@@ -282,7 +283,7 @@ class QuantumTradingSystem:
                 if total_trades_today >= daily_limit:
                     msg = f"Motivo: raggiunto limite trade giornalieri globali ({total_trades_today}/{daily_limit})"
                     logger.info(msg)
-                    write_report_row('daily_limit_global', msg)
+                    report.write(symbol, 'daily_limit_global', msg)
                     return
             else:
                 trades_for_symbol = self.trade_count.get(symbol, 0)
@@ -290,7 +291,7 @@ class QuantumTradingSystem:
                 if trades_for_symbol >= daily_limit:
                     msg = f"Motivo: raggiunto limite trade giornalieri per simbolo ({trades_for_symbol}/{daily_limit})"
                     logger.info(msg)
-                    write_report_row('daily_limit_symbol', msg)
+                    report.write(symbol, 'daily_limit_symbol', msg)
                     return
 
             # 6. Buffer tick sufficiente
@@ -300,7 +301,7 @@ class QuantumTradingSystem:
             if buffer_size < min_samples:
                 msg = "Motivo: buffer tick insufficiente per generare segnale"
                 logger.info(msg)
-                write_report_row('buffer_tick', msg)
+                report.write(symbol, 'buffer_tick', msg)
                 return
 
             # 7. Ottieni segnale
@@ -313,15 +314,12 @@ class QuantumTradingSystem:
                 entropy = None
                 spin = None
                 confidence = None
-                ticks = list(self.engine.get_tick_buffer(symbol))
-                spin_window = min(getattr(self.engine, 'spin_window', 20), len(ticks))
-                recent_ticks = ticks[-spin_window:]
-                deltas = tuple(t['delta'] for t in recent_ticks if abs(t['delta']) > 1e-10) if recent_ticks else ()
+                buf = self.engine.get_tick_buffer(symbol)
+                spin_window = min(getattr(self.engine, 'spin_window', 20), len(buf))
                 try:
-                    if deltas:
-                        entropy = self.engine.calculate_entropy(deltas)
-                    if recent_ticks:
-                        spin, confidence = self.engine.calculate_spin(recent_ticks)
+                    if spin_window:
+                        entropy = self.engine.get_entropy(symbol)
+                        spin, confidence = self.engine.calculate_spin(symbol)
                 except Exception as e:
                     logger.warning(f"Errore calcolo diagnostica HOLD: {e}")
                 motivi = []
@@ -345,13 +343,13 @@ class QuantumTradingSystem:
                     motivi.append(f"Spin: {spin:.3f}")
                 else:
                     motivi.append("Spin: N/A")
-                motivi.append(f"Buffer tick: {len(ticks)}")
+                motivi.append(f"Buffer tick: {len(buf)}")
                 # Aggiungi il motivo tecnico preciso del HOLD in cima
                 if motivi_hold:
                     motivi.insert(0, f"Motivo tecnico: {motivi_hold[0]}")
                 extra = "; ".join(motivi)
                 logger.info(msg + (f" | Dettaglio: {extra}" if extra else ""))
-                write_report_row('signal', msg, extra)
+                report.write(symbol, 'signal', msg, extra)
                 return
 
             # 8. Cooldown segnale
@@ -360,7 +358,7 @@ class QuantumTradingSystem:
                 if time_since_last < self.engine.signal_cooldown:
                     msg = f"Motivo: cooldown segnale attivo ({self.engine.signal_cooldown - time_since_last:.1f}s rimanenti)"
                     logger.info(msg)
-                    write_report_row('signal_cooldown', msg)
+                    report.write(symbol, 'signal_cooldown', msg)
                     return
 
             # 9. Conferma segnale per trading
@@ -369,7 +367,7 @@ class QuantumTradingSystem:
             if trading_signal not in ["BUY", "SELL"]:
                 msg = "Motivo: segnale non confermato per trading effettivo"
                 logger.info(msg)
-                write_report_row('signal_confirm', msg)
+                report.write(symbol, 'signal_confirm', msg)
                 return
 
             # 10. Calcola size
@@ -378,13 +376,13 @@ class QuantumTradingSystem:
             if size <= 0:
                 msg = "Motivo: size calcolata nulla o negativa"
                 logger.info(msg)
-                write_report_row('size', msg)
+                report.write(symbol, 'size', msg)
                 return
 
             # 11. Pronto per esecuzione trade
             msg = f"TUTTE LE CONDIZIONI OK: pronto per esecuzione trade {trading_signal} su {symbol} (size: {size})"
             logger.info(msg)
-            write_report_row('ok', msg)
+            report.write(symbol, 'ok', msg)
             # (Non esegue realmente il trade, solo debug)
         except Exception as e:
             logger.error(f"[DEBUG TRADE DECISION] Errore per {symbol}: {str(e)}", exc_info=True)
@@ -411,7 +409,7 @@ class QuantumTradingSystem:
                         self._safe_sleep(5)
                         continue
                 else:
-                    logger.debug("Connessione MT5 OK")
+                    hot_log.debug("MT5", connected=True)
                 current_time = time.time()
                 # Controlli periodici
                 if current_time - self.last_connection_check > 30:  # Check più frequente
@@ -423,6 +421,7 @@ class QuantumTradingSystem:
                     self._verify_connection()
                     self.last_connection_check = current_time
                 if current_time - self.last_account_update > 60:
+                    symbol_registry.refresh_if_due(self.symbols)
                     self._update_account_info()
                     self.last_account_update = current_time
                     self._check_drawdown_limits()
@@ -432,6 +431,8 @@ class QuantumTradingSystem:
                     # Debug periodico dello stato trading (ogni 5 minuti, per tutti i simboli)
                     for symbol in self.symbols:
                         self.debug_trade_status(symbol)
+                    if self.tick_ingestor is not None:
+                        logger.info(f"[INGESTION] Statistiche: {self.tick_ingestor.get_stats()}")
                 if time.time() - self.last_buffer_check > 300:  # 5 minuti
                     self.check_buffers()
                     self.last_buffer_check = time.time()
@@ -440,32 +441,16 @@ class QuantumTradingSystem:
                     self._validate_positions()
                     self.close_positions_before_weekend()  # <--- AGGIUNTO QUI
                     self.last_position_check = current_time
-                for symbol in self.symbols:
-                    tick = mt5.symbol_info_tick(symbol)
-                    logger.debug(
-                        "\n-------------------- [DEBUG TICK] ----------------------\n"
-                        f"Symbol: {symbol}\n"
-                        f"Tick: {tick}\n"
-                        "------------------------------------------------------\n"
-                    )
-                    if tick:
-                        logger.debug(
-                            "\n-------------------- [DEBUG TICK] ----------------------\n"
-                            f"Symbol: {symbol}\n"
-                            f"Tick.bid: {getattr(tick, 'bid', None)}\n"
-                            "------------------------------------------------------\n"
-                        )
-                        self.engine.process_tick(symbol, tick.bid)
-                        buffer_size = len(self.engine.get_tick_buffer(symbol))
-                        logger.debug(
-                            "\n-------------------- [BUFFER-DEBUG] --------------------\n"
-                            f"Symbol: {symbol}\n"
-                            f"Buffer Size: {buffer_size}\n"
-                            "------------------------------------------------------\n"
-                        )
+                if self.tick_ingestor is not None:
+                    # Acquisizione e segnali gestiti dai worker per simbolo: qui solo controlli periodici
+                    self._safe_sleep(0.5)
+                    continue
+                # Un solo snapshot per ciclo condiviso da tutti i consumer: posizioni/account/symbol_info e tick
+                mt5_snapshot.refresh(self.symbols)
+                snapshot = self._snapshot_ticks()
                 # Gestione errori SOLO per _process_symbols, non per KeyboardInterrupt
                 start_time = time.time()
-                self._process_symbols()
+                self._process_symbols(snapshot)
                 process_time = time.time() - start_time
                 if process_time > 5:
                     logger.warning(f"Processamento simboli lento: {process_time:.2f}s")
@@ -481,7 +466,7 @@ class QuantumTradingSystem:
         """Restituisce lo stato live del sistema per la dashboard (tick, equity, bilancio, P&L, drawdown, posizioni)"""
         try:
             # Info account
-            account = mt5.account_info()
+            account = mt5_snapshot.account_info()
             equity = account.equity if account else None
             balance = account.balance if account else None
             currency = account.currency if account else 'USD'
@@ -493,7 +478,7 @@ class QuantumTradingSystem:
             total_profit = self.trade_metrics.get('total_profit', 0.0)
             # Posizioni aperte
             open_positions = []
-            positions = mt5.positions_get()
+            positions = mt5_snapshot.positions_get()
             if positions:
                 for pos in positions:
                     open_positions.append({
@@ -526,7 +511,8 @@ class QuantumTradingSystem:
                 'drawdown': drawdown,
                 'total_profit': total_profit,
                 'open_positions': open_positions,
-                'symbols_data': symbols_data
+                'symbols_data': symbols_data,
+                'tick_ingestion': self.tick_ingestor.get_stats() if getattr(self, 'tick_ingestor', None) else None
             }
         except Exception as e:
             logger.error(f"Errore get_live_status: {str(e)}")
@@ -597,6 +583,7 @@ class QuantumTradingSystem:
                 'type_filling': mt5.ORDER_FILLING_IOC
             }
             result = mt5.order_send(request)
+            mt5_snapshot.invalidate()
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 return {'success': True, 'ticket': result.order, 'result': str(result)}
             else:
@@ -629,6 +616,7 @@ class QuantumTradingSystem:
                 'comment': 'Modify SL/TP from dashboard'
             }
             result = mt5.order_send(request)
+            mt5_snapshot.invalidate()
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 return {'success': True, 'result': str(result)}
             else:
@@ -667,6 +655,7 @@ class QuantumTradingSystem:
                 'type_filling': mt5.ORDER_FILLING_IOC
             }
             result = mt5.order_send(request)
+            mt5_snapshot.invalidate()
             if result and result.retcode == mt5.TRADE_RETCODE_DONE:
                 return {'success': True, 'result': str(result)}
             else:
@@ -857,7 +846,7 @@ class QuantumTradingSystem:
                 
                 # Usa la stessa logica di _initialize_mt5 per riconnessione
                 mt5_config = self._config.config.get('metatrader5', {})
-                return mt5.initialize(
+                connected = mt5.initialize(
                     path=mt5_config.get('path', 'C:/MT5/FivePercentOnlineMetaTrader5/terminal64.exe'),
                     login=int(mt5_config.get('login', 0)),
                     password=mt5_config.get('password', ''),
@@ -865,6 +854,13 @@ class QuantumTradingSystem:
                     timeout=60000,
                     port=int(mt5_config.get('port', 18889))
                 )
+                if connected:
+                    # Lo snapshot letto prima della disconnessione non è più valido
+                    mt5_snapshot.invalidate(symbols=True)
+                    symbol_registry.refresh(self.symbols)
+                    # Recupera i tick persi durante la disconnessione
+                    self._backfill_ticks()
+                return connected
             return True
         except Exception as e:
             logger.error(f"Errore verifica connessione challenge: {str(e)}")
@@ -903,6 +899,11 @@ class QuantumTradingSystem:
 
             print("✅ Componenti critici inizializzati correttamente")
             self.running = True
+            # Metadati statici dei simboli (point, digits, volumi) caricati una volta prima del loop
+            symbol_registry.refresh(self.symbols)
+            # Warm-up buffer dallo storico tick: segnali disponibili subito, senza attendere min_spin_samples
+            self._backfill_ticks()
+            self._start_tick_ingestion()
             logger.info("Sistema di trading avviato correttamente")
 
             print("🔄 Inizio loop principale...")
@@ -930,35 +931,119 @@ class QuantumTradingSystem:
     def stop(self):
         """Ferma il sistema e fa cleanup"""
         self.running = False
+        if self.tick_ingestor is not None:
+            self.tick_ingestor.stop()
+            self.tick_ingestor = None
+        self.engine.flush_signal_logs()
         logger.info("Sistema di trading fermato. Cleanup completato.")
 
-    def _process_symbols(self):
-        """Processa tutti i simboli configurati"""
-        current_positions = len(mt5.positions_get() or [])
-        
-        for symbol in self._config.config['symbols']:
+    def _backfill_ticks(self):
+        """
+        Backfill bulk dei tick dallo storico MT5: una chiamata copy_ticks_range per simbolo
+        dall'ultimo time_msc visto (o da lookback_seconds prima dell'ultimo tick all'avvio)
+        fino al tick corrente, inserita nell'engine in batch al prezzo medio.
+        """
+        backfill_cfg = self._config.config.get('tick_backfill', {})
+        if not backfill_cfg.get('enabled', True):
+            return
+        lookback = backfill_cfg.get('lookback_seconds', 600)
+        for symbol in self.symbols:
             try:
-                tick = mt5.symbol_info_tick(symbol)
-                if not tick:
+                last_tick = mt5.symbol_info_tick(symbol)
+                if not last_tick:
+                    continue
+                # Estremi in tempo server (quello dei tick) per non dipendere dal fuso del broker
+                last_msc = self.engine.get_last_time_msc(symbol)
+                date_from = last_msc // 1000 if last_msc is not None else last_tick.time - lookback
+                ticks = mt5.copy_ticks_range(symbol, date_from, last_tick.time + 1, mt5.COPY_TICKS_INFO)
+                if ticks is None or len(ticks) == 0:
+                    logger.debug(f"[BACKFILL] {symbol}: nessun tick storico ({mt5.last_error()})")
                     continue
+                bid = ticks['bid']
+                ask = ticks['ask']
+                prices = np.where((bid > 0) & (ask > 0), (bid + ask) / 2, bid)
+                inserted = self.engine.ingest_ticks(symbol, prices, ticks['time_msc'])
+                logger.info(f"[BACKFILL] {symbol}: {inserted}/{len(ticks)} tick inseriti, buffer={len(self.engine.get_tick_buffer(symbol))}")
+            except Exception as e:
+                logger.error(f"[BACKFILL] Errore backfill {symbol}: {str(e)}", exc_info=True)
+
+    def _start_tick_ingestion(self):
+        """Avvia l'acquisizione tick event-driven (producer + worker per simbolo) se abilitata in config"""
+        ingestion_cfg = self._config.config.get('tick_ingestion', {})
+        if not ingestion_cfg.get('enabled', False):
+            return
+        self.tick_ingestor = TickIngestor(
+            self.symbols,
+            self._on_ingested_tick,
+            poll_interval=ingestion_cfg.get('poll_interval', 0.1),
+            queue_size=ingestion_cfg.get('queue_size', 256)
+        )
+        self.tick_ingestor.start()
+
+    def _on_ingested_tick(self, symbol: str, tick):
+        """Consumer del worker di un simbolo: aggiorna l'engine e valuta il segnale in parallelo agli altri simboli"""
+        if not self._validate_tick(tick):
+            return
+        price = (tick.bid + tick.ask) / 2 if tick.bid and tick.ask else tick.bid
+        if not self.engine.process_tick(symbol, price, getattr(tick, 'time_msc', None),
+                                        tick.bid, tick.ask, getattr(tick, 'flags', 0)):
+            return
+        signal_state = self.engine.get_signal(symbol)
+        if signal_state[0] in ("BUY", "SELL"):
+            # Apertura ordini serializzata: i limiti di posizioni vanno ricontrollati da un solo worker alla volta
+            with self.position_lock:
+                current_positions = len(mt5_snapshot.positions_get() or [])
+                self._process_single_symbol(symbol, tick, current_positions, signal_state)
+        else:
+            current_positions = len(mt5_snapshot.positions_get() or [])
+            self._process_single_symbol(symbol, tick, current_positions, signal_state)
 
-                if not self._validate_tick(tick):
+    def _snapshot_ticks(self) -> dict:
+        """
+        Stadio unico di acquisizione del ciclo: legge il tick di ogni simbolo una sola volta,
+        lo valida e lo inserisce nell'engine al prezzo medio. I tick con time_msc già visto
+        non vengono reinseriti. Restituisce {symbol: tick} dei soli tick nuovi.
+        """
+        snapshot = {}
+        for symbol in self.symbols:
+            try:
+                tick = mt5.symbol_info_tick(symbol)
+                if not tick or not self._validate_tick(tick):
+                    continue
+                price = (tick.bid + tick.ask) / 2 if tick.bid and tick.ask else tick.bid
+                if not self.engine.process_tick(symbol, price, getattr(tick, 'time_msc', None),
+                                                tick.bid, tick.ask, getattr(tick, 'flags', 0)):
+                    hot_log.debug("SNAPSHOT", symbol=symbol, unchanged=True, time_msc=getattr(tick, 'time_msc', None))
                     continue
+                if hot_log.debug_enabled:
+                    hot_log.debug("SNAPSHOT", symbol=symbol, bid=tick.bid, ask=tick.ask, buffer_size=len(self.engine.get_tick_buffer(symbol)))
+                snapshot[symbol] = tick
+            except Exception as e:
+                logger.error(f"Errore lettura tick {symbol}: {str(e)}", exc_info=True)
+        return snapshot
 
-                if hasattr(self, 'engine') and hasattr(self.engine, 'process_tick'):
-                    price = (tick.bid + tick.ask) / 2 if tick.bid and tick.ask else tick.bid
-                    self.engine.process_tick(symbol, price)
+    def _process_symbols(self, snapshot: dict = None):
+        """Processa i simboli con un tick nuovo nello snapshot del ciclo (acquisito qui se non fornito)"""
+        if snapshot is None:
+            snapshot = self._snapshot_ticks()
+        current_positions = len(mt5_snapshot.positions_get() or [])
 
-                self._process_single_symbol(symbol, tick, current_positions)
+        # Valutazione segnali di tutti i simboli in un'unica passata vettoriale
+        try:
+            signals = self.engine.get_signals(snapshot.keys())
+        except Exception as e:
+            logger.error(f"Errore valutazione segnali batch: {str(e)}", exc_info=True)
+            signals = {}
 
+        for symbol, tick in snapshot.items():
+            try:
+                self._process_single_symbol(symbol, tick, current_positions, signals.get(symbol))
             except Exception as e:
                 logger.error(f"Errore processamento {symbol}: {str(e)}", exc_info=True)
            
-    def _process_single_symbol(self, symbol: str, tick, current_positions: int):
-        """Processa un singolo simbolo per segnali di trading"""
+    def _process_single_symbol(self, symbol: str, tick, current_positions: int, precomputed_signal=None):
+        """Processa un singolo simbolo per segnali di trading (precomputed_signal: (signal, price) da get_signals)"""
         try:
-            # --- DEBUG avanzato: raccolta motivi blocco trade ---
-            motivi_blocco = []
             # 1. Verifica se possiamo fare trading
             if not self.engine.can_trade(symbol):
                 # Diagnostica dettagliata sul tipo di cooldown
@@ -967,18 +1052,13 @@ class QuantumTradingSystem:
                 signal_cooldown = self.engine.config.get('quantum_params', {}).get('signal_cooldown', 900)
                 last_signal = self.engine.get_last_signal_time(symbol)
                 now = time.time()
-                msg = None
                 if now - last_close < position_cooldown:
-                    remaining = int(position_cooldown - (now - last_close))
-                    msg = f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: position cooldown attivo ({remaining}s rimanenti)"
+                    detail = f"Motivo: position cooldown attivo ({int(position_cooldown - (now - last_close))}s rimanenti)"
                 elif now - last_signal < signal_cooldown:
-                    remaining = int(signal_cooldown - (now - last_signal))
-                    msg = f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: signal cooldown attivo ({remaining}s rimanenti)"
+                    detail = f"Motivo: signal cooldown attivo ({int(signal_cooldown - (now - last_signal))}s rimanenti)"
                 else:
-                    msg = f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: can_trade=False (motivo generico)"
-                motivi_blocco.append('can_trade=False')
-                self.debug_trade_decision(symbol)
-                logger.info(msg)
+                    detail = "Motivo: can_trade() = False (cooldown, spread, max posizioni, ecc.)"
+                self._record_decision(symbol, tick, current_positions, 'can_trade', detail)
                 return
 
             # 1.1. Controllo limite trade giornalieri (opzionale: globale o per simbolo)
@@ -990,46 +1070,39 @@ class QuantumTradingSystem:
             if limit_mode == 'global':
                 total_trades_today = sum(self.trade_count.values())
                 if total_trades_today >= daily_limit:
-                    motivi_blocco.append('max_daily_trades_global')
-                    logger.info(f"🚫 Limite totale trade giornalieri raggiunto: {total_trades_today}/{daily_limit}. Nessun nuovo trade verrà aperto oggi.")
-                    self.debug_trade_decision(symbol)
-                    logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: max_daily_trades_global")
+                    self._record_decision(symbol, tick, current_positions, 'daily_limit_global',
+                                          f"Motivo: raggiunto limite trade giornalieri globali ({total_trades_today}/{daily_limit})")
                     return
             else:  # per_symbol
                 trades_for_symbol = self.trade_count.get(symbol, 0)
                 if trades_for_symbol >= daily_limit:
-                    motivi_blocco.append('max_daily_trades_per_symbol')
-                    logger.info(f"🚫 Limite trade giornalieri per {symbol} raggiunto: {trades_for_symbol}/{daily_limit}. Nessun nuovo trade su questo simbolo oggi.")
-                    self.debug_trade_decision(symbol)
-                    logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: max_daily_trades_per_symbol")
+                    self._record_decision(symbol, tick, current_positions, 'daily_limit_symbol',
+                                          f"Motivo: raggiunto limite trade giornalieri per simbolo ({trades_for_symbol}/{daily_limit})")
                     return
 
             # 2. Verifica orari di trading
             if not self.is_trading_hours(symbol):
-                motivi_blocco.append('fuori_orario')
-                self.debug_trade_decision(symbol)
-                logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: fuori_orario")
+                self._record_decision(symbol, tick, current_positions, 'trading_hours', "Motivo: fuori orario di trading")
                 return
 
             # 3. Verifica posizioni esistenti
-            existing_positions = mt5.positions_get(symbol=symbol)
+            existing_positions = mt5_snapshot.positions_get(symbol=symbol)
             if existing_positions and len(existing_positions) > 0:
-                motivi_blocco.append('posizioni_aperte_su_symbol')
-                self.debug_trade_decision(symbol)
-                logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: posizioni_aperte_su_symbol")
+                self._record_decision(symbol, tick, current_positions, 'has_position', "Motivo: posizione già aperta su questo simbolo")
                 return
 
             # 4. Verifica limite posizioni totali
             if current_positions >= self.max_positions:
-                motivi_blocco.append('max_positions_totali')
-                self.debug_trade_decision(symbol)
-                logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: max_positions_totali")
+                self._record_decision(symbol, tick, current_positions, 'max_positions', "Motivo: raggiunto limite massimo posizioni totali")
                 return
 
-            # 5. Ottieni segnale (senza attivare cooldown)
-            signal, price = self.engine.get_signal(symbol, for_trading=False)
+            # 5. Ottieni segnale (senza attivare cooldown), riusando la valutazione batch del ciclo
+            if precomputed_signal is not None:
+                signal, price = precomputed_signal
+            else:
+                signal, price = self.engine.get_signal(symbol, for_trading=False)
 
-            logger.debug(f"🔍 Segnale per {symbol}: {signal} (Price: {price})")
+            hot_log.debug("SIGNAL", symbol=symbol, signal=signal, price=price)
 
             if signal in ["BUY", "SELL"]:
                 logger.info(f"🎯 SEGNALE ATTIVO {signal} per {symbol} - Controllo condizioni trading")
@@ -1038,10 +1111,8 @@ class QuantumTradingSystem:
                 if hasattr(self.engine, 'last_signal_time') and symbol in self.engine.last_signal_time:
                     time_since_last = time.time() - self.engine.last_signal_time[symbol]
                     if time_since_last < self.engine.signal_cooldown:
-                        motivi_blocco.append('cooldown_attivo')
-                        logger.info(f"⏰ {symbol}: In cooldown, salto trade (tempo rimanente: {self.engine.signal_cooldown - time_since_last:.1f}s)")
-                        self.debug_trade_decision(symbol)
-                        logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: cooldown_attivo")
+                        self._record_decision(symbol, tick, current_positions, 'signal_cooldown',
+                                              f"Motivo: cooldown segnale attivo ({self.engine.signal_cooldown - time_since_last:.1f}s rimanenti)")
                         return
 
                 # 5.2 Se tutto ok, ottieni segnale per trading (questo attiva il cooldown)
@@ -1061,30 +1132,39 @@ class QuantumTradingSystem:
                         # 7. Esegui il trade
                         success = self._execute_trade(symbol, trading_signal, tick, trading_price, size)
                         if not success:
-                            motivi_blocco.append('errore_esecuzione_trade')
-                            self.debug_trade_decision(symbol)
-                            logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: errore_esecuzione_trade")
+                            self._record_decision(symbol, tick, current_positions, 'execution', "Motivo: errore esecuzione trade")
                         else:
                             logger.info(f"🎉 Trade {symbol} eseguito con successo!")
+                            self._record_decision(symbol, tick, current_positions, 'ok',
+                                                  f"TUTTE LE CONDIZIONI OK: trade {trading_signal} eseguito su {symbol} (size: {size})")
                     else:
-                        motivi_blocco.append('size_zero')
                         logger.warning(f"⚠️ Trade {symbol} bloccato: size = 0")
-                        self.debug_trade_decision(symbol)
-                        logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: size_zero")
+                        self._record_decision(symbol, tick, current_positions, 'size', "Motivo: size calcolata nulla o negativa")
                 else:
-                    motivi_blocco.append('segnale_non_confermato')
                     logger.warning(f"🚫 {symbol}: Segnale non confermato per trading effettivo")
-                    self.debug_trade_decision(symbol)
-                    logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: segnale_non_confermato")
+                    self._record_decision(symbol, tick, current_positions, 'signal_confirm', "Motivo: segnale non confermato per trading effettivo")
             else:
-                motivi_blocco.append(f'segnale_non_operativo_{signal}')
-                logger.debug(f"💤 {symbol}: HOLD - nessuna azione")
-                self.debug_trade_decision(symbol)
-                logger.info(f"[DEBUG-TRADE-DECISION] {symbol} | Blocco: segnale_non_operativo_{signal}")
+                self._record_decision(symbol, tick, current_positions, 'signal', "Motivo: nessun segnale BUY/SELL valido (HOLD o None)")
 
         except Exception as e:
             logger.error(f"Errore processo simbolo {symbol}: {str(e)}", exc_info=True)
 
+    def _record_decision(self, symbol: str, tick, current_positions: int, gate: str, detail: str) -> DecisionRecord:
+        """Crea il record immutabile della decisione del ciclo (riusando la valutazione segnale già fatta) e lo passa a diagnostica e report."""
+        record = DecisionRecord(
+            symbol=symbol,
+            timestamp=time.time(),
+            gate=gate,
+            detail=detail,
+            bid=getattr(tick, 'bid', None),
+            ask=getattr(tick, 'ask', None),
+            current_positions=current_positions,
+            evaluation=self.engine.get_last_evaluation(symbol)
+        )
+        self.last_decisions[symbol] = record
+        self.debug_trade_decision(symbol, record)
+        return record
+
     def _execute_trade(self, symbol: str, signal: str, tick, price: float, size: float) -> bool:
         """Esegue un trade con gestione completa degli errori"""
         try:
@@ -1101,9 +1181,12 @@ class QuantumTradingSystem:
                 symbol, order_type, price
             )
             
-            # 4. Prepara richiesta ordine
-            symbol_info = mt5.symbol_info(symbol)
-            execution_price = symbol_info.ask if signal == "BUY" else symbol_info.bid
+            # 4. Prepara richiesta ordine: bid/ask letti dal broker al momento dell'esecuzione (mai dallo snapshot)
+            live_tick = mt5.symbol_info_tick(symbol)
+            if live_tick is None:
+                logger.error(f"Tick non disponibile per {symbol}: ordine {signal} annullato")
+                return False
+            execution_price = live_tick.ask if signal == "BUY" else live_tick.bid
             
             request = {
                 "action": mt5.TRADE_ACTION_DEAL,
@@ -1137,6 +1220,8 @@ class QuantumTradingSystem:
                     request["type_filling"] = mt5.ORDER_FILLING_RETURN
                     logger.info(f"[ORDER_REQUEST_DEBUG] Request RETURN: {request}")
                     result = mt5.order_send(request)
+            # Posizioni e account cambiati: i consumer successivi del ciclo rileggono da MT5
+            mt5_snapshot.invalidate()
             
             # 6. Verifica risultato
             if result.retcode != mt5.TRADE_RETCODE_DONE:
@@ -1229,6 +1314,7 @@ class QuantumTradingSystem:
                 return False
                 
             result = mt5.order_send(close_request)
+            mt5_snapshot.invalidate()
                 
             if result.retcode == mt5.TRADE_RETCODE_DONE:
                 profit = (position.price_current - position.price_open) * position.volume
@@ -1253,14 +1339,14 @@ class QuantumTradingSystem:
     def _monitor_open_positions(self):
         """Monitoraggio avanzato delle posizioni aperte"""
         try:
-            positions = mt5.positions_get()
+            positions = mt5_snapshot.positions_get()
             if not positions:
                 return
                 
             for position in positions:
                 try:
                     # Verifica che la posizione esista ancora
-                    current_pos = mt5.positions_get(ticket=position.ticket)
+                    current_pos = mt5_snapshot.positions_get(ticket=position.ticket)
                     if not current_pos or len(current_pos) == 0:
                         continue
                         
@@ -1396,18 +1482,19 @@ class QuantumTradingSystem:
             }
             
             # Validazione livelli
-            symbol_info = mt5.symbol_info(position.symbol)
-            if not symbol_info:
+            meta = symbol_registry.get(position.symbol)
+            if not meta:
                 return False
                 
             # Arrotonda ai decimali corretti
             if request["sl"] != 0:
-                request["sl"] = round(request["sl"], symbol_info.digits)
+                request["sl"] = round(request["sl"], meta.digits)
             if request["tp"] != 0:
-                request["tp"] = round(request["tp"], symbol_info.digits)
+                request["tp"] = round(request["tp"], meta.digits)
                 
             # Esegui modifica
             result = mt5.order_send(request)
+            mt5_snapshot.invalidate()
             
             if result.retcode == mt5.TRADE_RETCODE_DONE:
                 logger.info(f"Posizione {position.ticket} modificata: SL={request['sl']}, TP={request['tp']}")
@@ -1423,7 +1510,7 @@ class QuantumTradingSystem:
     def _validate_positions(self):
         """Verifica posizioni duplicate"""
         try:
-            positions = mt5.positions_get()
+            positions = mt5_snapshot.positions_get()
             if not positions:
                 return
                 
@@ -1445,7 +1532,7 @@ class QuantumTradingSystem:
     def _update_account_info(self):
         """Aggiorna info account"""
         try:
-            self.account_info = mt5.account_info()
+            self.account_info = mt5_snapshot.account_info()
             if self.account_info and hasattr(self, 'drawdown_tracker'):
                 self.drawdown_tracker.update(
                     self.account_info.equity,
@@ -1538,7 +1625,7 @@ class QuantumTradingSystem:
             return False
             
         # 2. Verifica MT5 info
-        symbol_info = mt5.symbol_info(symbol)
+        symbol_info = mt5_snapshot.symbol_info(symbol)
         if not symbol_info:
             logger.debug(f"Simbolo {symbol} non disponibile in MT5")
             return False
@@ -1554,10 +1641,6 @@ class QuantumTradingSystem:
             return False
 
         # 4. Controllo spread e liquidità
-        symbol_info = mt5.symbol_info(symbol)
-        if not symbol_info:
-            return False
-            
         spread = (symbol_info.ask - symbol_info.bid) / self.engine._get_pip_size(symbol)
         max_spread = self._config._get_max_allowed_spread(symbol)
         
@@ -1566,7 +1649,7 @@ class QuantumTradingSystem:
             return False
 
         # 6. Verifica buffer dati sufficiente
-        if len(self.engine.tick_buffer.get(symbol, [])) < self.engine.min_spin_samples:
+        if len(self.engine.get_tick_buffer(symbol)) < self.engine.min_spin_samples:
             if is_trading_hours(symbol, self._config.config):
                 logger.debug(f"Dati insufficienti nel buffer per {symbol}")
                 return False
@@ -1595,7 +1678,7 @@ class QuantumTradingSystem:
                 config_dict = self._config.config if hasattr(self._config, 'config') else self._config
             trading_hours = is_trading_hours(symbol, config_dict)
             # Verifica posizioni esistenti
-            positions = mt5.positions_get(symbol=symbol)
+            positions = mt5_snapshot.positions_get(symbol=symbol)
             has_position = positions and len(positions) > 0
             # Verifica limite trades giornalieri
             daily_count = self.trade_count.get(symbol, 0)
@@ -1616,7 +1699,7 @@ class QuantumTradingSystem:
     
     def check_challenge_limits(self):
         """Controlla i limiti imposti dal broker challenge"""
-        account_info = mt5.account_info()
+        account_info = mt5_snapshot.account_info()
         if not account_info:
             logger.error("Impossibile ottenere info account MT5")
             return False
@@ -1672,7 +1755,7 @@ class QuantumTradingSystem:
         now = datetime.now()
         # Venerdì = 4 (lunedì=0), chiusura alle 21:00
         if now.weekday() == 4 and now.hour >= 21:
-            positions = mt5.positions_get()
+            positions = mt5_snapshot.positions_get()
             if positions:
                 for pos in positions:
                     try:
@@ -1703,10 +1786,10 @@ class QuantumTradingSystem:
         # Carica trade_count
         trade_count = self.get_trade_count(symbol)
         # Posizioni aperte
-        all_positions = mt5.positions_get()
+        all_positions = mt5_snapshot.positions_get()
         total_open_positions = len(all_positions) if all_positions else 0
         if symbol:
-            positions = mt5.positions_get(symbol=symbol)
+            positions = mt5_snapshot.positions_get(symbol=symbol)
             symbol_positions = len(positions) if positions else 0
         else:
             symbol_positions = None
@@ -0,0 +1,137 @@
+# rolling_stats.py
+"""
+Modulo rolling_stats: accumulatori incrementali O(1) per le metriche quantistiche su finestra mobile.
+"""
+import math
+from typing import Tuple
+
+
+class RollingSpinStats:
+    """
+    Conteggi up/down/zero sulle ultime `window` direzioni di tick.
+
+    Ogni push aggiorna i contatori togliendo la direzione che esce dalla finestra e
+    aggiungendo quella nuova, quindi spin e confidence si leggono in tempo costante
+    senza riscansionare né hashare la finestra.
+    """
+
+    def __init__(self, window: int):
+        if window <= 0:
+            raise ValueError(f"Finestra spin non valida: {window}")
+        self.window = int(window)
+        self._ring = [0] * self.window
+        self._pos = 0
+        self.count = 0
+        self.up = 0
+        self.down = 0
+        self.zero = 0
+
+    def _add(self, direction: int, step: int) -> None:
+        if direction > 0:
+            self.up += step
+        elif direction < 0:
+            self.down += step
+        else:
+            self.zero += step
+
+    def push(self, direction: int) -> None:
+        """Inserisce la direzione di un nuovo tick (1, -1 o 0)."""
+        if self.count == self.window:
+            self._add(self._ring[self._pos], -1)
+        else:
+            self.count += 1
+        self._ring[self._pos] = direction
+        self._pos = (self._pos + 1) % self.window
+        self._add(direction, 1)
+
+    def reset(self) -> None:
+        self._ring = [0] * self.window
+        self._pos = 0
+        self.count = self.up = self.down = self.zero = 0
+
+    def spin(self) -> Tuple[float, float]:
+        """
+        Restituisce (spin, confidence) con la stessa semantica di QuantumEngine._calculate_spin_impl:
+        servono almeno 5 tick in finestra e almeno 3 tick direzionali.
+        """
+        if self.count < 5:
+            return 0.0, 0.0
+        total = self.up + self.down
+        if total < 3:
+            return 0.0, 0.0
+        imbalance = self.up - self.down
+        raw_spin = imbalance / total
+        confidence = min(1.0, abs(imbalance) / total * math.sqrt(total))
+        return raw_spin, confidence
+
+
+class RollingEntropy:
+    """
+    Entropia normalizzata incrementale sulle ultime `window` delta di prezzo.
+
+    Con p_i = |d_i| / S, S = somma |d_i| e L = somma |d_i|·log|d_i| si ha
+    H = -somma p_i·log p_i = log S - L / S, normalizzata per log(n) con n = delta non nulle.
+    S, L e n vengono aggiornati a ogni tick; ogni `resync_every` push le somme sono
+    ricalcolate da zero sul ring per evitare la deriva numerica delle sottrazioni.
+    """
+
+    def __init__(self, window: int, min_delta: float = 1e-10, resync_every: int = None):
+        if window <= 0:
+            raise ValueError(f"Finestra entropia non valida: {window}")
+        self.window = int(window)
+        self.min_delta = min_delta
+        self.resync_every = resync_every or 4 * self.window
+        self._ring = [0.0] * self.window
+        self._pos = 0
+        self._since_resync = 0
+        self.count = 0
+        self.nonzero = 0
+        self.sum_abs = 0.0
+        self.sum_xlogx = 0.0
+
+    def push(self, delta: float) -> None:
+        """Inserisce la delta di un nuovo tick; le delta sotto min_delta non contribuiscono."""
+        value = abs(delta)
+        if value <= self.min_delta:
+            value = 0.0
+        if self.count == self.window:
+            old = self._ring[self._pos]
+            if old > 0.0:
+                self.sum_abs -= old
+                self.sum_xlogx -= old * math.log(old)
+                self.nonzero -= 1
+        else:
+            self.count += 1
+        self._ring[self._pos] = value
+        self._pos = (self._pos + 1) % self.window
+        if value > 0.0:
+            self.sum_abs += value
+            self.sum_xlogx += value * math.log(value)
+            self.nonzero += 1
+        self._since_resync += 1
+        if self._since_resync >= self.resync_every:
+            self._resync()
+
+    def _resync(self) -> None:
+        values = [v for v in self._ring if v > 0.0]
+        self.nonzero = len(values)
+        self.sum_abs = math.fsum(values)
+        self.sum_xlogx = math.fsum(v * math.log(v) for v in values)
+        self._since_resync = 0
+
+    def reset(self) -> None:
+        self._ring = [0.0] * self.window
+        self._pos = 0
+        self._since_resync = 0
+        self.count = self.nonzero = 0
+        self.sum_abs = self.sum_xlogx = 0.0
+
+    def entropy(self) -> float:
+        """
+        Entropia normalizzata in [0, 1]; 0.0 con meno di due delta non nulle
+        (calculate_entropy in quel caso restituisce un valore dovuto solo all'epsilon 1e-10).
+        """
+        if self.nonzero <= 1 or self.sum_abs <= 0.0:
+            return 0.0
+        h = (math.log(self.sum_abs) - self.sum_xlogx / self.sum_abs) / math.log(self.nonzero)
+        return min(1.0, max(0.0, h))
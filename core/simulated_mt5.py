@@ -0,0 +1,516 @@
+# simulated_mt5.py
+"""
+Modulo simulated_mt5: backend broker locale che riproduce tick registrati e simula posizioni,
+ordini e account con la stessa API di MetaTrader5 (replay deterministico e test di carico).
+"""
+import csv
+import datetime
+import gzip
+import threading
+import time
+from collections import defaultdict, namedtuple
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+# Costanti con gli stessi valori del pacchetto MetaTrader5
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+TRADE_ACTION_DEAL = 1
+TRADE_ACTION_SLTP = 6
+ORDER_TIME_GTC = 0
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+COPY_TICKS_ALL = -1
+COPY_TICKS_INFO = 1
+COPY_TICKS_TRADE = 2
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_MARKET_CLOSED = 10018
+TRADE_RETCODE_NO_MONEY = 10019
+TRADE_RETCODE_POSITION_CLOSED = 10036
+
+Tick = namedtuple('Tick', 'time bid ask last volume time_msc flags volume_real')
+SymbolInfo = namedtuple('SymbolInfo', 'name visible select point digits spread bid ask time '
+                                      'volume_min volume_max volume_step trade_contract_size')
+AccountInfo = namedtuple('AccountInfo', 'login balance equity profit margin margin_free margin_level '
+                                        'leverage currency server company name')
+TerminalInfo = namedtuple('TerminalInfo', 'connected trade_allowed company name path')
+TradePosition = namedtuple('TradePosition', 'ticket time time_msc type magic identifier volume price_open '
+                                            'sl tp price_current profit swap symbol comment')
+TradeDeal = namedtuple('TradeDeal', 'ticket order time time_msc type entry magic position_id volume price '
+                                    'commission swap profit fee symbol comment')
+OrderSendResult = namedtuple('OrderSendResult', 'retcode deal order volume price bid ask comment request_id '
+                                                'retcode_external request')
+SymbolName = namedtuple('SymbolName', 'name')
+
+TICKS_DTYPE = np.dtype([('time_msc', '<i8'), ('bid', '<f8'), ('ask', '<f8')])
+COPY_TICKS_DTYPE = np.dtype([('time', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('last', '<f8'), ('volume', '<u8'),
+                             ('time_msc', '<i8'), ('flags', '<u4'), ('volume_real', '<f8')])
+
+# Specifiche di default di un simbolo simulato (sovrascrivibili per simbolo)
+DEFAULT_SYMBOL_SPEC = {
+    'point': 0.00001,
+    'digits': 5,
+    'volume_min': 0.01,
+    'volume_max': 100.0,
+    'volume_step': 0.01,
+    'contract_size': 100000.0,
+}
+
+
+def load_tick_file(path: str) -> Dict[str, np.ndarray]:
+    """
+    Legge un file tick CSV (anche .gz) con header time_msc,symbol,bid,ask e restituisce
+    {symbol: array TICKS_DTYPE ordinato per time_msc}.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    rows = defaultdict(list)
+    with opener(path, 'rt', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            rows[row['symbol']].append((int(row['time_msc']), float(row['bid']), float(row['ask'])))
+    ticks = {}
+    for symbol, values in rows.items():
+        arr = np.array(values, dtype=TICKS_DTYPE)
+        ticks[symbol] = arr[np.argsort(arr['time_msc'], kind='stable')]
+    return ticks
+
+
+def _to_seconds(value) -> float:
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return float(value)
+
+
+class SimulatedMT5:
+    """
+    Backend con l'API di MetaTrader5 alimentato da tick registrati.
+
+    Orologio simulato: con `speed` > 0 il tempo di mercato avanza di `speed` secondi per ogni
+    secondo reale a partire dal primo tick; symbol_info_tick restituisce l'ultimo tick con
+    time_msc <= orologio. Con speed = 0 (massima velocità) ogni simbolo avanza di un tick per
+    ciclo del main loop (`begin_cycle()`, chiamato da mt5_snapshot.refresh): la prima richiesta
+    del ciclo porta il simbolo al tick successivo, le altre dello stesso ciclo (fetch del tick
+    fresco prima dell'ordine, heartbeat) rivedono quel tick, quindi il replay non dipende dal
+    numero di chiamate. A dati esauriti resta l'ultimo tick (`finished` = True).
+
+    Gli ordini a mercato vengono eseguiti al bid/ask corrente senza slippage; SL/TP sono
+    controllati sul tick corrente quando il simbolo avanza. Il profitto in valuta conto è
+    (differenza prezzo) * volume * contract_size.
+    """
+
+    def __init__(self, ticks: Dict[str, np.ndarray], speed: float = 1.0, initial_balance: float = 10000.0,
+                 leverage: int = 100, currency: str = 'USD', symbol_specs: Optional[Dict[str, dict]] = None):
+        self.speed = speed
+        self.leverage = leverage
+        self.currency = currency
+        self._ticks = {symbol: arr for symbol, arr in ticks.items() if len(arr)}
+        self._specs = {
+            symbol: dict(DEFAULT_SYMBOL_SPEC, **(symbol_specs or {}).get(symbol, {}))
+            for symbol in self._ticks
+        }
+        self._cursor = {symbol: -1 for symbol in self._ticks}
+        self._start_msc = min(int(arr['time_msc'][0]) for arr in self._ticks.values()) if self._ticks else 0
+        self._started_at = None
+        self._now_msc = self._start_msc
+        self._balance = float(initial_balance)
+        self._positions = {}
+        self._deals = []
+        self._next_ticket = 1
+        self._lock = threading.RLock()
+        self._served_at = {}
+        self._cycle = 0
+        self._cycle_advanced = {}  # symbol -> ultimo ciclo in cui il simbolo è avanzato (speed = 0)
+        self._stats = {
+            'calls': defaultdict(int),
+            'ticks_served': 0,
+            'orders': 0,
+            'rejected': 0,
+            'sl_tp_closes': 0,
+            # Latenza tick -> ordine come contatori (conteggio, somma, massimo): memoria costante nei soak lunghi
+            'tick_to_order_count': 0,
+            'tick_to_order_ms_sum': 0.0,
+            'tick_to_order_ms_max': 0.0,
+        }
+
+    @classmethod
+    def from_files(cls, paths: Iterable[str], **kwargs) -> 'SimulatedMT5':
+        merged = defaultdict(list)
+        for path in ([paths] if isinstance(paths, str) else paths):
+            for symbol, arr in load_tick_file(path).items():
+                merged[symbol].append(arr)
+        ticks = {}
+        for symbol, parts in merged.items():
+            arr = np.concatenate(parts)
+            ticks[symbol] = arr[np.argsort(arr['time_msc'], kind='stable')]
+        return cls(ticks, **kwargs)
+
+    @classmethod
+    def from_archive(cls, root: str, symbols: Iterable[str] = None, start_msc: int = None,
+                     end_msc: int = None, **kwargs) -> 'SimulatedMT5':
+        """Replay dei tick registrati dal recorder dell'engine (utils.tick_archive)."""
+        from utils.tick_archive import load_archive
+        ticks = {}
+        for symbol, arr in load_archive(root, symbols, start_msc, end_msc).items():
+            converted = np.empty(len(arr), dtype=TICKS_DTYPE)
+            converted['time_msc'] = arr['ts_msc']
+            converted['bid'] = arr['bid']
+            converted['ask'] = arr['ask']
+            ticks[symbol] = converted
+        return cls(ticks, **kwargs)
+
+    @classmethod
+    def from_config(cls, backend_config: dict) -> 'SimulatedMT5':
+        """Crea il backend dalla sezione broker_backend della config (type = 'simulated')."""
+        options = dict(
+            speed=backend_config.get('speed', 1.0),
+            initial_balance=backend_config.get('initial_balance', 10000.0),
+            leverage=backend_config.get('leverage', 100),
+            currency=backend_config.get('currency', 'USD'),
+            symbol_specs=backend_config.get('symbols', {})
+        )
+        if backend_config.get('tick_archive'):
+            return cls.from_archive(backend_config['tick_archive'], **options)
+        return cls.from_files(backend_config.get('tick_files', []), **options)
+
+    # ------------------------------------------------------------------
+    # Orologio e avanzamento tick
+    # ------------------------------------------------------------------
+    @property
+    def finished(self) -> bool:
+        return all(self._cursor[s] >= len(arr) - 1 for s, arr in self._ticks.items())
+
+    def _clock_msc(self) -> int:
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        return self._start_msc + int((time.perf_counter() - self._started_at) * 1000 * self.speed)
+
+    def begin_cycle(self) -> None:
+        """Inizio di un ciclo del main loop: a speed = 0 ogni simbolo può avanzare di nuovo di un tick."""
+        with self._lock:
+            self._cycle += 1
+
+    def _advance(self, symbol: str) -> int:
+        """
+        Porta avanti il cursore del simbolo secondo l'orologio (speed = 0: al più un tick per ciclo);
+        restituisce l'indice del tick corrente (-1 se nessuno).
+        """
+        arr = self._ticks[symbol]
+        cursor = self._cursor[symbol]
+        if self.speed > 0:
+            new_cursor = int(np.searchsorted(arr['time_msc'], self._clock_msc(), side='right')) - 1
+        elif self._cycle_advanced.get(symbol) == self._cycle:
+            return cursor
+        else:
+            self._cycle_advanced[symbol] = self._cycle
+            new_cursor = min(cursor + 1, len(arr) - 1)
+        if new_cursor > cursor:
+            self._cursor[symbol] = new_cursor
+            self._now_msc = max(self._now_msc, int(arr['time_msc'][new_cursor]))
+            self._served_at[symbol] = time.perf_counter()
+            self._stats['ticks_served'] += new_cursor - cursor
+            # Anche i tick saltati dall'orologio (speed > 0) possono toccare SL/TP
+            self._check_stops(symbol, arr[cursor + 1:new_cursor + 1])
+        return self._cursor[symbol]
+
+    def _current(self, symbol: str):
+        """Tick corrente senza avanzare (None se il simbolo non ha ancora tick)."""
+        cursor = self._cursor.get(symbol, -1)
+        if cursor < 0:
+            cursor = self._advance(symbol)
+        return self._ticks[symbol][cursor] if cursor >= 0 else None
+
+    # ------------------------------------------------------------------
+    # Connessione e terminale
+    # ------------------------------------------------------------------
+    def initialize(self, *args, **kwargs) -> bool:
+        self._stats['calls']['initialize'] += 1
+        return True
+
+    def login(self, *args, **kwargs) -> bool:
+        return True
+
+    def shutdown(self) -> None:
+        self._stats['calls']['shutdown'] += 1
+
+    def last_error(self):
+        return (1, 'Success')
+
+    def terminal_info(self):
+        self._stats['calls']['terminal_info'] += 1
+        return TerminalInfo(connected=True, trade_allowed=True, company='Simulated', name='SimulatedMT5', path='')
+
+    # ------------------------------------------------------------------
+    # Simboli e tick
+    # ------------------------------------------------------------------
+    def symbols_get(self, *args, **kwargs):
+        return tuple(SymbolName(symbol) for symbol in self._ticks)
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        return symbol in self._ticks
+
+    def symbol_info(self, symbol: str):
+        self._stats['calls']['symbol_info'] += 1
+        if symbol not in self._ticks:
+            return None
+        with self._lock:
+            # Stesso tick di symbol_info_tick nel ciclo (anche se symbol_info arriva prima, dallo snapshot)
+            cursor = self._advance(symbol)
+            tick = self._ticks[symbol][cursor] if cursor >= 0 else None
+        spec = self._specs[symbol]
+        bid = float(tick['bid']) if tick is not None else 0.0
+        ask = float(tick['ask']) if tick is not None else 0.0
+        return SymbolInfo(
+            name=symbol, visible=True, select=True, point=spec['point'], digits=spec['digits'],
+            spread=int(round((ask - bid) / spec['point'])) if tick is not None else 0,
+            bid=bid, ask=ask, time=int(tick['time_msc']) // 1000 if tick is not None else 0,
+            volume_min=spec['volume_min'], volume_max=spec['volume_max'], volume_step=spec['volume_step'],
+            trade_contract_size=spec['contract_size']
+        )
+
+    def tick_data(self, symbol: str) -> Optional[np.ndarray]:
+        """Array TICKS_DTYPE completo del simbolo, indipendente dall'orologio (backtest vettoriale)."""
+        return self._ticks.get(symbol)
+
+    def symbol_info_tick(self, symbol: str):
+        self._stats['calls']['symbol_info_tick'] += 1
+        if symbol not in self._ticks:
+            return None
+        with self._lock:
+            cursor = self._advance(symbol)
+            if cursor < 0:
+                return None
+            row = self._ticks[symbol][cursor]
+        time_msc = int(row['time_msc'])
+        return Tick(time=time_msc // 1000, bid=float(row['bid']), ask=float(row['ask']), last=0.0,
+                    volume=0, time_msc=time_msc, flags=COPY_TICKS_INFO, volume_real=0.0)
+
+    def copy_ticks_range(self, symbol: str, date_from, date_to, flags: int = COPY_TICKS_ALL):
+        """Tick già "avvenuti" (fino al tick corrente) nell'intervallo [date_from, date_to) in secondi."""
+        self._stats['calls']['copy_ticks_range'] += 1
+        arr = self._ticks.get(symbol)
+        if arr is None:
+            return None
+        with self._lock:
+            # Query di sola lettura: a speed=0 non consuma tick, con l'orologio segue solo il tempo simulato
+            cursor = self._advance(symbol) if self.speed > 0 else self._cursor[symbol]
+        lo = int(np.searchsorted(arr['time_msc'], int(_to_seconds(date_from) * 1000), side='left'))
+        hi = min(int(np.searchsorted(arr['time_msc'], int(_to_seconds(date_to) * 1000), side='left')), cursor + 1)
+        selected = arr[lo:max(lo, hi)]
+        out = np.zeros(len(selected), dtype=COPY_TICKS_DTYPE)
+        out['time_msc'] = selected['time_msc']
+        out['time'] = selected['time_msc'] // 1000
+        out['bid'] = selected['bid']
+        out['ask'] = selected['ask']
+        out['flags'] = COPY_TICKS_INFO
+        return out
+
+    # ------------------------------------------------------------------
+    # Account e posizioni
+    # ------------------------------------------------------------------
+    def _position_profit(self, pos: dict, bid: float, ask: float) -> float:
+        contract = self._specs[pos['symbol']]['contract_size']
+        if pos['type'] == POSITION_TYPE_BUY:
+            return (bid - pos['price_open']) * pos['volume'] * contract
+        return (pos['price_open'] - ask) * pos['volume'] * contract
+
+    def _margin(self, symbol: str, volume: float, price: float) -> float:
+        return volume * self._specs[symbol]['contract_size'] * price / self.leverage
+
+    def account_info(self):
+        self._stats['calls']['account_info'] += 1
+        with self._lock:
+            profit = 0.0
+            margin = 0.0
+            for pos in self._positions.values():
+                tick = self._current(pos['symbol'])
+                profit += self._position_profit(pos, float(tick['bid']), float(tick['ask']))
+                margin += self._margin(pos['symbol'], pos['volume'], pos['price_open'])
+            equity = self._balance + profit
+        return AccountInfo(
+            login=0, balance=round(self._balance, 2), equity=round(equity, 2), profit=round(profit, 2),
+            margin=round(margin, 2), margin_free=round(equity - margin, 2),
+            margin_level=round(equity / margin * 100, 2) if margin else 0.0,
+            leverage=self.leverage, currency=self.currency, server='Simulated', company='Simulated', name='SimulatedMT5'
+        )
+
+    def positions_get(self, symbol: str = None, ticket: int = None, group: str = None):
+        self._stats['calls']['positions_get'] += 1
+        with self._lock:
+            result = []
+            for pos in self._positions.values():
+                if (symbol is not None and pos['symbol'] != symbol) or (ticket is not None and pos['ticket'] != ticket):
+                    continue
+                tick = self._current(pos['symbol'])
+                bid, ask = float(tick['bid']), float(tick['ask'])
+                result.append(TradePosition(
+                    ticket=pos['ticket'], time=pos['time_msc'] // 1000, time_msc=pos['time_msc'], type=pos['type'],
+                    magic=pos['magic'], identifier=pos['ticket'], volume=pos['volume'], price_open=pos['price_open'],
+                    sl=pos['sl'], tp=pos['tp'], price_current=bid if pos['type'] == POSITION_TYPE_BUY else ask,
+                    profit=round(self._position_profit(pos, bid, ask), 2), swap=0.0, symbol=pos['symbol'],
+                    comment=pos['comment']
+                ))
+        return tuple(result)
+
+    def history_deals_get(self, date_from=None, date_to=None, **kwargs):
+        self._stats['calls']['history_deals_get'] += 1
+        start = _to_seconds(date_from) if date_from is not None else float('-inf')
+        end = _to_seconds(date_to) if date_to is not None else float('inf')
+        with self._lock:
+            return tuple(d for d in self._deals if start <= d.time <= end)
+
+    def order_calc_margin(self, action: int, symbol: str, volume: float, price: float):
+        if symbol not in self._specs:
+            return None
+        return self._margin(symbol, volume, price)
+
+    # ------------------------------------------------------------------
+    # Ordini
+    # ------------------------------------------------------------------
+    def order_send(self, request: dict):
+        self._stats['calls']['order_send'] += 1
+        with self._lock:
+            action = request.get('action')
+            if action == TRADE_ACTION_SLTP:
+                result = self._modify(request)
+            elif action == TRADE_ACTION_DEAL and request.get('position'):
+                result = self._close(request)
+            elif action == TRADE_ACTION_DEAL:
+                result = self._open(request)
+            else:
+                result = self._result(TRADE_RETCODE_INVALID, request, comment='Azione non supportata')
+            if result.retcode == TRADE_RETCODE_DONE:
+                self._stats['orders'] += 1
+            else:
+                self._stats['rejected'] += 1
+            return result
+
+    def _result(self, retcode: int, request: dict, deal: int = 0, order: int = 0, price: float = 0.0,
+                tick=None, comment: str = '') -> OrderSendResult:
+        return OrderSendResult(
+            retcode=retcode, deal=deal, order=order, volume=request.get('volume', 0.0), price=price,
+            bid=float(tick['bid']) if tick is not None else 0.0, ask=float(tick['ask']) if tick is not None else 0.0,
+            comment=comment or ('Request executed' if retcode == TRADE_RETCODE_DONE else 'Rejected'),
+            request_id=0, retcode_external=0, request=request
+        )
+
+    def _open(self, request: dict) -> OrderSendResult:
+        symbol = request.get('symbol')
+        if symbol not in self._ticks:
+            return self._result(TRADE_RETCODE_INVALID, request, comment='Simbolo sconosciuto')
+        tick = self._current(symbol)
+        if tick is None:
+            return self._result(TRADE_RETCODE_MARKET_CLOSED, request, comment='Nessun tick')
+        spec = self._specs[symbol]
+        volume = float(request.get('volume', 0.0))
+        if volume < spec['volume_min'] or volume > spec['volume_max']:
+            return self._result(TRADE_RETCODE_INVALID_VOLUME, request, tick=tick)
+        order_type = request.get('type')
+        price = float(tick['ask']) if order_type == ORDER_TYPE_BUY else float(tick['bid'])
+        if self._margin(symbol, volume, price) > self.account_info().margin_free:
+            return self._result(TRADE_RETCODE_NO_MONEY, request, tick=tick)
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self._positions[ticket] = {
+            'ticket': ticket, 'symbol': symbol, 'type': order_type, 'volume': volume, 'price_open': price,
+            'sl': float(request.get('sl') or 0.0), 'tp': float(request.get('tp') or 0.0),
+            'magic': request.get('magic', 0), 'comment': request.get('comment', ''), 'time_msc': self._now_msc
+        }
+        self._add_deal(ticket, symbol, order_type, DEAL_ENTRY_IN, volume, price, 0.0, request.get('magic', 0))
+        served_at = self._served_at.get(symbol)
+        if served_at is not None:
+            latency_ms = (time.perf_counter() - served_at) * 1000
+            self._stats['tick_to_order_count'] += 1
+            self._stats['tick_to_order_ms_sum'] += latency_ms
+            self._stats['tick_to_order_ms_max'] = max(self._stats['tick_to_order_ms_max'], latency_ms)
+        return self._result(TRADE_RETCODE_DONE, request, deal=ticket, order=ticket, price=price, tick=tick)
+
+    def _close(self, request: dict) -> OrderSendResult:
+        pos = self._positions.get(request['position'])
+        if pos is None:
+            return self._result(TRADE_RETCODE_POSITION_CLOSED, request)
+        tick = self._current(pos['symbol'])
+        price = float(tick['bid']) if pos['type'] == POSITION_TYPE_BUY else float(tick['ask'])
+        self._close_position(pos, price)
+        return self._result(TRADE_RETCODE_DONE, request, deal=pos['ticket'], order=pos['ticket'], price=price, tick=tick)
+
+    def _modify(self, request: dict) -> OrderSendResult:
+        pos = self._positions.get(request.get('position'))
+        if pos is None:
+            return self._result(TRADE_RETCODE_POSITION_CLOSED, request)
+        pos['sl'] = float(request.get('sl') or 0.0)
+        pos['tp'] = float(request.get('tp') or 0.0)
+        return self._result(TRADE_RETCODE_DONE, request, order=pos['ticket'])
+
+    def _close_position(self, pos: dict, price: float, time_msc: Optional[int] = None) -> None:
+        contract = self._specs[pos['symbol']]['contract_size']
+        sign = 1 if pos['type'] == POSITION_TYPE_BUY else -1
+        profit = round((price - pos['price_open']) * sign * pos['volume'] * contract, 2)
+        self._balance += profit
+        del self._positions[pos['ticket']]
+        close_type = ORDER_TYPE_SELL if pos['type'] == POSITION_TYPE_BUY else ORDER_TYPE_BUY
+        self._add_deal(pos['ticket'], pos['symbol'], close_type, DEAL_ENTRY_OUT, pos['volume'], price, profit,
+                       pos['magic'], time_msc)
+
+    def _add_deal(self, position_id: int, symbol: str, deal_type: int, entry: int, volume: float,
+                  price: float, profit: float, magic: int, time_msc: Optional[int] = None) -> None:
+        time_msc = self._now_msc if time_msc is None else time_msc
+        self._deals.append(TradeDeal(
+            ticket=len(self._deals) + 1, order=position_id, time=time_msc // 1000, time_msc=time_msc,
+            type=deal_type, entry=entry, magic=magic, position_id=position_id, volume=volume, price=price,
+            commission=0.0, swap=0.0, profit=profit, fee=0.0, symbol=symbol, comment=''
+        ))
+
+    def _check_stops(self, symbol: str, ticks: np.ndarray) -> None:
+        """Chiude le posizioni del simbolo al primo dei tick nuovi (in ordine) che tocca SL o TP."""
+        for pos in [p for p in self._positions.values() if p['symbol'] == symbol]:
+            prices = ticks['bid'] if pos['type'] == POSITION_TYPE_BUY else ticks['ask']
+            hit = np.zeros(len(ticks), dtype=bool)
+            if pos['type'] == POSITION_TYPE_BUY:
+                if pos['sl']:
+                    hit |= prices <= pos['sl']
+                if pos['tp']:
+                    hit |= prices >= pos['tp']
+            else:
+                if pos['sl']:
+                    hit |= prices >= pos['sl']
+                if pos['tp']:
+                    hit |= prices <= pos['tp']
+            first = np.flatnonzero(hit)
+            if len(first):
+                k = first[0]
+                self._close_position(pos, float(prices[k]), int(ticks['time_msc'][k]))
+                self._stats['sl_tp_closes'] += 1
+
+    # ------------------------------------------------------------------
+    # Statistiche
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict:
+        with self._lock:
+            timed = self._stats['tick_to_order_count']
+            return {
+                'calls': dict(self._stats['calls']),
+                'ticks_served': self._stats['ticks_served'],
+                'orders': self._stats['orders'],
+                'rejected': self._stats['rejected'],
+                'sl_tp_closes': self._stats['sl_tp_closes'],
+                'open_positions': len(self._positions),
+                'balance': round(self._balance, 2),
+                'tick_to_order_ms_avg': self._stats['tick_to_order_ms_sum'] / timed if timed else 0.0,
+                'tick_to_order_ms_max': self._stats['tick_to_order_ms_max'],
+                'sim_time_msc': self._now_msc,
+                'finished': self.finished,
+            }
+
+
+# Costanti raggiungibili anche come attributi dell'istanza (mt5.ORDER_TYPE_BUY sul backend attivo)
+for _name, _value in list(globals().items()):
+    if _name.isupper() and isinstance(_value, int):
+        setattr(SimulatedMT5, _name, _value)
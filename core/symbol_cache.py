@@ -0,0 +1,93 @@
+# symbol_cache.py
+"""
+Modulo SymbolCache: cache per simbolo con TTL, limite di voci ed eviction LRU, senza lock globali.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+class SymbolCache:
+    """
+    Cache chiave -> (valore, timestamp) dedicata a un singolo simbolo.
+
+    Ogni operazione è una singola chiamata C su OrderedDict (atomica sotto GIL), quindi
+    nessun lock: un thread che scrive tick non resta mai in attesa di un lettore.
+    - TTL: le voci più vecchie di `ttl` secondi vengono rimosse alla lettura (expirations).
+    - LRU: una lettura valida sposta la voce in coda; oltre `max_entries` voci viene
+      rimossa la meno usata di recente (evictions).
+    I contatori hits/misses/evictions/expirations sono indicativi: gli incrementi non
+    sono sincronizzati tra thread.
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 64):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.time() - entry[1] >= self.ttl:
+            self._entries.pop(key, None)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            pass  # Rimossa da un altro thread nel frattempo: il valore letto resta valido
+        self.hits += 1
+        return entry
+
+    def get(self, key, default=None):
+        entry = self._lookup(key)
+        return default if entry is None else entry[0]
+
+    def set(self, key, value) -> None:
+        self._entries[key] = (value, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            try:
+                self._entries.popitem(last=False)
+            except KeyError:
+                break
+            self.evictions += 1
+
+    def get_or_compute(self, key, calculate_func: Callable, *args, default: Any = None):
+        """Restituisce il valore in cache o lo calcola; in caso di errore restituisce `default` senza memorizzarlo."""
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry[0]
+        try:
+            value = calculate_func(*args)
+        except Exception:
+            return default
+        self.set(key, value)
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def snapshot(self) -> dict:
+        return dict(self._entries)
+
+    def clear(self) -> None:
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,174 @@
+# symbol_registry.py
+"""
+Modulo symbol_registry: registro dei metadati statici dei simboli (point, digits, volumi, contract
+size, pip size), caricati una volta da MT5 e riletti periodicamente o alla riconnessione.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from core.mt5_backend import mt5
+
+from utils.constants import DEFAULT_SYMBOL_META_REFRESH_INTERVAL
+
+# Point di ripiego se MT5 non fornisce info sul simbolo (per simbolo base, senza suffisso broker)
+FALLBACK_POINTS = {
+    'BTCUSD': 1.0,
+    'ETHUSD': 0.1,
+    'XAUUSD': 0.01,
+    'SP500': 0.1,
+    'NAS100': 0.1,
+    'default': 0.0001
+}
+
+
+class SymbolMeta(NamedTuple):
+    """Metadati di un simbolo: dal broker (point, digits, volumi) e dalla config (pip_size, contract_size)."""
+    symbol: str
+    point: float
+    digits: int
+    volume_min: float
+    volume_max: float
+    volume_step: float
+    contract_size: float
+    pip_size: float
+    loaded_at: float
+
+    def same_as(self, other: 'SymbolMeta') -> bool:
+        return other is not None and self[:-1] == other[:-1]
+
+
+class SymbolRegistry:
+    """
+    Le letture (get, point) sono senza lock: i record sono immutabili e il dizionario viene
+    sostituito per intero a ogni aggiornamento (copy-on-write), quindi un thread vede sempre
+    uno stato completo. Il lock serializza solo i caricamenti da MT5.
+
+    `refresh()` rilegge tutti i simboli e logga i campi cambiati; `refresh_if_due()` lo fa
+    al massimo ogni `refresh_interval` secondi, `invalidate()` forza la rilettura (riconnessione).
+    """
+
+    def __init__(self, client=mt5, refresh_interval: float = DEFAULT_SYMBOL_META_REFRESH_INTERVAL,
+                 retry_interval: float = 60.0):
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.config = {}
+        self.logger = logging.getLogger("phoenix_quantum")
+        self._meta: Dict[str, SymbolMeta] = {}
+        self._failed: Dict[str, float] = {}
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, config: dict) -> None:
+        """Imposta la config usata per pip_size/contract_size e l'intervallo di refresh (symbol_metadata.refresh_interval)."""
+        self.config = config or {}
+        self.refresh_interval = self.config.get('symbol_metadata', {}).get('refresh_interval', self.refresh_interval)
+        self.invalidate()
+
+    # ------------------------------------------------------------------
+    # Lettura (lock-free)
+    # ------------------------------------------------------------------
+    def get(self, symbol: str) -> Optional[SymbolMeta]:
+        """Metadati del simbolo, caricati da MT5 al primo accesso; None se MT5 non lo conosce."""
+        meta = self._meta.get(symbol)
+        if meta is not None:
+            return meta
+        failed_at = self._failed.get(symbol)
+        if failed_at is not None and time.time() - failed_at < self.retry_interval:
+            return None
+        return self._load([symbol]).get(symbol)
+
+    def point(self, symbol: str) -> float:
+        """Point del simbolo (dimensione minima di prezzo), con ripiego per simbolo base se MT5 non risponde."""
+        meta = self.get(symbol)
+        if meta is not None and meta.point > 0:
+            return meta.point
+        return FALLBACK_POINTS.get(symbol.split('.')[0], FALLBACK_POINTS['default'])
+
+    def all(self) -> Dict[str, SymbolMeta]:
+        return self._meta
+
+    # ------------------------------------------------------------------
+    # Aggiornamento
+    # ------------------------------------------------------------------
+    def refresh(self, symbols: Iterable[str] = None) -> List[str]:
+        """Rilegge i simboli indicati (default: quelli già caricati); restituisce quelli con metadati cambiati."""
+        symbols = list(self._meta) if symbols is None else list(symbols)
+        previous = self._meta
+        loaded = self._load(symbols)
+        self._last_refresh = time.time()
+        changed = []
+        for symbol, meta in loaded.items():
+            old = previous.get(symbol)
+            if old is not None and not meta.same_as(old):
+                changed.append(symbol)
+                diff = ', '.join(
+                    f"{field}: {getattr(old, field)} -> {getattr(meta, field)}"
+                    for field in SymbolMeta._fields[1:-1] if getattr(old, field) != getattr(meta, field)
+                )
+                self.logger.warning(f"[SYMBOL-META] {symbol} metadati cambiati: {diff}")
+        return changed
+
+    def refresh_if_due(self, symbols: Iterable[str] = None) -> List[str]:
+        if time.time() - self._last_refresh < self.refresh_interval:
+            return []
+        return self.refresh(symbols)
+
+    def invalidate(self) -> None:
+        """Scarta tutti i metadati: il prossimo accesso rilegge da MT5."""
+        with self._lock:
+            self._meta = {}
+            self._failed = {}
+            self._last_refresh = 0.0
+
+    def _load(self, symbols: Iterable[str]) -> Dict[str, SymbolMeta]:
+        loaded = {}
+        failed = {}
+        now = time.time()
+        for symbol in symbols:
+            try:
+                info = self.client.symbol_info(symbol)
+            except Exception as e:
+                self.logger.error(f"[SYMBOL-META] Errore lettura info {symbol}: {e}")
+                info = None
+            if not info:
+                failed[symbol] = now
+                continue
+            loaded[symbol] = self._build(symbol, info, now)
+        with self._lock:
+            meta = dict(self._meta)
+            meta.update(loaded)
+            failures = {s: t for s, t in self._failed.items() if s not in loaded}
+            failures.update(failed)
+            self._meta = meta
+            self._failed = failures
+        return loaded
+
+    def _build(self, symbol: str, info, now: float) -> SymbolMeta:
+        # pip_size/contract_size: override del simbolo (risk_management), poi pip_size_map globale
+        risk_config = self.config.get('symbols', {}).get(symbol, {}).get('risk_management', {})
+        if 'pip_size' in risk_config:
+            pip_size = float(risk_config['pip_size'])
+        else:
+            pip_map = self.config.get('pip_size_map', {})
+            pip_size = pip_map.get(symbol)
+            if pip_size is None:
+                pip_size = pip_map.get('default', 0.0001)
+            pip_size = float(pip_size)
+        return SymbolMeta(
+            symbol=symbol,
+            point=info.point,
+            digits=info.digits,
+            volume_min=info.volume_min,
+            volume_max=info.volume_max,
+            volume_step=info.volume_step,
+            contract_size=risk_config.get('contract_size', 1.0),
+            pip_size=pip_size,
+            loaded_at=now
+        )
+
+
+# Istanza condivisa da engine, risk manager e trading system
+symbol_registry = SymbolRegistry()
@@ -0,0 +1,129 @@
+# tick_buffer.py
+"""
+Modulo TickRingBuffer: buffer circolare colonnare (NumPy) per i tick di un simbolo.
+"""
+from typing import Dict, Iterator, Optional
+import numpy as np
+
+
+class TickRingBuffer:
+    """
+    Ring buffer preallocato con colonne parallele price/delta/time (float64), direction (int8)
+    e repeats (int32, quotazioni invariate accorpate nel tick tramite bump_last).
+
+    Ogni colonna è allocata con lunghezza 2 * capacity e ogni tick viene scritto due volte
+    (posizione p e p + capacity): in questo modo gli ultimi n tick sono sempre contigui in
+    memoria e le letture di finestra restituiscono viste NumPy senza copia.
+    Le viste restano valide fino al successivo append; copiarle se servono più a lungo.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError(f"Capacità buffer non valida: {capacity}")
+        self.capacity = int(capacity)
+        self._price = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._delta = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._time = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._direction = np.zeros(2 * self.capacity, dtype=np.int8)
+        self._repeats = np.zeros(2 * self.capacity, dtype=np.int32)
+        self._head = -1  # Indice (0..capacity-1) dell'ultimo tick scritto
+        self._count = 0
+
+    # ------------------------------------------------------------------
+    # Scrittura
+    # ------------------------------------------------------------------
+    def append(self, price: float, delta: float, direction: int, ts: float) -> None:
+        """Aggiunge un tick sovrascrivendo il più vecchio se il buffer è pieno."""
+        head = (self._head + 1) % self.capacity
+        mirror = head + self.capacity
+        self._price[head] = self._price[mirror] = price
+        self._delta[head] = self._delta[mirror] = delta
+        self._time[head] = self._time[mirror] = ts
+        self._direction[head] = self._direction[mirror] = direction
+        self._repeats[head] = self._repeats[mirror] = 0
+        self._head = head
+        if self._count < self.capacity:
+            self._count += 1
+
+    def bump_last(self, ts: float) -> None:
+        """Accorpa una quotazione invariata nell'ultimo tick: incrementa repeats e aggiorna il tempo."""
+        if self._count == 0:
+            return
+        head = self._head
+        mirror = head + self.capacity
+        self._repeats[head] = self._repeats[mirror] = self._repeats[head] + 1
+        self._time[head] = self._time[mirror] = ts
+
+    def append_tick(self, tick: Dict) -> None:
+        """Compatibilità con il vecchio formato dict (price, delta, direction, time)."""
+        self.append(tick['price'], tick.get('delta', 0.0), tick.get('direction', 0), tick.get('time', 0.0))
+
+    def clear(self) -> None:
+        self._head = -1
+        self._count = 0
+
+    # ------------------------------------------------------------------
+    # Letture di finestra (viste zero-copy, read-only)
+    # ------------------------------------------------------------------
+    def _window(self, column: np.ndarray, n: Optional[int]) -> np.ndarray:
+        size = self._count if n is None else max(0, min(int(n), self._count))
+        end = self._head + self.capacity + 1
+        view = column[end - size:end]
+        view.flags.writeable = False
+        return view
+
+    def prices(self, n: Optional[int] = None) -> np.ndarray:
+        return self._window(self._price, n)
+
+    def deltas(self, n: Optional[int] = None) -> np.ndarray:
+        return self._window(self._delta, n)
+
+    def directions(self, n: Optional[int] = None) -> np.ndarray:
+        return self._window(self._direction, n)
+
+    def times(self, n: Optional[int] = None) -> np.ndarray:
+        return self._window(self._time, n)
+
+    def repeats(self, n: Optional[int] = None) -> np.ndarray:
+        return self._window(self._repeats, n)
+
+    @property
+    def last_price(self) -> Optional[float]:
+        if self._count == 0:
+            return None
+        return float(self._price[self._head])
+
+    @property
+    def last_time(self) -> Optional[float]:
+        if self._count == 0:
+            return None
+        return float(self._time[self._head])
+
+    # ------------------------------------------------------------------
+    # Interfaccia sequenza (compatibilità con deque di dict)
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __getitem__(self, index: int) -> Dict:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Indice tick fuori range")
+        pos = self._head + self.capacity + 1 - self._count + index
+        return {
+            'price': float(self._price[pos]),
+            'delta': float(self._delta[pos]),
+            'direction': int(self._direction[pos]),
+            'time': float(self._time[pos]),
+            'repeats': int(self._repeats[pos])
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._count):
+            yield self[i]
@@ -0,0 +1,152 @@
+# tick_ingestion.py
+"""
+Modulo TickIngestor: acquisizione tick event-driven con code per simbolo e worker dedicati.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+from core.mt5_backend import mt5
+
+
+class TickIngestor:
+    """
+    Un thread producer interroga MT5 a intervallo breve e smista i tick nuovi (time_msc
+    diverso dall'ultimo visto) in una coda limitata per simbolo; un worker per simbolo
+    consuma la propria coda chiamando `on_tick(symbol, tick)`.
+
+    Backpressure: se la coda di un simbolo è piena viene scartato il tick più vecchio
+    (il più recente è sempre quello utile) e incrementato il contatore `dropped`.
+    Un simbolo lento rallenta solo il proprio worker, non gli altri.
+    """
+
+    def __init__(self, symbols: Iterable[str], on_tick: Callable, poll_interval: float = 0.1,
+                 queue_size: int = 256, fetch_tick: Optional[Callable] = None):
+        self.symbols = list(symbols)
+        self.on_tick = on_tick
+        self.poll_interval = poll_interval
+        # Backend risolto a ogni chiamata: un set_backend() successivo raggiunge anche gli ingestor esistenti
+        self.fetch_tick = fetch_tick or (lambda symbol: mt5.symbol_info_tick(symbol))
+        self.logger = logging.getLogger("phoenix_quantum")
+        self._queues = {symbol: queue.Queue(maxsize=queue_size) for symbol in self.symbols}
+        self._last_time_msc = {}
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._stats = {
+            symbol: {
+                'received': 0,
+                'duplicates': 0,
+                'enqueued': 0,
+                'dropped': 0,
+                'processed': 0,
+                'errors': 0,
+                'max_queue_depth': 0,
+                'last_latency_ms': 0.0,
+                'max_latency_ms': 0.0
+            }
+            for symbol in self.symbols
+        }
+
+    # ------------------------------------------------------------------
+    # Ciclo di vita
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop_event.clear()
+        producer = threading.Thread(target=self._producer_loop, name="tick-producer", daemon=True)
+        self._threads.append(producer)
+        for symbol in self.symbols:
+            worker = threading.Thread(target=self._worker_loop, args=(symbol,), name=f"tick-worker-{symbol}", daemon=True)
+            self._threads.append(worker)
+        for thread in self._threads:
+            thread.start()
+        self.logger.info(f"[INGESTION] Avviati producer e {len(self.symbols)} worker tick (poll={self.poll_interval}s)")
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+        self.logger.info(f"[INGESTION] Fermato. Statistiche: {self.get_stats()}")
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads) and not self._stop_event.is_set()
+
+    # ------------------------------------------------------------------
+    # Producer / consumer
+    # ------------------------------------------------------------------
+    def offer(self, symbol: str, tick) -> bool:
+        """
+        Accoda un tick per il simbolo se è nuovo (time_msc diverso dall'ultimo visto).
+        Restituisce True se accodato. Usabile anche da sorgenti esterne (es. backfill).
+        """
+        stats = self._stats.get(symbol)
+        if stats is None:
+            return False
+        stats['received'] += 1
+        time_msc = getattr(tick, 'time_msc', None)
+        if time_msc is not None and time_msc == self._last_time_msc.get(symbol):
+            stats['duplicates'] += 1
+            return False
+        self._last_time_msc[symbol] = time_msc
+        q = self._queues[symbol]
+        item = (tick, time.time())
+        while True:
+            try:
+                q.put_nowait(item)
+                break
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                    stats['dropped'] += 1
+                except queue.Empty:
+                    pass
+        stats['enqueued'] += 1
+        depth = q.qsize()
+        if depth > stats['max_queue_depth']:
+            stats['max_queue_depth'] = depth
+        return True
+
+    def _producer_loop(self) -> None:
+        while not self._stop_event.is_set():
+            started = time.time()
+            for symbol in self.symbols:
+                try:
+                    tick = self.fetch_tick(symbol)
+                except Exception as e:
+                    self.logger.error(f"[INGESTION] Errore lettura tick {symbol}: {e}")
+                    continue
+                if tick:
+                    self.offer(symbol, tick)
+            elapsed = time.time() - started
+            self._stop_event.wait(max(0.0, self.poll_interval - elapsed))
+
+    def _worker_loop(self, symbol: str) -> None:
+        q = self._queues[symbol]
+        stats = self._stats[symbol]
+        while not self._stop_event.is_set():
+            try:
+                tick, enqueued_at = q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self.on_tick(symbol, tick)
+            except Exception as e:
+                stats['errors'] += 1
+                self.logger.error(f"[INGESTION] Errore elaborazione tick {symbol}: {e}", exc_info=True)
+            latency_ms = (time.time() - enqueued_at) * 1000
+            stats['processed'] += 1
+            stats['last_latency_ms'] = latency_ms
+            if latency_ms > stats['max_latency_ms']:
+                stats['max_latency_ms'] = latency_ms
+
+    # ------------------------------------------------------------------
+    # Statistiche
+    # ------------------------------------------------------------------
+    def get_stats(self, symbol: str = None) -> Dict:
+        if symbol is not None:
+            return dict(self._stats.get(symbol, {}), queue_depth=self._queues[symbol].qsize())
+        return {s: dict(st, queue_depth=self._queues[s].qsize()) for s, st in self._stats.items()}
@@ -1,3 +1,8 @@
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.signal_journal import journal_files, load_signal_journals, journal_to_dataframe
+
 def parse_dict(s):
     import re
     import ast
@@ -18,6 +23,16 @@ def parse_dict(s):
         print(f"[PARSE ERROR] Stringa non parsabile: {s} | Errore: {e}")
         return {}
 
+def load_csv_log(csv_path, pd):
+    """Formato storico: dict serializzato come stringa nella colonna 'data' (parsing riga per riga)."""
+    df = pd.read_csv(csv_path, header=None, names=['timestamp', 'symbol', 'data', 'reason'])
+    # Salta la prima riga se contiene header (es. 'timestamp' nella colonna timestamp)
+    if str(df.iloc[0]['timestamp']).lower() == 'timestamp':
+        df = df.iloc[1:].reset_index(drop=True)
+    # Converte la colonna timestamp in datetime
+    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
+    return df
+
 def main():
 
     import pandas as pd
@@ -25,6 +40,7 @@ def main():
     from datetime import datetime
     # Percorso del file CSV (modifica se necessario)
     CSV_PATH = 'logs/signals_tick_log.csv'
+    JOURNAL_DIR = 'logs'  # signals_journal*.bin (preferito al CSV se presente)
     OUTPUT_PATH = 'logs/signals_tick_log_summary.csv'
 
     # --- FILTRO DATA E SIMBOLO INTERATTIVO ---
@@ -35,14 +51,18 @@ def main():
     print("[Opzionale] Inserisci uno o più simboli separati da virgola (es: GBPUSD,ETHUSD) o lascia vuoto per tutti:")
     simboli_input = input().strip()
 
-    df = pd.read_csv(CSV_PATH, header=None, names=['timestamp', 'symbol', 'data', 'reason'])
-    # Salta la prima riga se contiene header (es. 'timestamp' nella colonna timestamp)
-    if str(df.iloc[0]['timestamp']).lower() == 'timestamp':
-        df = df.iloc[1:].reset_index(drop=True)
-    print("\n[DEBUG] Prime 10 righe del DataFrame caricato dal CSV:")
+    journal_paths = journal_files(JOURNAL_DIR)
+    if journal_paths:
+        # Journal binario: colonne già tipizzate, nessun parsing per riga
+        simboli = [s.strip().upper() for s in simboli_input.split(',') if s.strip()] if simboli_input else None
+        df = journal_to_dataframe(load_signal_journals(journal_paths, symbols=simboli))
+        df['signal'] = df['signal'].astype(str)
+        df['reason'] = df['reason'].astype(str)
+        print(f"\n[DEBUG] Caricati {len(df)} record da {len(journal_paths)} file journal")
+    else:
+        df = load_csv_log(CSV_PATH, pd)
+    print("\n[DEBUG] Prime 10 righe del DataFrame caricato:")
     print(df.head(10))
-    # Converte la colonna timestamp in datetime
-    df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
 
     # Applica filtro data se specificato
     if data_inizio:
@@ -68,10 +88,11 @@ def main():
         print("\nNessun dato trovato per i filtri selezionati.")
         return
 
-    # Estrai i dati dal dizionario
-    indicators = df['data'].apply(parse_dict).apply(pd.Series)
-    df = pd.concat([df, indicators], axis=1)
-    print("\n[DEBUG] Colonne dopo il parsing:", df.columns.tolist())
+    if 'data' in df.columns:
+        # Solo CSV storico: estrai i dati dal dizionario (dopo i filtri, sulle sole righe utili)
+        indicators = df['data'].apply(parse_dict).apply(pd.Series)
+        df = pd.concat([df, indicators], axis=1)
+        print("\n[DEBUG] Colonne dopo il parsing:", df.columns.tolist())
     if 'signal' not in df.columns:
         print("\n[DEBUG] Esempi di dict estratti da 'data':")
         print(df['data'].head(3).tolist())
@@ -0,0 +1,97 @@
+"""
+Soak test del percorso tick -> segnale -> size -> ordine sul backend MT5 simulato.
+Riproduce file tick registrati (CSV time_msc,symbol,bid,ask, anche .gz) alla velocità indicata
+e stampa throughput, latenza per ciclo e statistiche del broker simulato.
+
+Uso: python scripts/soak_simulated_mt5.py ticks.csv.gz [altri file] --speed 0 --duration 60 --config config.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from core.mt5_backend import mt5, set_backend
+from core.mt5_snapshot import mt5_snapshot
+from core.simulated_mt5 import SimulatedMT5
+from core.symbol_registry import symbol_registry
+
+
+def build_config(path, symbols):
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('config', data)
+    return {
+        'symbols': {symbol: {} for symbol in symbols},
+        'risk_parameters': {'max_positions': 1, 'risk_percent': 0.01},
+        'quantum_params': {'signal_cooldown': 0},
+        'logging': {'hot_path_profile': 'quiet', 'signal_log_format': 'journal', 'hold_log_mode': 'aggregate'},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test su backend MT5 simulato")
+    parser.add_argument('tick_files', nargs='+')
+    parser.add_argument('--speed', type=float, default=0.0, help="0 = massima velocità, 1 = tempo reale")
+    parser.add_argument('--duration', type=float, default=60.0, help="durata massima in secondi reali")
+    parser.add_argument('--config', default=None, help="config JSON (default: config minima con i simboli dei file)")
+    args = parser.parse_args()
+
+    backend = SimulatedMT5.from_files(args.tick_files, speed=args.speed)
+    set_backend(backend)
+    symbols = [s.name for s in mt5.symbols_get()]
+    config = build_config(args.config, symbols)
+
+    from core.quantum_engine import QuantumEngine
+    from core.quantum_risk_manager import QuantumRiskManager
+    from utils.hot_log import hot_log
+    hot_log.configure(config.get('logging', {}).get('hot_path_profile', 'normal'))
+    symbol_registry.configure(config)
+    engine = QuantumEngine(config)
+    risk_manager = QuantumRiskManager(config, engine)
+    max_positions = config.get('risk_parameters', {}).get('max_positions', 1)
+
+    cycle_ms = []
+    processed = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < args.duration and not backend.finished:
+        t0 = time.perf_counter()
+        mt5_snapshot.refresh(symbols)
+        fresh = []
+        for symbol in symbols:
+            tick = mt5.symbol_info_tick(symbol)
+            if tick and engine.process_tick(symbol, (tick.bid + tick.ask) / 2, tick.time_msc):
+                fresh.append(symbol)
+        processed += len(fresh)
+        for symbol, (signal, price) in engine.get_signals(fresh).items():
+            if signal not in ("BUY", "SELL") or mt5_snapshot.positions_get(symbol=symbol):
+                continue
+            if len(mt5_snapshot.positions_get() or []) >= max_positions:
+                continue
+            size = risk_manager.calculate_position_size(symbol, price, signal)
+            if size <= 0:
+                continue
+            order_type = mt5.ORDER_TYPE_BUY if signal == "BUY" else mt5.ORDER_TYPE_SELL
+            sl, tp = risk_manager.calculate_dynamic_levels(symbol, order_type, price)
+            mt5.order_send({'action': mt5.TRADE_ACTION_DEAL, 'symbol': symbol, 'volume': size,
+                            'type': order_type, 'sl': sl, 'tp': tp, 'comment': 'SOAK'})
+            mt5_snapshot.invalidate()
+        cycle_ms.append((time.perf_counter() - t0) * 1000)
+        if args.speed > 0:
+            time.sleep(0.01)
+    engine.flush_signal_logs()
+    elapsed = time.perf_counter() - started
+
+    cycles = np.array(cycle_ms) if cycle_ms else np.zeros(1)
+    print(f"Durata: {elapsed:.1f}s | Cicli: {len(cycle_ms)} | Tick processati: {processed} ({processed / elapsed:.0f} tick/s)")
+    print(f"Latenza ciclo ms: p50={np.percentile(cycles, 50):.3f} p99={np.percentile(cycles, 99):.3f} max={cycles.max():.3f}")
+    print(f"Broker simulato: {backend.stats()}")
+    print(f"Snapshot MT5: {mt5_snapshot.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import pytest
+import csv
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from utils.async_writer import AsyncBatchWriter, AsyncCSVWriter
+
+def test_writer_scrive_a_batch_e_chiude_svuotando_la_coda(tmp_path):
+    path = str(tmp_path / 'signals.csv')
+    writer = AsyncCSVWriter(path, ['symbol', 'value'], batch_size=10, flush_interval=0.05)
+    for i in range(25):
+        assert writer.write(['EURUSD', i])
+    writer.close()
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ['symbol', 'value']
+    assert [int(r[1]) for r in rows[1:]] == list(range(25))
+    assert writer.stats()['written'] == 25
+    assert writer.stats()['dropped'] == 0
+    # Dopo close() le righe sono rifiutate, non accodate a un thread fermo
+    assert not writer.write(['EURUSD', 99])
+    assert writer.stats()['dropped_closed'] == 1 and writer.stats()['queue_depth'] == 0
+
+def test_writer_scarta_senza_bloccare_se_coda_piena(tmp_path):
+    writer = AsyncCSVWriter(str(tmp_path / 'x.csv'), ['v'], queue_size=2)
+    writer._ensure_started = lambda: None  # Nessun thread: la coda non viene consumata
+    results = [writer.write([i]) for i in range(5)]
+    assert results == [True, True, False, False, False]
+    assert writer.stats()['dropped'] == 3
+
+def test_writer_ruota_file_oltre_dimensione_massima(tmp_path):
+    path = str(tmp_path / 'rot.csv')
+    writer = AsyncCSVWriter(path, ['v'], batch_size=1, flush_interval=0.01, max_size_mb=0.0001)
+    for i in range(200):
+        writer.write(['x' * 20])
+    writer.close()
+    assert writer.stats()['rotations'] >= 1
+    assert len(os.listdir(tmp_path)) >= 2
+
+def test_formato_astratto_e_thread_con_nome_del_writer(tmp_path):
+    from utils.signal_journal import SignalJournalWriter
+    with pytest.raises(TypeError):
+        AsyncBatchWriter(str(tmp_path / 'x.bin'))
+    journal = SignalJournalWriter(str(tmp_path / 'signals_journal.bin'))
+    journal.record('EURUSD', 1.1, 0.5, 0.1, 0.6, 'HOLD', ts=1.0)
+    assert journal._thread.name == 'journal-writer-signals_journal.bin'
+    journal.close()
@@ -0,0 +1,84 @@
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.simulated_mt5 import SimulatedMT5, TICKS_DTYPE
+from core.backtest_engine import BacktestEngine, BacktestTrade, _TickSeries, EXIT_TRAILING, EXIT_TIMEOUT, EXIT_TP
+
+T0 = 1700006400000
+CONFIG = {
+    'symbols': {'EURUSD': {}},
+    'initial_balance': 10000,
+    'quantum_params': {'buffer_size': 60, 'spin_window': 20, 'min_spin_samples': 10, 'signal_cooldown': 30},
+    'risk_parameters': {'position_cooldown': 30, 'max_daily_trades': 20, 'max_positions': 1, 'risk_percent': 0.01,
+                        'stop_loss_pips': 80, 'profit_multiplier': 2.0, 'max_spread': 20,
+                        'trailing_stop': {'enable': True, 'activation_pips': 60, 'distance_pips': 40},
+                        'position_timeout_hours': 1},
+}
+
+
+def _ticks(prices, step_ms=500, spread=1e-5):
+    arr = np.empty(len(prices), dtype=TICKS_DTYPE)
+    arr['time_msc'] = T0 + np.arange(len(prices)) * step_ms
+    arr['bid'] = np.round(np.asarray(prices) - spread / 2, 6)
+    arr['ask'] = np.round(np.asarray(prices) + spread / 2, 6)
+    return arr
+
+
+def test_vettoriale_identico_al_replay_di_process_tick_e_get_signal():
+    rng = np.random.default_rng(3)
+    steps = rng.choice([-1, 0, 1], 6000, p=[0.3, 0.4, 0.3]) * 1e-5 + np.repeat(rng.choice([-3e-6, 0, 3e-6], 6), 1000)
+    backtest = BacktestEngine(SimulatedMT5({'EURUSD': _ticks(1.1 + np.cumsum(steps))}, speed=0))
+    vectorized = backtest.run(CONFIG)
+    replay = backtest.run(CONFIG, mode='replay')
+    assert vectorized.n_trades > 0
+    assert vectorized.trades == replay.trades
+    assert vectorized.net_profit == replay.net_profit
+    assert vectorized.max_drawdown >= 0
+    assert vectorized.equity_curve[-1] == vectorized.final_balance
+
+
+def test_uscita_su_trailing_tp_e_timeout():
+    # BUY a 1.10005: il prezzo sale di 8 pip (trailing attivo a 6, distanza 4) poi ritraccia
+    prices = [1.1000, 1.1003, 1.1008, 1.1007, 1.1003, 1.1000]
+    series = _TickSeries(_ticks(prices))
+    trailing = {'enable': True, 'activation_pips': 6, 'distance_pips': 4}
+    idx, price, reason, sl = BacktestEngine._find_exit(series, 0, len(prices), 1, 1.10005, 1.0990, 1.1020, 1e-4, trailing, 3600e3)
+    assert reason == EXIT_TRAILING and idx == 4 and sl == round(1.1008 - 5e-6 - 4e-4, 10)
+    assert price == series.bid[4]
+    idx, _, reason, _ = BacktestEngine._find_exit(series, 0, len(prices), 1, 1.10005, 1.0990, 1.1006, 1e-4, {}, 3600e3)
+    assert (idx, reason) == (2, EXIT_TP)
+    idx, _, reason, _ = BacktestEngine._find_exit(series, 0, len(prices), -1, 1.09995, 1.1100, 1.0900, 1e-4, {}, 1200)
+    assert (idx, reason) == (3, EXIT_TIMEOUT)
+
+
+def test_statistiche_risultato():
+    trades = [BacktestTrade('EURUSD', 'BUY', T0, T0 + 3, 1.1, 1.101, 0, 0, 1.0, 10, profit, 'tp')
+              for profit in (100.0, -50.0, -100.0, 200.0)]
+    result = BacktestEngine._result(trades, 1000.0, 10, 0.0)
+    assert result.net_profit == 150.0 and result.final_balance == 1150.0
+    assert result.max_drawdown == 150.0
+    assert result.win_rate == 0.5 and result.profit_factor == 2.0
+
+
+def test_backtest_non_tocca_backend_e_registry_del_processo():
+    from core.mt5_backend import get_backend, set_backend
+    from core.symbol_registry import symbol_registry
+    live_config = {'symbols': {'EURUSD': {'risk_management': {'pip_size': 0.0001}}}}
+    previous_config = symbol_registry.config
+    live_backend = SimulatedMT5({'EURUSD': _ticks(1.2 + np.zeros(10))}, speed=0)
+    previous_backend = set_backend(live_backend)
+    symbol_registry.configure(live_config)
+    try:
+        symbol_registry.refresh(['EURUSD'])
+        live_meta = symbol_registry.all()
+        backtest = BacktestEngine(SimulatedMT5({'EURUSD': _ticks(1.1 + np.zeros(200))}, speed=0))
+        backtest.run(CONFIG)
+        backtest.run(CONFIG, mode='replay')
+        # Il backtest usa simulatore e registry propri: backend, config e cache condivisi intatti
+        assert symbol_registry.config is live_config
+        assert symbol_registry.all() is live_meta and 'EURUSD' in live_meta
+        assert get_backend() is live_backend
+    finally:
+        set_backend(previous_backend)
+        symbol_registry.configure(previous_config)
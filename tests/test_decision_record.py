@@ -0,0 +1,43 @@
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.quantum_engine import QuantumEngine
+import core.quantum_trading_system as qts
+from utils.decision_report import DecisionReportSink
+
+class WriterMemoria:
+    def __init__(self):
+        self.rows = []
+    def write(self, row):
+        self.rows.append(row)
+        return True
+    def stats(self):
+        return {}
+
+def test_decisione_riusa_la_valutazione_del_ciclo(monkeypatch):
+    engine = QuantumEngine({"symbols": {"EURUSD": {}}, "quantum_params": {"buffer_size": 50, "min_spin_samples": 5},
+                            "logging": {"signal_log_format": "none"}})
+    for i in range(20):
+        engine.process_tick("EURUSD", 1.1 + (i % 3) * 0.0001)
+    engine.get_signals(["EURUSD"])
+    evaluation = engine.get_last_evaluation("EURUSD")
+    assert evaluation.buffer_size == 20
+
+    writer = WriterMemoria()
+    monkeypatch.setattr(qts, 'get_decision_report', lambda: DecisionReportSink(writer))
+    # Se la diagnostica ricalcolasse le metriche chiamerebbe di nuovo l'engine
+    monkeypatch.setattr(engine, 'calculate_spin', lambda symbol: pytest.fail("metriche ricalcolate"))
+    system = object.__new__(qts.QuantumTradingSystem)
+    system.engine = engine
+    system.last_decisions = {}
+    tick = SimpleNamespace(bid=1.1, ask=1.1002)
+    record = system._record_decision("EURUSD", tick, 0, 'trading_hours', "Motivo: fuori orario di trading")
+
+    assert record.evaluation is evaluation
+    assert system.last_decisions["EURUSD"] is record
+    with pytest.raises(AttributeError):
+        record.gate = 'ok'
+    assert writer.rows[0][1:4] == ['EURUSD', 'trading_hours', "Motivo: fuori orario di trading"]
+    assert f"Confidence: {evaluation.confidence:.3f}" in writer.rows[0][4]
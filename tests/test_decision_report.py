@@ -0,0 +1,38 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from utils.decision_report import DecisionReportSink
+
+class WriterMemoria:
+    def __init__(self):
+        self.rows = []
+    def write(self, row):
+        self.rows.append(row)
+        return True
+    def stats(self):
+        return {}
+
+def test_motivi_consecutivi_invariati_accorpati_per_simbolo(monkeypatch):
+    import utils.decision_report as decision_report
+    now = [1000.0]
+    monkeypatch.setattr(decision_report.time, 'time', lambda: now[0])
+    writer = WriterMemoria()
+    sink = DecisionReportSink(writer, repeat_interval=300)
+    for _ in range(50):
+        sink.write('EURUSD', 'signal', 'HOLD', 'Confidence: 0.1')
+        sink.write('GBPUSD', 'trading_hours', 'fuori orario')
+        now[0] += 0.5
+    assert [r[1:3] for r in writer.rows] == [['EURUSD', 'signal'], ['GBPUSD', 'trading_hours']]
+    assert sink.suppressed == 98
+    sink.write('EURUSD', 'has_position', 'posizione aperta')
+    # Il cambio di motivo riporta prima le ripetizioni soppresse del motivo precedente
+    assert [r[1:] for r in writer.rows[-2:]] == [['EURUSD', 'signal', 'HOLD', 'ripetuto 49 volte'],
+                                                 ['EURUSD', 'has_position', 'posizione aperta', '']]
+    now[0] += 400
+    sink.write('GBPUSD', 'trading_hours', 'fuori orario')
+    assert writer.rows[-1][4] == 'ripetuto 49 volte'
+    assert len(writer.rows) == 5
+    sink.write('GBPUSD', 'trading_hours', 'fuori orario')
+    sink.reset()
+    assert writer.rows[-1][1:] == ['GBPUSD', 'trading_hours', 'fuori orario', 'ripetuto 1 volte']
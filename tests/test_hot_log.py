@@ -0,0 +1,31 @@
+import pytest
+import logging
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from utils.hot_log import HotPathLogger
+
+class ContaFormattazioni:
+    def __init__(self):
+        self.count = 0
+    def __str__(self):
+        self.count += 1
+        return "x"
+
+def test_hot_log_formatta_solo_se_emesso(caplog):
+    hot = HotPathLogger(logging.getLogger("phoenix_quantum.test_hot"))
+    valore = ContaFormattazioni()
+    with caplog.at_level(logging.INFO, logger="phoenix_quantum.test_hot"):
+        hot.debug("TICK", symbol="EURUSD", valore=valore)
+        assert valore.count == 0
+        hot.info("SIZE", symbol="EURUSD", size=0.12345678)
+    assert caplog.messages == ["[SIZE] symbol=EURUSD size=0.123457"]
+
+def test_hot_log_profilo_quiet(caplog):
+    hot = HotPathLogger(logging.getLogger("phoenix_quantum.test_quiet"))
+    hot.configure('quiet')
+    with caplog.at_level(logging.DEBUG, logger="phoenix_quantum.test_quiet"):
+        hot.info("LEVELS", symbol="EURUSD")
+        hot.warning("SIZE", symbol="EURUSD")
+        hot.record(logging.INFO, "HEARTBEAT", symbol="EURUSD")
+    assert caplog.messages == ["[SIZE] symbol=EURUSD", "[HEARTBEAT] symbol=EURUSD"]
@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.mt5_snapshot import MT5Snapshot
+
+
+class FakeMT5:
+    def __init__(self):
+        self.calls = {'positions_get': 0, 'account_info': 0, 'symbol_info': 0}
+        self.positions = (
+            SimpleNamespace(ticket=1, symbol='EURUSD'),
+            SimpleNamespace(ticket=2, symbol='XAUUSD'),
+        )
+
+    def positions_get(self):
+        self.calls['positions_get'] += 1
+        return self.positions
+
+    def account_info(self):
+        self.calls['account_info'] += 1
+        return SimpleNamespace(equity=10000.0, margin_free=9000.0)
+
+    def symbol_info(self, symbol):
+        self.calls['symbol_info'] += 1
+        return SimpleNamespace(name=symbol, point=0.0001, bid=1.1, ask=1.1002)
+
+
+def test_un_solo_fetch_per_ciclo():
+    client = FakeMT5()
+    snapshot = MT5Snapshot(client=client, max_age=60)
+    snapshot.refresh(['EURUSD', 'XAUUSD'])
+    for _ in range(5):
+        assert len(snapshot.positions_get()) == 2
+        assert snapshot.positions_get(symbol='EURUSD')[0].ticket == 1
+        assert snapshot.positions_get(ticket=2)[0].symbol == 'XAUUSD'
+        assert snapshot.positions_get(symbol='GBPUSD') == ()
+        assert snapshot.account_info().equity == 10000.0
+        assert snapshot.symbol_info('EURUSD').name == 'EURUSD'
+    assert client.calls == {'positions_get': 1, 'account_info': 1, 'symbol_info': 2}
+
+
+def test_invalidate_dopo_ordine_rilegge_posizioni():
+    client = FakeMT5()
+    snapshot = MT5Snapshot(client=client, max_age=60)
+    snapshot.refresh(['EURUSD'])
+    client.positions = client.positions[:1]
+    assert len(snapshot.positions_get()) == 2
+    snapshot.invalidate()
+    assert len(snapshot.positions_get()) == 1
+    snapshot.symbol_info('EURUSD')
+    assert client.calls['positions_get'] == 2
+    assert client.calls['symbol_info'] == 1
+
+
+def test_dato_scaduto_viene_riletto_senza_refresh():
+    client = FakeMT5()
+    snapshot = MT5Snapshot(client=client, max_age=0.05)
+    snapshot.account_info()
+    snapshot.account_info()
+    time.sleep(0.1)
+    snapshot.account_info()
+    assert client.calls['account_info'] == 2
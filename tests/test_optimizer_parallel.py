@@ -0,0 +1,31 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../backtest_mono'))
+from autonomous_challenge_optimizer import AutonomousHighStakesOptimizer, PARAM_GRID_KEYS
+
+
+def test_pool_stesso_esito_della_ricerca_seriale(tmp_path):
+    serial = AutonomousHighStakesOptimizer(tick_archive=str(tmp_path), result_cache=False, workers=1)
+    parallel = AutonomousHighStakesOptimizer(tick_archive=str(tmp_path), result_cache=False, workers=2, chunk_size=500)
+    try:
+        expected = {symbol: serial.run_parameter_optimization(symbol, 14, 'position') for symbol in ('EURUSD', 'XAUUSD')}
+        assert parallel.run_parameter_optimization_batch(['EURUSD', 'XAUUSD'], 14, 'position') == expected
+    finally:
+        parallel.close()
+    assert set(expected['EURUSD']) == set(PARAM_GRID_KEYS) | {'score'}
+
+
+def test_unita_di_lavoro_deterministica(tmp_path):
+    optimizer = AutonomousHighStakesOptimizer(tick_archive=str(tmp_path), result_cache=False, workers=1)
+    combos = [(0.01, 2, 150, 300, 0.7, 0.5), (0.012, 1, 120, 400, 0.65, 0.35)]
+    first = optimizer.evaluate_work_unit('EURUSD', 30, 'position', 3, combos)
+    assert first == optimizer.evaluate_work_unit('EURUSD', 30, 'position', 3, combos)
+    assert first[0] == 'EURUSD' and first[1] == 3 and len(first[2]) == 2
+
+
+def test_default_seriale_senza_pool(tmp_path):
+    optimizer = AutonomousHighStakesOptimizer(tick_archive=str(tmp_path), result_cache=False)
+    assert optimizer.workers == 1
+    optimizer.run_parameter_optimization('EURUSD', 14, 'position')
+    assert optimizer._executor is None
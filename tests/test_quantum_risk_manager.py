@@ -0,0 +1,35 @@
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.simulated_mt5 import SimulatedMT5, TICKS_DTYPE, ORDER_TYPE_BUY
+from core.symbol_registry import SymbolRegistry
+from core.quantum_engine import QuantumEngine
+from core.quantum_risk_manager import QuantumRiskManager
+
+
+def _risk_manager(config):
+    ticks = np.zeros(10, dtype=TICKS_DTYPE)
+    ticks['time_msc'] = 1700006400000 + np.arange(10) * 500
+    ticks['bid'], ticks['ask'] = 1.1, 1.10002
+    backend = SimulatedMT5({'EURUSD': ticks}, speed=0)
+    registry = SymbolRegistry(client=backend)
+    registry.configure(config)
+    engine = QuantumEngine(config, registry=registry, client=backend)
+    return QuantumRiskManager(config, engine, registry=registry, client=backend)
+
+
+def test_livelli_con_sezione_trailing_stop_annidata():
+    # La sezione trailing_stop è un dict: va letta per intero (globale + override del simbolo),
+    # non ridotta al primo valore numerico (enable=True), che azzerava SL/TP
+    config = {
+        'symbols': {'EURUSD': {'risk_management': {'trailing_stop': {'tp_percentage': 0.25}}}},
+        'logging': {'signal_log_format': 'none'},
+        'risk_parameters': {'stop_loss_pips': 80, 'profit_multiplier': 2.0,
+                            'trailing_stop': {'enable': True, 'activation_mode': 'percent_tp', 'tp_percentage': 0.5}},
+    }
+    risk_manager = _risk_manager(config)
+    sl, tp = risk_manager.calculate_dynamic_levels('EURUSD', ORDER_TYPE_BUY, 1.1)
+    assert sl < 1.1 < tp
+    tp_pips = int(round((tp - 1.1) / risk_manager.engine._get_pip_size('EURUSD')))
+    assert risk_manager._last_trailing_activation_pips == int(round(tp_pips * 0.25))
@@ -21,3 +21,68 @@ def test_buffer_popolazione():
     buffer = engine.get_tick_buffer(symbol)
     assert len(buffer) == len(prezzi_test), f"Il buffer non contiene il numero atteso di tick! ({len(buffer)} invece di {len(prezzi_test)})"
     assert [t['price'] for t in buffer] == prezzi_test, "I prezzi nel buffer non corrispondono ai tick inseriti!"
+
+def test_entropy_streaming_equivale_a_riferimento():
+    import random
+    import numpy as np
+    config_dict = {
+        "symbols": {"EURUSD": {}},
+        "quantum_params": {"buffer_size": 50, "spin_window": 20}
+    }
+    engine = QuantumEngine(config_dict)
+    rng = random.Random(7)
+    prezzo = 1.1000
+    for _ in range(400):
+        prezzo += rng.choice([-2, -1, 0, 0, 1, 3]) * 0.0001
+        engine.process_tick("EURUSD", prezzo)
+        deltas = engine.get_tick_buffer("EURUSD").deltas(engine.spin_window)
+        deltas = tuple(deltas[np.abs(deltas) > 1e-10].tolist())
+        if len(deltas) < 2:
+            # Con una sola delta il riferimento dipende dall'epsilon 1e-10: caso degenere escluso
+            continue
+        riferimento = QuantumEngine.calculate_entropy(deltas)
+        assert engine.get_entropy("EURUSD") == pytest.approx(riferimento, abs=1e-6)
+
+def test_get_signals_batch_coerente_con_get_signal():
+    config_dict = {
+        "symbols": {"EURUSD": {}, "GBPUSD": {}, "USDJPY": {}},
+        "quantum_params": {"buffer_size": 50, "spin_window": 20, "min_spin_samples": 5, "signal_cooldown": 0},
+        "logging": {"signal_log_format": "none"}
+    }
+    engine = QuantumEngine(config_dict)
+    passi = {"EURUSD": 0.0001, "GBPUSD": -0.0001, "USDJPY": 0.0}
+    for i in range(30):
+        for symbol, passo in passi.items():
+            engine.process_tick(symbol, 1.1 + passo * i + (0.00005 if i % 7 == 0 else 0.0))
+    engine.process_tick("USDJPY", 150.0)
+    batch = engine.get_signals(list(passi))
+    for symbol in passi:
+        assert batch[symbol] == engine.get_signal(symbol)
+    assert batch["EURUSD"][0] in ("BUY", "HOLD")
+    assert batch["GBPUSD"][0] in ("SELL", "HOLD")
+
+def test_process_tick_ignora_tick_con_stesso_time_msc():
+    engine = QuantumEngine({"symbols": {"EURUSD": {}}, "quantum_params": {"buffer_size": 10}})
+    assert engine.process_tick("EURUSD", 1.1000, time_msc=1000)
+    assert not engine.process_tick("EURUSD", 1.1000, time_msc=1000)
+    assert engine.process_tick("EURUSD", 1.1003, time_msc=1001)
+    assert len(engine.get_tick_buffer("EURUSD")) == 2
+
+def test_ingest_ticks_backfill_batch_senza_duplicati():
+    engine = QuantumEngine({"symbols": {"EURUSD": {}}, "quantum_params": {"buffer_size": 10}})
+    engine.process_tick("EURUSD", 1.1000, time_msc=1000)
+    inserted = engine.ingest_ticks("EURUSD", [1.0999, 1.1000, 1.1001, 1.1002], [999, 1000, 1001, 1002])
+    assert inserted == 2
+    assert engine.get_last_time_msc("EURUSD") == 1002
+    assert [t['price'] for t in engine.get_tick_buffer("EURUSD")] == [1.1000, 1.1001, 1.1002]
+    assert list(engine.get_tick_buffer("EURUSD").directions()) == [0, 1, 1]
+    assert not engine.process_tick("EURUSD", 1.1002, time_msc=1002)
+
+def test_coalesce_unchanged_ticks_non_riempie_il_buffer():
+    engine = QuantumEngine({"symbols": {"EURUSD": {}}, "quantum_params": {"buffer_size": 10, "coalesce_unchanged_ticks": True}})
+    for prezzo in [1.1000, 1.1000, 1.1000, 1.1002, 1.1002, 1.1001]:
+        engine.process_tick("EURUSD", prezzo)
+    buffer = engine.get_tick_buffer("EURUSD")
+    assert [t['price'] for t in buffer] == [1.1000, 1.1002, 1.1001]
+    assert list(buffer.repeats()) == [2, 1, 0]
+    assert engine.get_spin_stats("EURUSD").zero == 1  # Solo il primo tick senza delta
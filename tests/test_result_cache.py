@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../backtest_mono'))
+from result_cache import BacktestResultCache
+from autonomous_challenge_optimizer import AutonomousHighStakesOptimizer
+
+
+def test_chiave_completa_della_cache(tmp_path):
+    cache = BacktestResultCache(str(tmp_path / 'cache.sqlite'))
+    combos = [(0.01, 2, 150, 300, 0.7, 0.5), (0.012, 1, 120, 400, 0.65, 0.35)]
+    cache.store('EURUSD', 'position', 30, 'data1', 'code1', combos, [12.5, 7.0])
+    assert cache.lookup('EURUSD', 'position', 30, 'data1', 'code1', combos) == {combos[0]: 12.5, combos[1]: 7.0}
+    assert cache.lookup('EURUSD', 'position', 30, 'data1', 'code2', combos) == {}
+    assert cache.lookup('EURUSD', 'position', 14, 'data1', 'code1', combos) == {}
+    assert cache.lookup('EURUSD', 'position', 30, 'data2', 'code1', combos) == {}
+    assert cache.lookup('GBPUSD', 'position', 30, 'data1', 'code1', combos) == {}
+    cache.close()
+
+
+def test_run_ripetuto_e_incrementale_valuta_solo_combinazioni_nuove(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    first = AutonomousHighStakesOptimizer(tick_archive=str(tmp_path), workers=1, result_cache=path)
+    expected = first.run_parameter_optimization('EURUSD', 14, 'position')
+    first.close()
+
+    calls = []
+    second = AutonomousHighStakesOptimizer(tick_archive=str(tmp_path), workers=1, result_cache=path)
+    evaluate = second.evaluate_work_unit
+    second.evaluate_work_unit = lambda *unit: calls.append(unit) or evaluate(*unit)
+    assert second.run_parameter_optimization('EURUSD', 14, 'position') == expected
+    assert calls == []
+    second.run_parameter_optimization('EURUSD', 21, 'position')
+    assert calls and all(unit[1] == 21 for unit in calls)
+    second.close()
+
+
+def test_cache_disattivata_per_default(tmp_path):
+    import autonomous_challenge_optimizer
+    optimizer = AutonomousHighStakesOptimizer(tick_archive=str(tmp_path))
+    assert optimizer.result_cache is None
+    optimizer.run_parameter_optimization('EURUSD', 14, 'position')
+    optimizer.close()
+    assert not os.path.exists(autonomous_challenge_optimizer.DEFAULT_RESULT_CACHE_PATH)
@@ -0,0 +1,33 @@
+import pytest
+import random
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.rolling_stats import RollingSpinStats
+
+def brute_force_spin(directions):
+    # Stessa logica di QuantumEngine._calculate_spin_impl sulla finestra completa
+    if len(directions) < 5:
+        return 0.0, 0.0
+    positive = sum(1 for d in directions if d > 0)
+    negative = sum(1 for d in directions if d < 0)
+    total = positive + negative
+    if total < 3:
+        return 0.0, 0.0
+    return (positive - negative) / total, min(1.0, abs(positive - negative) / total * np.sqrt(total))
+
+def test_rolling_spin_matches_full_rescan():
+    rng = random.Random(42)
+    window = 20
+    stats = RollingSpinStats(window)
+    history = []
+    for _ in range(500):
+        direction = rng.choice([-1, 0, 1, 1])
+        stats.push(direction)
+        history.append(direction)
+        spin, confidence = stats.spin()
+        expected_spin, expected_conf = brute_force_spin(history[-window:])
+        assert spin == pytest.approx(expected_spin)
+        assert confidence == pytest.approx(expected_conf)
+    assert stats.up + stats.down + stats.zero == window
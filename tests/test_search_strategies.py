@@ -0,0 +1,58 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../backtest_mono'))
+from search_strategies import create_search_strategy
+from autonomous_challenge_optimizer import AutonomousHighStakesOptimizer
+
+SPACE = {'a': list(range(10)), 'b': list(range(10)), 'c': [0, 1, 2]}
+
+
+def _score(combo, days):
+    # Ottimo in (7, 3, 2); le finestre corte vedono lo stesso score con un po' di rumore
+    return -abs(combo[0] - 7) - abs(combo[1] - 3) + combo[2] + (0.1 * (combo[0] % 2) if days < 27 else 0)
+
+
+def _run(strategy):
+    while True:
+        asked = strategy.ask()
+        if not asked:
+            return strategy.result()
+        strategy.tell(asked, [_score(combo, days) for combo, days in asked])
+
+
+def test_strategie_rispettano_budget_e_trovano_buone_combinazioni():
+    for name in ('random', 'halving', 'hyperband', 'tpe'):
+        result = _run(create_search_strategy(name, SPACE, 27, budget=60, seed=1, batch_size=8))
+        assert result.budget_used <= 60 + 1e-9
+        assert result.stop_reason in ('budget', 'exhausted')
+        assert result.best_params is not None and result.best_score >= -3, name
+        assert all(days in (1, 3, 9, 27) for _, days, _ in result.trials)
+    grid = _run(create_search_strategy('grid', SPACE, 27))
+    assert grid.evaluations == 300 and grid.best_params == (7, 3, 2)
+
+
+def test_patience_ferma_la_ricerca():
+    result = _run(create_search_strategy('random', SPACE, 27, patience=10, seed=2, batch_size=1))
+    assert result.stop_reason == 'patience' and result.evaluations < 300
+
+
+def test_optimizer_con_budget(tmp_path):
+    optimizer = AutonomousHighStakesOptimizer(tick_archive=str(tmp_path), result_cache=False, workers=1, search='hyperband', search_budget=50)
+    params = optimizer.run_parameter_optimization('EURUSD', 27, 'position')
+    result = optimizer.search_results['EURUSD']
+    assert result.budget_used <= 50 + 1e-9 and result.evaluations > 50
+    assert params['score'] == result.best_score
+
+
+def test_budget_piccolo_ripiega_sulla_finestra_piu_lunga(tmp_path):
+    optimizer = AutonomousHighStakesOptimizer(tick_archive=str(tmp_path), result_cache=False, workers=1,
+                                              search='halving', search_budget=3)
+    params = optimizer.run_parameter_optimization('EURUSD', 30, 'position')
+    result = optimizer.search_results['EURUSD']
+    assert result.best_days < 30 and params['score'] == result.best_score
+    assert 'stop_loss_pips' in params
+    assert optimizer.optimize_symbol_parameters('EURUSD', 'moderate', 'position')
+    with pytest.raises(ValueError):
+        AutonomousHighStakesOptimizer(tick_archive=str(tmp_path), search='halving', search_budget=0.5)
@@ -0,0 +1,45 @@
+import pytest
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/../backtest_mono'))
+from utils.shared_ticks import SharedTickStore, open_shared
+from utils.tick_archive import TickArchiveWriter
+from autonomous_challenge_optimizer import AutonomousHighStakesOptimizer
+
+T0 = 1700006400000
+
+
+def test_dataset_pubblicato_aperto_in_sola_lettura():
+    store = SharedTickStore()
+    data = np.arange(10, dtype=np.float64)
+    view = open_shared(store.publish('EURUSD', data))
+    assert isinstance(view, np.memmap) and not view.flags.writeable
+    assert np.array_equal(view, data)
+    with pytest.raises(ValueError):
+        view[0] = 1.0
+    store.close()
+    assert not os.path.exists(store.directory)
+
+
+def test_worker_su_dataset_condiviso_stessi_score_dell_archivio(tmp_path):
+    root = str(tmp_path / 'ticks')
+    writer = TickArchiveWriter(root, batch_size=500, flush_interval=0.05)
+    prices = 1.1 + np.cumsum(np.random.default_rng(5).choice([-1, 0, 1], 3000) * 1e-5)
+    for i, price in enumerate(prices):
+        writer.record('EURUSD', T0 + i * 1000, round(price, 5), round(price + 1e-5, 5))
+    writer.close()
+    combos = [(0.01, 2, 150, 300, 0.7, 0.5), (0.012, 1, 120, 400, 0.65, 0.35)]
+    serial = AutonomousHighStakesOptimizer(tick_archive=root, result_cache=False, workers=1)
+    main = AutonomousHighStakesOptimizer(tick_archive=root, result_cache=False, workers=2)
+    worker = AutonomousHighStakesOptimizer(tick_archive=root, result_cache=False, workers=1)
+    try:
+        dataset = main._shared_dataset('EURUSD')
+        assert dataset and main._shared_dataset('EURUSD') == dataset
+        assert worker.evaluate_work_unit('EURUSD', 1, 'position', 0, combos, dataset) == \
+            serial.evaluate_work_unit('EURUSD', 1, 'position', 0, combos)
+        assert not worker._backtests['EURUSD'].backend.tick_data('EURUSD').flags.writeable
+    finally:
+        main.close()
+    assert not os.path.exists(dataset)
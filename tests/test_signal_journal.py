@@ -0,0 +1,79 @@
+import pytest
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from utils.signal_journal import (
+    SignalJournalWriter, HoldAggregator, read_signal_journal, load_signal_journals, SIGNAL_CODES, REASON_CODES
+)
+
+def test_journal_scrittura_e_lettura_tipizzata(tmp_path):
+    path = str(tmp_path / 'signals_journal.bin')
+    journal = SignalJournalWriter(path, flush_interval=0.05)
+    journal.record('EURUSD', 1.1, 0.6, 0.4, 0.9, 'BUY', 'Condizioni BUY', ts=100.0)
+    journal.record('GBPUSD', 1.3, 0.0, 0.1, 0.2, 'HOLD', 'Confidence troppo bassa', ts=101.0)
+    journal.record('EURUSD', 1.2, 0.5, 0.0, 0.0, 'HOLD', 'Motivo sconosciuto', ts=102.0)
+    journal.close()
+    records = read_signal_journal(path)
+    assert len(records) == 3
+    assert records['symbol'].tolist() == [b'EURUSD', b'GBPUSD', b'EURUSD']
+    assert records['price'].tolist() == [1.1, 1.3, 1.2]
+    assert [SIGNAL_CODES[c] for c in records['signal']] == ['BUY', 'HOLD', 'HOLD']
+    assert [REASON_CODES[c] for c in records['reason']] == ['Condizioni BUY', 'Confidence troppo bassa', 'Altro']
+    eurusd = load_signal_journals(str(tmp_path), start=101.0, symbols=['EURUSD'])
+    assert eurusd['ts'].tolist() == [102.0]
+
+def test_journal_file_non_valido(tmp_path):
+    path = tmp_path / 'signals_journal.bin'
+    path.write_bytes(b'timestamp,symbol\n')
+    with pytest.raises(ValueError):
+        read_signal_journal(str(path))
+
+def test_hold_aggregator_un_riepilogo_per_simbolo_motivo_intervallo():
+    rows = []
+    aggregator = HoldAggregator(rows.append, interval=60)
+    for i in range(100):
+        aggregator.add('EURUSD', 'Confidence troppo bassa', 0.1 + i / 1000, 1.1, ts=1000.0 + i * 0.5)
+    aggregator.add('GBPUSD', 'Buffer tick insufficiente', 0.0, 0.0, ts=1010.0)
+    assert rows == []
+    aggregator.add('EURUSD', 'Confidence troppo bassa', 0.5, 1.2, ts=1061.0)  # Nuovo intervallo
+    assert len(rows) == 2
+    eurusd = next(r for r in rows if r[2] == 'EURUSD')
+    assert eurusd[4] == 100
+    assert eurusd[5] == 0.1 and eurusd[6] == 0.199
+    aggregator.flush()
+    assert len(rows) == 3 and rows[-1][4] == 1
+
+@pytest.mark.skipif(not hasattr(__import__('time'), 'tzset'), reason="tzset non disponibile")
+def test_dataframe_orario_locale_per_record_con_ora_legale(monkeypatch):
+    import time
+    import datetime
+    pytest.importorskip('pandas')
+    from utils.signal_journal import JOURNAL_DTYPE, journal_to_dataframe
+    monkeypatch.setenv('TZ', 'Europe/Rome')
+    time.tzset()
+    try:
+        records = np.zeros(2, dtype=JOURNAL_DTYPE)
+        records['ts'] = [1711843200.0, 1711854000.0]  # 31/03/2024 00:00 e 03:00 UTC: prima e dopo l'ora legale
+        timestamps = journal_to_dataframe(records)['timestamp'].tolist()
+        assert [t.to_pydatetime() for t in timestamps] == [datetime.datetime.fromtimestamp(ts) for ts in records['ts']]
+        assert [t.hour for t in timestamps] == [1, 5]
+    finally:
+        monkeypatch.delenv('TZ')
+        time.tzset()
+
+
+def test_engine_scrive_solo_il_journal_per_default(monkeypatch):
+    import core.quantum_engine as quantum_engine
+    records = []
+
+    class JournalMemoria:
+        def record(self, *args):
+            records.append(args)
+            return True
+    monkeypatch.setattr(quantum_engine, 'get_signal_journal', JournalMemoria)
+    monkeypatch.setattr(quantum_engine, 'log_signal_tick', lambda *a, **k: pytest.fail("riga CSV scritta senza opt-in"))
+    engine = quantum_engine.QuantumEngine({'symbols': {'EURUSD': {}}})
+    assert engine.signal_log_format == 'journal'
+    engine._log_signal('EURUSD', 1.1, 0.5, 0.2, 0.9, 'BUY', 'Condizioni BUY')
+    assert len(records) == 1
@@ -0,0 +1,104 @@
+import sys
+import os
+import csv
+import time
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.mt5_backend import mt5, set_backend
+from core.simulated_mt5 import SimulatedMT5, TRADE_RETCODE_DONE
+
+
+def _write_ticks(path, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['time_msc', 'symbol', 'bid', 'ask'])
+        writer.writerows(rows)
+
+
+def _cycle_tick(sim, symbol):
+    sim.begin_cycle()
+    return sim.symbol_info_tick(symbol)
+
+
+def test_replay_massima_velocita_un_tick_per_ciclo(tmp_path):
+    path = str(tmp_path / 'ticks.csv')
+    _write_ticks(path, [(1000, 'EURUSD', 1.1000, 1.1002), (1250, 'EURUSD', 1.1001, 1.1003), (1500, 'EURUSD', 1.1002, 1.1004)])
+    sim = SimulatedMT5.from_files([path], speed=0)
+    assert [_cycle_tick(sim, 'EURUSD').time_msc for _ in range(4)] == [1000, 1250, 1500, 1500]
+    assert sim.finished
+    assert sim.symbol_info_tick('GBPUSD') is None
+
+
+def test_ordine_e_chiusura_su_take_profit(tmp_path):
+    path = str(tmp_path / 'ticks.csv')
+    _write_ticks(path, [(1000, 'EURUSD', 1.1000, 1.1002), (2000, 'EURUSD', 1.1050, 1.1052)])
+    sim = SimulatedMT5.from_files([path], speed=0, initial_balance=10000.0)
+    sim.symbol_info_tick('EURUSD')
+    result = sim.order_send({'action': sim.TRADE_ACTION_DEAL, 'symbol': 'EURUSD', 'volume': 0.1,
+                             'type': sim.ORDER_TYPE_BUY, 'sl': 1.0950, 'tp': 1.1040})
+    assert result.retcode == TRADE_RETCODE_DONE
+    assert result.price == 1.1002
+    assert len(sim.positions_get(symbol='EURUSD')) == 1
+    _cycle_tick(sim, 'EURUSD')
+    assert sim.positions_get() == ()
+    assert sim.account_info().balance == round(10000.0 + (1.1050 - 1.1002) * 0.1 * 100000, 2)
+    assert len(sim.history_deals_get(0, 10)) == 2
+
+
+def test_set_backend_vale_per_i_moduli_gia_importati(tmp_path):
+    path = str(tmp_path / 'ticks.csv')
+    _write_ticks(path, [(1000, 'EURUSD', 1.1000, 1.1002)])
+    sim = SimulatedMT5.from_files([path], speed=0)
+    previous = set_backend(sim)
+    try:
+        assert mt5.symbol_info_tick('EURUSD').bid == 1.1000
+        assert mt5.ORDER_TYPE_SELL == 1
+    finally:
+        set_backend(previous)
+
+
+def test_stop_su_tick_saltati_e_copy_ticks_range_senza_avanzare(tmp_path):
+    path = str(tmp_path / 'ticks.csv')
+    _write_ticks(path, [(1000, 'EURUSD', 1.1000, 1.1002), (2000, 'EURUSD', 1.0900, 1.0902), (3000, 'EURUSD', 1.1000, 1.1002)])
+    sim = SimulatedMT5.from_files([path], speed=1000)
+    assert sim.symbol_info_tick('EURUSD').time_msc == 1000
+    sim.order_send({'action': sim.TRADE_ACTION_DEAL, 'symbol': 'EURUSD', 'volume': 0.1,
+                    'type': sim.ORDER_TYPE_BUY, 'sl': 1.0950, 'tp': 1.1100})
+    time.sleep(0.01)
+    assert sim.symbol_info_tick('EURUSD').time_msc == 3000
+    assert sim.positions_get() == ()
+    close = sim.history_deals_get(0, 10)[-1]
+    assert (close.price, close.time_msc) == (1.0900, 2000)
+
+    replay = SimulatedMT5.from_files([path], speed=0)
+    replay.symbol_info_tick('EURUSD')
+    assert len(replay.copy_ticks_range('EURUSD', 0, 10)) == 1
+    assert len(replay.copy_ticks_range('EURUSD', 0, 10)) == 1
+    assert _cycle_tick(replay, 'EURUSD').time_msc == 2000
+
+
+def test_latenza_tick_ordine_in_memoria_costante(tmp_path):
+    path = str(tmp_path / 'ticks.csv')
+    _write_ticks(path, [(1000, 'EURUSD', 1.1000, 1.1002)])
+    sim = SimulatedMT5.from_files([path], speed=0, initial_balance=1e9)
+    sim.symbol_info_tick('EURUSD')
+    for _ in range(500):
+        sim.order_send({'action': sim.TRADE_ACTION_DEAL, 'symbol': 'EURUSD', 'volume': 0.01, 'type': sim.ORDER_TYPE_BUY})
+    stats = sim.stats()
+    assert sim._stats['tick_to_order_count'] == 500
+    assert not any(isinstance(value, list) for value in sim._stats.values())
+    assert 0.0 < stats['tick_to_order_ms_avg'] <= stats['tick_to_order_ms_max']
+
+
+def test_richieste_ripetute_nello_stesso_ciclo_non_saltano_tick(tmp_path):
+    from core.mt5_snapshot import MT5Snapshot
+    path = str(tmp_path / 'ticks.csv')
+    _write_ticks(path, [(1000, 'EURUSD', 1.1000, 1.1002), (2000, 'EURUSD', 1.1001, 1.1003), (3000, 'EURUSD', 1.1002, 1.1004)])
+    sim = SimulatedMT5.from_files([path], speed=0)
+    snapshot = MT5Snapshot(client=sim, max_age=60)
+    seen = []
+    for _ in range(3):
+        # Snapshot, tick del ciclo, tick fresco prima dell'ordine, heartbeat: un solo avanzamento
+        snapshot.refresh(['EURUSD'])
+        seen.append([sim.symbol_info_tick('EURUSD').time_msc for _ in range(3)])
+        assert snapshot.symbol_info('EURUSD').bid == sim.symbol_info_tick('EURUSD').bid
+    assert seen == [[1000] * 3, [2000] * 3, [3000] * 3]
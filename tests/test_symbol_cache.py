@@ -0,0 +1,41 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.symbol_cache import SymbolCache
+
+def test_cache_ttl_e_dimensione_massima(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('core.symbol_cache.time.time', lambda: now[0])
+    cache = SymbolCache(ttl=10, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('c', 3)
+    assert len(cache) == 2
+    assert cache.get('a') is None
+    assert cache.get('c') == 3
+    now[0] += 11
+    assert cache.get('c') is None
+
+def test_get_or_compute_errore_restituisce_default():
+    cache = SymbolCache()
+    def fallisce():
+        raise ValueError("errore")
+    assert cache.get_or_compute(50, fallisce, default=1.0) == 1.0
+    assert len(cache) == 0
+    assert cache.get_or_compute(50, lambda: 1.7, default=1.0) == 1.7
+    assert cache.get_or_compute(50, fallisce, default=1.0) == 1.7
+
+def test_eviction_lru_e_contatori():
+    cache = SymbolCache(ttl=60, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' diventa la più recente
+    cache.set('c', 3)           # esce 'b' (meno usata di recente)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+    assert stats['evictions'] == 1
+    assert stats['entries'] == 2
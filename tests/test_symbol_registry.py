@@ -0,0 +1,47 @@
+import sys
+import os
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.symbol_registry import SymbolRegistry
+
+
+class FakeMT5:
+    def __init__(self):
+        self.calls = 0
+        self.volume_step = 0.01
+
+    def symbol_info(self, symbol):
+        self.calls += 1
+        if symbol == 'MISSING':
+            return None
+        return SimpleNamespace(point=0.00001, digits=5, volume_min=0.01, volume_max=100.0, volume_step=self.volume_step)
+
+
+def test_metadati_caricati_una_volta():
+    client = FakeMT5()
+    registry = SymbolRegistry(client=client)
+    registry.configure({'pip_size_map': {'EURUSD': 0.0001}, 'symbols': {'EURUSD': {'risk_management': {'contract_size': 100000}}}})
+    for _ in range(10):
+        assert registry.point('EURUSD') == 0.00001
+    meta = registry.get('EURUSD')
+    assert meta.pip_size == 0.0001
+    assert meta.contract_size == 100000
+    assert client.calls == 1
+
+
+def test_refresh_rileva_cambiamenti():
+    client = FakeMT5()
+    registry = SymbolRegistry(client=client)
+    registry.refresh(['EURUSD', 'GBPUSD'])
+    assert registry.refresh() == []
+    client.volume_step = 0.1
+    assert registry.refresh() == ['EURUSD', 'GBPUSD']
+    assert registry.get('EURUSD').volume_step == 0.1
+
+
+def test_simbolo_sconosciuto_usa_ripiego_senza_ripetere_chiamate():
+    client = FakeMT5()
+    registry = SymbolRegistry(client=client)
+    assert registry.point('MISSING') == 0.0001
+    assert registry.point('MISSING') == 0.0001
+    assert client.calls == 1
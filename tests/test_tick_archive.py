@@ -0,0 +1,57 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from utils.tick_archive import TickArchiveWriter, TickArchiveFile, archive_files, read_ticks
+from core.quantum_engine import QuantumEngine
+
+DAY_MS = 86400 * 1000
+T0 = 1700006400000  # 2023-11-15 00:00 UTC
+
+
+def test_archivio_per_giorno_e_lettura_per_intervallo(tmp_path):
+    root = str(tmp_path / 'ticks')
+    writer = TickArchiveWriter(root, batch_size=50, flush_interval=0.05)
+    for i in range(200):
+        writer.record('EURUSD', T0 + i * 1000, 1.1 + i * 1e-5, 1.1002 + i * 1e-5, i % 2)
+    writer.record('EURUSD', T0 + DAY_MS + 5, 1.2, 1.2002)
+    writer.close()
+    files = archive_files(root, 'EURUSD')
+    assert [os.path.basename(f) for f in files] == ['2023-11-15.pqt', '2023-11-16.pqt']
+    with TickArchiveFile(files[0]) as archive:
+        assert len(archive) == 200
+        assert len(archive.index) >= 4
+        assert archive.read()['bid'][10] == 1.1 + 10 * 1e-5
+    ticks = read_ticks(root, 'EURUSD', T0 + 150 * 1000, T0 + DAY_MS + 5)
+    assert len(ticks) == 51
+    assert ticks['flags'][0] == 0 and ticks['ask'][-1] == 1.2002
+    assert len(archive_files(root, 'EURUSD', start_msc=T0 + DAY_MS)) == 1
+
+
+def test_chunk_troncato_ignorato(tmp_path):
+    root = str(tmp_path / 'ticks')
+    writer = TickArchiveWriter(root, batch_size=10, flush_interval=0.05)
+    for i in range(20):
+        writer.record('EURUSD', T0 + i, 1.1, 1.1002)
+    writer.close()
+    path = archive_files(root, 'EURUSD')[0]
+    with open(path, 'ab') as f:
+        f.write(b'PQTC\x05')
+    assert len(read_ticks(root, 'EURUSD')) == 20
+    with open(path, 'wb') as f:
+        f.write(b'time_msc,bid\n')
+    with pytest.raises(ValueError):
+        TickArchiveFile(path)
+
+
+def test_engine_registra_solo_tick_non_duplicati(tmp_path):
+    root = str(tmp_path / 'ticks')
+    engine = QuantumEngine({'symbols': {'EURUSD': {}}, 'tick_recorder': {'enabled': True, 'path': root, 'flush_interval': 0.05}})
+    engine.process_tick('EURUSD', 1.1001, T0, 1.1, 1.1002)
+    engine.process_tick('EURUSD', 1.1001, T0, 1.1, 1.1002)
+    engine.process_tick('EURUSD', 1.1002, T0 + 1, 1.1001, 1.1003, 6)
+    engine._tick_recorder.close()
+    ticks = read_ticks(root, 'EURUSD')
+    assert ticks['ts_msc'].tolist() == [T0, T0 + 1]
+    assert ticks['bid'].tolist() == [1.1, 1.1001]
+    assert ticks['flags'].tolist() == [0, 6]
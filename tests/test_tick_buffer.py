@@ -0,0 +1,39 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.tick_buffer import TickRingBuffer
+
+def test_ring_buffer_wraparound():
+    buf = TickRingBuffer(4)
+    for i in range(10):
+        buf.append(1.0 + i, 0.1, 1 if i % 2 else -1, float(i))
+    assert len(buf) == 4
+    assert list(buf.prices()) == [7.0, 8.0, 9.0, 10.0]
+    assert list(buf.directions(2)) == [-1, 1]
+    assert buf.last_price == 10.0
+    assert [t['price'] for t in buf] == [7.0, 8.0, 9.0, 10.0]
+    assert buf[-1]['time'] == 9.0
+
+def test_ring_buffer_window_is_zero_copy_view():
+    buf = TickRingBuffer(8)
+    for i in range(5):
+        buf.append(float(i), 0.0, 0, 0.0)
+    view = buf.prices(3)
+    assert view.base is not None
+    assert not view.flags.writeable
+    assert view.dtype.name == 'float64'
+    assert buf.directions().dtype.name == 'int8'
+    with pytest.raises(ValueError):
+        view[0] = 1.0
+
+def test_bump_last_accorpa_quotazioni_invariate():
+    buf = TickRingBuffer(4)
+    buf.append(1.0, 0.0, 0, 1.0)
+    buf.bump_last(2.0)
+    buf.bump_last(3.0)
+    assert len(buf) == 1
+    assert buf[-1]['repeats'] == 2
+    assert buf.last_time == 3.0
+    buf.append(1.1, 0.1, 1, 4.0)
+    assert list(buf.repeats()) == [2, 0]
@@ -0,0 +1,41 @@
+import pytest
+import sys
+import os
+import time
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+from core.tick_ingestion import TickIngestor
+
+def test_offer_scarta_duplicati_e_tick_vecchi_se_coda_piena():
+    ingestor = TickIngestor(['EURUSD'], on_tick=lambda s, t: None, queue_size=2, fetch_tick=lambda symbol: None)
+    for msc in (1, 1, 2, 3, 4):
+        ingestor.offer('EURUSD', SimpleNamespace(bid=1.1, ask=1.1002, time_msc=msc))
+    stats = ingestor.get_stats('EURUSD')
+    assert stats['duplicates'] == 1
+    assert stats['enqueued'] == 4
+    assert stats['dropped'] == 2
+    assert stats['queue_depth'] == 2
+
+def test_worker_consuma_i_tick_per_simbolo():
+    ricevuti = []
+    contatore = {'EURUSD': 0, 'GBPUSD': 0}
+    def fetch(symbol):
+        contatore[symbol] += 1
+        return SimpleNamespace(bid=1.1, ask=1.1002, time_msc=contatore[symbol])
+    ingestor = TickIngestor(['EURUSD', 'GBPUSD'], on_tick=lambda s, t: ricevuti.append((s, t.time_msc)),
+                            poll_interval=0.01, fetch_tick=fetch)
+    ingestor.start()
+    time.sleep(0.2)
+    ingestor.stop()
+    assert {s for s, _ in ricevuti} == {'EURUSD', 'GBPUSD'}
+    assert ingestor.get_stats('EURUSD')['processed'] > 0
+
+def test_backend_impostato_dopo_la_creazione():
+    from core.mt5_backend import set_backend
+    ingestor = TickIngestor(['EURUSD'], on_tick=lambda s, t: None)
+    backend = SimpleNamespace(symbol_info_tick=lambda symbol: SimpleNamespace(bid=1.1, ask=1.1002, time_msc=7))
+    previous = set_backend(backend)
+    try:
+        assert ingestor.fetch_tick('EURUSD').time_msc == 7
+    finally:
+        set_backend(previous)
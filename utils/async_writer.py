@@ -0,0 +1,245 @@
+# async_writer.py
+"""
+Modulo async_writer: scrittura file in background a batch, con coda limitata e rotazione file.
+"""
+import atexit
+import csv
+from abc import ABC, abstractmethod
+import datetime
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Sequence
+
+from utils.constants import (
+    DEFAULT_ASYNC_LOG_QUEUE_SIZE, DEFAULT_ASYNC_LOG_BATCH_SIZE,
+    DEFAULT_ASYNC_LOG_FLUSH_INTERVAL, DEFAULT_ASYNC_LOG_MAX_SIZE_MB
+)
+
+
+class AsyncBatchWriter(ABC):
+    """
+    Il thread chiamante fa solo un put_nowait su una coda limitata: apertura file, scrittura,
+    flush e rotazione avvengono nel thread writer, a batch di `batch_size` righe o ogni
+    `flush_interval` secondi. A coda piena la riga viene scartata (dropped) senza attendere.
+
+    Il file resta aperto tra un batch e l'altro; la dimensione viene seguita con tell(),
+    quindi la rotazione oltre `max_size_mb` non richiede stat del file a ogni riga.
+
+    Le sottoclassi definiscono il formato con _open_file (apertura + eventuale header)
+    e _write_rows (scrittura di un batch sul file aperto), e il nome del thread con thread_name.
+    Dopo close() il writer non accetta più righe: write() le scarta restituendo False.
+    """
+
+    thread_name = 'batch-writer'
+
+    def __init__(self, path: str, queue_size: int = DEFAULT_ASYNC_LOG_QUEUE_SIZE,
+                 batch_size: int = DEFAULT_ASYNC_LOG_BATCH_SIZE, flush_interval: float = DEFAULT_ASYNC_LOG_FLUSH_INTERVAL,
+                 max_size_mb: float = DEFAULT_ASYNC_LOG_MAX_SIZE_MB):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.logger = logging.getLogger("phoenix_quantum")
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop_event = threading.Event()
+        self._file = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._stats = {
+            'enqueued': 0,
+            'dropped': 0,
+            'dropped_closed': 0,
+            'written': 0,
+            'batches': 0,
+            'rotations': 0,
+            'errors': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0
+        }
+
+    # ------------------------------------------------------------------
+    # Lato produttore (thread di trading)
+    # ------------------------------------------------------------------
+    def write(self, row: Sequence) -> bool:
+        """Accoda una riga senza bloccare; restituisce False se la coda è piena o il writer è chiuso."""
+        if self._closed:
+            self._stats['dropped'] += 1
+            if self._stats['dropped_closed'] == 0:
+                self.logger.warning(f"[ASYNC-CSV] Scrittura su writer chiuso {self.path}: righe scartate")
+            self._stats['dropped_closed'] += 1
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._stats['dropped'] += 1
+            return False
+        self._stats['enqueued'] += 1
+        return True
+
+    def stats(self) -> Dict:
+        return dict(self._stats, queue_depth=self._queue.qsize())
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Ferma il writer scrivendo le righe ancora in coda; le write() successive sono rifiutate."""
+        self._closed = True
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+        self._close_file()
+
+    # ------------------------------------------------------------------
+    # Thread writer
+    # ------------------------------------------------------------------
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=f"{self.thread_name}-{os.path.basename(self.path)}", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            if batch:
+                self._write_batch(batch)
+            elif self._stop_event.is_set():
+                break
+
+    def _collect_batch(self) -> List:
+        batch = []
+        deadline = time.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._stop_event.is_set():
+                # In chiusura: svuota la coda senza attese
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    break
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=min(remaining, 0.2)))
+            except queue.Empty:
+                continue
+        return batch
+
+    def _write_batch(self, batch: List) -> None:
+        started = time.time()
+        try:
+            if self._file is None or self._file.tell() > self.max_bytes:
+                self._rotate_if_needed()
+            self._write_rows(batch)
+            self._file.flush()
+            self._stats['written'] += len(batch)
+            self._stats['batches'] += 1
+        except Exception as e:
+            self._stats['errors'] += 1
+            self.logger.error(f"[ASYNC-CSV] Errore scrittura {self.path}: {e}")
+            self._close_file()
+        flush_ms = (time.time() - started) * 1000
+        self._stats['last_flush_ms'] = flush_ms
+        if flush_ms > self._stats['max_flush_ms']:
+            self._stats['max_flush_ms'] = flush_ms
+
+    def _rotate_if_needed(self) -> None:
+        self._close_file()
+        if os.path.isfile(self.path) and os.path.getsize(self.path) > self.max_bytes:
+            base, ext = os.path.splitext(self.path)
+            ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+            rotated = f"{base}_{ts}{ext}"
+            suffix = 1
+            while os.path.exists(rotated):
+                rotated = f"{base}_{ts}_{suffix}{ext}"
+                suffix += 1
+            os.rename(self.path, rotated)
+            self._stats['rotations'] += 1
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = self._open_file()
+
+    @abstractmethod
+    def _open_file(self):
+        """Apre self.path in append (scrivendo l'eventuale header) e restituisce l'handle."""
+
+    @abstractmethod
+    def _write_rows(self, batch: List) -> None:
+        """Scrive un batch di righe sul file aperto."""
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+        self._file = None
+
+
+class AsyncCSVWriter(AsyncBatchWriter):
+    """Writer asincrono CSV: header scritto solo se il file è nuovo."""
+
+    thread_name = 'csv-writer'
+
+    def __init__(self, path: str, header: Sequence[str], **kwargs):
+        self.header = list(header)
+        self._writer = None
+        super().__init__(path, **kwargs)
+
+    def _open_file(self):
+        handle = open(self.path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(handle)
+        if handle.tell() == 0:
+            self._writer.writerow(self.header)
+        return handle
+
+    def _write_rows(self, batch: List) -> None:
+        self._writer.writerows(batch)
+
+
+_writers: Dict[str, AsyncBatchWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_async_writer(path: str, factory: Callable[[], AsyncBatchWriter]) -> AsyncBatchWriter:
+    """
+    Restituisce il writer condiviso per il percorso (uno solo per file, creato al primo uso con factory);
+    un writer chiuso viene sostituito.
+    """
+    writer = _writers.get(path)
+    if writer is None or writer.closed:
+        with _writers_lock:
+            writer = _writers.get(path)
+            if writer is None or writer.closed:
+                writer = factory()
+                _writers[path] = writer
+    return writer
+
+
+def get_async_csv_writer(path: str, header: Sequence[str], **kwargs) -> AsyncCSVWriter:
+    return get_async_writer(path, lambda: AsyncCSVWriter(path, header, **kwargs))
+
+
+def get_async_writers_stats() -> Dict[str, Dict]:
+    return {os.path.basename(path): writer.stats() for path, writer in list(_writers.items())}
+
+
+def close_async_writers(timeout: float = 2.0) -> None:
+    for writer in list(_writers.values()):
+        writer.close(timeout)
+
+
+atexit.register(close_async_writers)
@@ -10,6 +10,18 @@ DEFAULT_LOG_MAX_BYTES = 10 * 1024 * 1024  # 10 MB
 DEFAULT_LOG_BACKUP_COUNT = 5
 DEFAULT_LOG_ENCODING = 'utf-8'
 
+# Writer CSV asincrono (log segnali/tick)
+DEFAULT_ASYNC_LOG_QUEUE_SIZE = 10000
+DEFAULT_ASYNC_LOG_BATCH_SIZE = 500
+DEFAULT_ASYNC_LOG_FLUSH_INTERVAL = 1.0  # secondi
+DEFAULT_ASYNC_LOG_MAX_SIZE_MB = 10
+
+# Snapshot MT5 per ciclo (posizioni, account, symbol_info)
+DEFAULT_MT5_SNAPSHOT_MAX_AGE = 1.0  # secondi
+
+# Registro metadati simboli (point, digits, volumi): rilettura periodica da MT5
+DEFAULT_SYMBOL_META_REFRESH_INTERVAL = 3600  # secondi
+
 # Parametri di default QuantumEngine
 DEFAULT_CACHE_TIMEOUT = 60
 DEFAULT_WARNING_COOLDOWN = 300
@@ -0,0 +1,98 @@
+# decision_report.py
+"""
+Modulo decision_report: sink condiviso del report decisioni di trading (trade_decision_report.csv),
+con scrittura a batch, rotazione e soppressione dei motivi consecutivi invariati per simbolo.
+"""
+import datetime
+import os
+import threading
+import time
+from typing import Dict
+
+from utils.async_writer import AsyncCSVWriter, get_async_csv_writer
+
+REPORT_HEADER = ['timestamp', 'symbol', 'step', 'detail', 'extra']
+
+
+class DecisionReportSink:
+    """
+    Una riga viene scritta solo quando il motivo di blocco (step) di un simbolo cambia, oppure
+    ogni `repeat_interval` secondi se resta invariato; in quel caso `extra` riporta quante
+    valutazioni identiche sono state accorpate. Le righe passano dal writer asincrono,
+    quindi il chiamante non apre mai il file.
+    """
+
+    def __init__(self, writer: AsyncCSVWriter, repeat_interval: float = 300.0):
+        self.writer = writer
+        self.repeat_interval = repeat_interval
+        self._last = {}  # symbol -> [step, ts_ultima_scrittura, ripetizioni_soppresse, detail]
+        self._lock = threading.Lock()
+        self.written = 0
+        self.suppressed = 0
+
+    def _row(self, symbol: str, step: str, detail: str, extra) -> None:
+        self.writer.write([
+            datetime.datetime.now().isoformat(sep=' ', timespec='seconds'),
+            symbol,
+            step,
+            detail,
+            extra if extra is not None else ''
+        ])
+
+    def write(self, symbol: str, step: str, detail: str, extra=None) -> bool:
+        """
+        Registra la decisione; restituisce False se accorpata alla precedente. Quando il motivo
+        cambia, le ripetizioni soppresse del motivo precedente vengono scritte in una riga di riepilogo.
+        """
+        now = time.time()
+        with self._lock:
+            last = self._last.get(symbol)
+            if last is not None and last[0] == step and now - last[1] < self.repeat_interval:
+                last[2] += 1
+                self.suppressed += 1
+                return False
+            repeats = last[2] if last is not None and last[0] == step else 0
+            summary = last if last is not None and last[0] != step and last[2] else None
+            self._last[symbol] = [step, now, 0, detail]
+            self.written += 2 if summary else 1
+        if summary:
+            self._row(symbol, summary[0], summary[3], f"ripetuto {summary[2]} volte")
+        if repeats:
+            extra = f"{extra} | ripetuto {repeats} volte" if extra else f"ripetuto {repeats} volte"
+        self._row(symbol, step, detail, extra)
+        return True
+
+    def reset(self, symbol: str = None) -> None:
+        """
+        Dimentica l'ultimo motivo (di un simbolo o di tutti): la prossima decisione viene sempre scritta.
+        Le ripetizioni soppresse non ancora riportate vengono scritte prima come riepilogo.
+        """
+        with self._lock:
+            symbols = list(self._last) if symbol is None else [symbol]
+            pending = [(s, self._last.pop(s)) for s in symbols if s in self._last]
+            pending = [(s, last) for s, last in pending if last[2]]
+            self.written += len(pending)
+        for s, last in pending:
+            self._row(s, last[0], last[3], f"ripetuto {last[2]} volte")
+
+    def stats(self) -> Dict:
+        return {'written': self.written, 'suppressed': self.suppressed, 'writer': self.writer.stats()}
+
+
+_sinks: Dict[str, DecisionReportSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_decision_report(report_path: str = None) -> DecisionReportSink:
+    """Sink condiviso per il percorso (default logs/trade_decision_report.csv nella root del progetto)."""
+    if report_path is None:
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        report_path = os.path.join(project_root, 'logs', 'trade_decision_report.csv')
+    sink = _sinks.get(report_path)
+    if sink is None:
+        with _sinks_lock:
+            sink = _sinks.get(report_path)
+            if sink is None:
+                sink = DecisionReportSink(get_async_csv_writer(report_path, REPORT_HEADER))
+                _sinks[report_path] = sink
+    return sink
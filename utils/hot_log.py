@@ -0,0 +1,70 @@
+# hot_log.py
+"""
+Modulo hot_log: logging per il percorso per-tick, con controllo del livello prima di formattare
+e record strutturati chiave=valore formattati solo se un handler li emette.
+"""
+import logging
+
+
+class _Fields:
+    """Campi chiave/valore di un record: la stringa viene costruita solo in fase di emissione."""
+    __slots__ = ('fields',)
+
+    def __init__(self, fields: dict):
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return ' '.join(
+            f"{key}={value:.6g}" if isinstance(value, float) else f"{key}={value}"
+            for key, value in self.fields.items()
+        )
+
+
+class HotPathLogger:
+    """
+    Wrapper del logger "phoenix_quantum" per il codice eseguito a ogni tick/ciclo.
+
+    `hot.debug("TAG", symbol=s, price=p)` non costruisce nessuna stringa se il livello è
+    disabilitato. Profilo "quiet": sotto WARNING il percorso caldo non logga nulla,
+    indipendentemente dal livello del logger. Per evitare anche il dict dei kwargs nei
+    punti più frequenti si può controllare prima `hot.debug_enabled`.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.quiet = False
+
+    def configure(self, profile: str = 'normal') -> None:
+        self.quiet = profile == 'quiet'
+
+    def enabled(self, level: int) -> bool:
+        if self.quiet and level < logging.WARNING:
+            return False
+        return self.logger.isEnabledFor(level)
+
+    @property
+    def debug_enabled(self) -> bool:
+        return self.enabled(logging.DEBUG)
+
+    def log(self, level: int, tag: str, **fields) -> None:
+        if not self.enabled(level):
+            return
+        self.logger.log(level, "[%s] %s", tag, _Fields(fields))
+
+    def record(self, level: int, tag: str, **fields) -> None:
+        """Record strutturato fuori dal percorso caldo (es. heartbeat): solo controllo livello, ignora il profilo quiet."""
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, "[%s] %s", tag, _Fields(fields))
+
+    def debug(self, tag: str, **fields) -> None:
+        self.log(logging.DEBUG, tag, **fields)
+
+    def info(self, tag: str, **fields) -> None:
+        self.log(logging.INFO, tag, **fields)
+
+    def warning(self, tag: str, **fields) -> None:
+        self.log(logging.WARNING, tag, **fields)
+
+
+# Istanza condivisa: il profilo si imposta una volta all'avvio (logging.hot_path_profile)
+hot_log = HotPathLogger(logging.getLogger("phoenix_quantum"))
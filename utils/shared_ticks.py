@@ -0,0 +1,54 @@
+# shared_ticks.py
+"""
+Modulo shared_ticks: dataset di tick condivisi tra processi. Il processo principale pubblica una volta
+ogni array come file .npy; i worker lo aprono in memory map di sola lettura, così le pagine restano
+nella page cache del sistema, condivise da tutti i processi, senza copie né decompressione per worker.
+"""
+import os
+import shutil
+import tempfile
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def open_shared(path: str) -> np.ndarray:
+    """Vista NumPy di sola lettura sul dataset pubblicato (nessuna copia in memoria)."""
+    return np.load(path, mmap_mode='r')
+
+
+class SharedTickStore:
+    """Directory di dataset .npy (uno per nome) creata dal processo principale e rimossa da close()."""
+
+    def __init__(self, directory: Optional[str] = None):
+        self._owned = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix='phoenix_ticks_')
+        os.makedirs(self.directory, exist_ok=True)
+        self._paths: Dict[str, str] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._paths
+
+    def path(self, name: str) -> Optional[str]:
+        return self._paths.get(name)
+
+    def publish(self, name: str, data: np.ndarray) -> str:
+        """Scrive il dataset (rename atomico: un worker non vede mai un file parziale) e ne restituisce il path."""
+        path = os.path.join(self.directory, f"{name}.npy")
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(data))
+        os.replace(tmp_path, path)
+        self._paths[name] = path
+        return path
+
+    def close(self) -> None:
+        """Rimuove i dataset pubblicati (la directory solo se creata dallo store)."""
+        for path in self._paths.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._paths.clear()
+        if self._owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,233 @@
+# signal_journal.py
+"""
+Modulo signal_journal: journal binario append-only dei segnali a record fissi, con API di lettura,
+e aggregazione dei segnali HOLD per intervallo.
+"""
+import datetime
+import glob
+import os
+import threading
+import time
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from utils.async_writer import AsyncBatchWriter, get_async_writer
+
+# Header di file: magic + versione formato (16 byte, poi solo record JOURNAL_DTYPE)
+JOURNAL_MAGIC = b'PQSJ'
+JOURNAL_VERSION = 1
+JOURNAL_HEADER_SIZE = 16
+
+JOURNAL_DTYPE = np.dtype([
+    ('ts', '<f8'),          # epoch secondi
+    ('symbol', 'S16'),
+    ('price', '<f8'),
+    ('entropy', '<f8'),
+    ('spin', '<f8'),
+    ('confidence', '<f8'),
+    ('signal', 'u1'),       # indice in SIGNAL_CODES
+    ('reason', 'u1'),       # indice in REASON_CODES
+])
+
+SIGNAL_CODES = ('HOLD', 'BUY', 'SELL', 'SCARTATO')
+
+# Codici motivo: si aggiungono solo in coda, per non cambiare il significato dei journal esistenti
+REASON_CODES = (
+    'Altro',
+    'Buffer tick insufficiente',
+    'Confidence troppo bassa',
+    'Cooldown segnale attivo',
+    'Condizioni BUY',
+    'Condizioni SELL',
+    'Nessuna condizione BUY/SELL',
+)
+
+_SIGNAL_INDEX = {name: i for i, name in enumerate(SIGNAL_CODES)}
+_REASON_INDEX = {name: i for i, name in enumerate(REASON_CODES)}
+
+
+def encode_signal(signal: str) -> int:
+    return _SIGNAL_INDEX.get(signal, 0)
+
+
+def encode_reason(reason: str) -> int:
+    """Codice del motivo; i motivi con dettagli variabili (es. 'Confidence troppo bassa (0.42)') usano il prefisso."""
+    if not reason:
+        return 0
+    code = _REASON_INDEX.get(reason)
+    if code is not None:
+        return code
+    for i, name in enumerate(REASON_CODES[1:], start=1):
+        if reason.startswith(name):
+            return i
+    return 0
+
+
+def _journal_header() -> bytes:
+    header = JOURNAL_MAGIC + JOURNAL_VERSION.to_bytes(2, 'little')
+    return header.ljust(JOURNAL_HEADER_SIZE, b'\0')
+
+
+class SignalJournalWriter(AsyncBatchWriter):
+    """Writer asincrono del journal: ogni batch è un unico tobytes() di un array JOURNAL_DTYPE."""
+
+    thread_name = 'journal-writer'
+
+    def _open_file(self):
+        handle = open(self.path, 'ab')
+        if handle.tell() == 0:
+            handle.write(_journal_header())
+        return handle
+
+    def _write_rows(self, batch: List) -> None:
+        self._file.write(np.array(batch, dtype=JOURNAL_DTYPE).tobytes())
+
+    def record(self, symbol: str, price: float, entropy: float, spin: float, confidence: float,
+               signal: str, reason: str = None, ts: float = None) -> bool:
+        return self.write((
+            datetime.datetime.now().timestamp() if ts is None else ts,
+            symbol.encode('ascii', 'replace')[:16],
+            price, entropy, spin, confidence,
+            encode_signal(signal), encode_reason(reason)
+        ))
+
+
+def get_signal_journal(path: str = None) -> SignalJournalWriter:
+    """Journal condiviso (default logs/signals_journal.bin nella root del progetto)."""
+    if path is None:
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        path = os.path.join(project_root, 'logs', 'signals_journal.bin')
+    return get_async_writer(path, lambda: SignalJournalWriter(path))
+
+
+# ----------------------------------------------------------------------
+# Lettura
+# ----------------------------------------------------------------------
+def read_signal_journal(path: str, mmap: bool = False) -> np.ndarray:
+    """Legge un file journal come array strutturato JOURNAL_DTYPE (mmap=True: memory map senza copia)."""
+    with open(path, 'rb') as f:
+        header = f.read(JOURNAL_HEADER_SIZE)
+    if len(header) < JOURNAL_HEADER_SIZE or header[:4] != JOURNAL_MAGIC:
+        raise ValueError(f"File journal non valido: {path}")
+    version = int.from_bytes(header[4:6], 'little')
+    if version != JOURNAL_VERSION:
+        raise ValueError(f"Versione journal non supportata: {version} ({path})")
+    count = (os.path.getsize(path) - JOURNAL_HEADER_SIZE) // JOURNAL_DTYPE.itemsize
+    if count <= 0:
+        return np.empty(0, dtype=JOURNAL_DTYPE)
+    if mmap:
+        return np.memmap(path, dtype=JOURNAL_DTYPE, mode='r', offset=JOURNAL_HEADER_SIZE, shape=(count,))
+    # Un eventuale record troncato in coda (scrittura interrotta) viene ignorato
+    return np.fromfile(path, dtype=JOURNAL_DTYPE, count=count, offset=JOURNAL_HEADER_SIZE)
+
+
+def journal_files(log_dir: str, prefix: str = 'signals_journal') -> List[str]:
+    """File journal della cartella (correnti e ruotati) in ordine di nome."""
+    return sorted(glob.glob(os.path.join(log_dir, f"{prefix}*.bin")))
+
+
+def load_signal_journals(paths: Union[str, Iterable[str]], start: Optional[float] = None,
+                         end: Optional[float] = None, symbols: Optional[Iterable[str]] = None) -> np.ndarray:
+    """Concatena più journal (o una cartella) filtrando per intervallo ts [start, end] e simboli."""
+    if isinstance(paths, str):
+        paths = journal_files(paths) if os.path.isdir(paths) else [paths]
+    parts = [read_signal_journal(p) for p in paths]
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=JOURNAL_DTYPE)
+    mask = np.ones(len(records), dtype=bool)
+    if start is not None:
+        mask &= records['ts'] >= start
+    if end is not None:
+        mask &= records['ts'] <= end
+    if symbols:
+        mask &= np.isin(records['symbol'], [s.encode('ascii') for s in symbols])
+    records = records[mask]
+    return records[np.argsort(records['ts'], kind='stable')]
+
+
+def _local_utc_offsets(ts: np.ndarray) -> np.ndarray:
+    """
+    Offset UTC locale (secondi) in vigore a ciascun timestamp, con le regole del sistema (ora legale
+    inclusa) usate da datetime.now(). I cambi d'ora cadono su multipli di 15 minuti: basta un
+    calcolo per quarto d'ora distinto invece che per riga.
+    """
+    quarters, inverse = np.unique(np.floor_divide(ts, 900).astype(np.int64), return_inverse=True)
+    offsets = np.array([
+        datetime.datetime.fromtimestamp(int(q) * 900).astimezone().utcoffset().total_seconds()
+        for q in quarters
+    ], dtype=np.float64)
+    return offsets[inverse.reshape(-1)] if len(quarters) else np.zeros(len(ts))
+
+
+def journal_to_dataframe(records: np.ndarray):
+    """DataFrame pandas con timestamp, simbolo, segnale e motivo decodificati (richiede pandas)."""
+    import pandas as pd
+    # Orario locale come nel CSV dei segnali (datetime.now()), con l'offset valido per ogni record
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime(records['ts'] + _local_utc_offsets(records['ts']), unit='s'),
+        'symbol': np.char.decode(records['symbol'], 'ascii'),
+        'price': records['price'],
+        'entropy': records['entropy'],
+        'spin': records['spin'],
+        'confidence': records['confidence'],
+    })
+    df['signal'] = pd.Categorical.from_codes(records['signal'], categories=list(SIGNAL_CODES))
+    df['reason'] = pd.Categorical.from_codes(records['reason'], categories=list(REASON_CODES))
+    return df
+
+
+# ----------------------------------------------------------------------
+# Aggregazione HOLD
+# ----------------------------------------------------------------------
+HOLD_SUMMARY_HEADER = ['first_ts', 'last_ts', 'symbol', 'reason', 'count',
+                       'min_confidence', 'max_confidence', 'last_price']
+
+
+class HoldAggregator:
+    """
+    Accorpa le decisioni HOLD per (simbolo, motivo) su intervalli di `interval` secondi:
+    a fine intervallo ogni gruppo produce una sola riga riepilogo (HOLD_SUMMARY_HEADER)
+    tramite `emit(row)`. BUY/SELL non passano di qui e restano loggati singolarmente.
+    """
+
+    def __init__(self, emit, interval: float = 60.0):
+        self.emit = emit
+        self.interval = interval
+        self._buckets = {}
+        self._window_start = None
+        self._lock = threading.Lock()
+
+    def add(self, symbol: str, reason: str, confidence: float, price: float, ts: float = None) -> None:
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            if self._window_start is None:
+                self._window_start = ts
+            elif ts - self._window_start >= self.interval:
+                self._flush_locked()
+                self._window_start = ts
+            bucket = self._buckets.get((symbol, reason))
+            if bucket is None:
+                self._buckets[(symbol, reason)] = [ts, ts, 1, confidence, confidence, price]
+            else:
+                bucket[1] = ts
+                bucket[2] += 1
+                if confidence < bucket[3]:
+                    bucket[3] = confidence
+                if confidence > bucket[4]:
+                    bucket[4] = confidence
+                bucket[5] = price
+
+    def flush(self) -> None:
+        """Emette subito i riepiloghi dell'intervallo corrente (es. in chiusura)."""
+        with self._lock:
+            self._flush_locked()
+            self._window_start = None
+
+    def _flush_locked(self) -> None:
+        for (symbol, reason), (first_ts, last_ts, count, min_conf, max_conf, price) in self._buckets.items():
+            self.emit([
+                datetime.datetime.fromtimestamp(first_ts).isoformat(sep=' ', timespec='seconds'),
+                datetime.datetime.fromtimestamp(last_ts).isoformat(sep=' ', timespec='seconds'),
+                symbol, reason, count, round(min_conf, 4), round(max_conf, 4), price
+            ])
+        self._buckets = {}
@@ -0,0 +1,243 @@
+# tick_archive.py
+"""
+Modulo tick_archive: archivio dei tick visti dall'engine, un file compresso a colonne per simbolo
+e giorno (ts_msc, bid, ask, flags), con lettura indicizzata per intervallo di tempo su memory map.
+"""
+import datetime
+import glob
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.async_writer import AsyncBatchWriter, get_async_writer
+
+TICK_DTYPE = np.dtype([('ts_msc', '<i8'), ('bid', '<f8'), ('ask', '<f8'), ('flags', 'u1')])
+
+# File: header (magic + versione, 16 byte) seguito da chunk indipendenti aggiunti in coda.
+# Chunk: header fisso CHUNK_HEADER + colonne compresse con zlib (ts come delta, prezzi con byte shuffle).
+ARCHIVE_MAGIC = b'PQTA'
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER_SIZE = 16
+ARCHIVE_EXT = '.pqt'
+CHUNK_MAGIC = b'PQTC'
+CHUNK_HEADER = struct.Struct('<4sIqqIIII')  # magic, count, first_ts, last_ts, len ts/bid/ask/flags
+
+INDEX_DTYPE = np.dtype([('first_ts', '<i8'), ('last_ts', '<i8'), ('offset', '<i8'), ('count', '<u4')])
+
+
+def _archive_header() -> bytes:
+    return (ARCHIVE_MAGIC + ARCHIVE_VERSION.to_bytes(2, 'little')).ljust(ARCHIVE_HEADER_SIZE, b'\0')
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    # Byte dello stesso peso contigui: i float di prezzi vicini comprimono molto meglio
+    return np.ascontiguousarray(values, dtype='<f8').view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(data: bytes, count: int) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8).reshape(8, count).T.copy().view('<f8').ravel()
+
+
+def encode_chunk(ticks: np.ndarray) -> bytes:
+    """Serializza un array TICK_DTYPE (ordinato per ts_msc) in un chunk compresso."""
+    ts = ticks['ts_msc'].astype('<i8')
+    columns = [
+        zlib.compress(np.diff(ts, prepend=np.int64(0)).astype('<i8').tobytes()),
+        zlib.compress(_shuffle(ticks['bid'])),
+        zlib.compress(_shuffle(ticks['ask'])),
+        zlib.compress(ticks['flags'].astype('u1').tobytes()),
+    ]
+    header = CHUNK_HEADER.pack(CHUNK_MAGIC, len(ticks), int(ts[0]), int(ts[-1]), *(len(c) for c in columns))
+    return header + b''.join(columns)
+
+
+def decode_chunk(buffer, offset: int) -> np.ndarray:
+    magic, count, _, _, *lengths = CHUNK_HEADER.unpack_from(buffer, offset)
+    if magic != CHUNK_MAGIC:
+        raise ValueError(f"Chunk tick non valido all'offset {offset}")
+    pos = offset + CHUNK_HEADER.size
+    raw = []
+    for length in lengths:
+        raw.append(zlib.decompress(buffer[pos:pos + length]))
+        pos += length
+    ticks = np.empty(count, dtype=TICK_DTYPE)
+    ticks['ts_msc'] = np.cumsum(np.frombuffer(raw[0], dtype='<i8'))
+    ticks['bid'] = _unshuffle(raw[1], count)
+    ticks['ask'] = _unshuffle(raw[2], count)
+    ticks['flags'] = np.frombuffer(raw[3], dtype='u1')
+    return ticks
+
+
+def archive_path(root: str, symbol: str, day: datetime.date) -> str:
+    return os.path.join(root, symbol, day.strftime('%Y-%m-%d') + ARCHIVE_EXT)
+
+
+def _day_of(ts_msc: int) -> datetime.date:
+    return datetime.datetime.fromtimestamp(ts_msc / 1000, tz=datetime.timezone.utc).date()
+
+
+# ----------------------------------------------------------------------
+# Scrittura
+# ----------------------------------------------------------------------
+class TickArchiveWriter(AsyncBatchWriter):
+    """
+    Recorder dei tick: record() accoda senza bloccare (stessa coda limitata e thread di
+    AsyncBatchWriter); il thread raggruppa ogni batch per simbolo e giorno UTC e aggiunge
+    un chunk compresso al file corrispondente. `path` è la cartella radice dell'archivio.
+    """
+
+    thread_name = 'tick-archive-writer'
+
+    def record(self, symbol: str, ts_msc: int, bid: float, ask: float, flags: int = 0) -> bool:
+        return self.write((symbol, ts_msc, bid, ask, flags))
+
+    def _open_file(self):
+        # Nessun file unico: _write_rows apre in append i file giornalieri di ogni batch
+        return None
+
+    def _write_batch(self, batch: List) -> None:
+        started = time.time()
+        self._write_rows(batch)
+        self._stats['batches'] += 1
+        flush_ms = (time.time() - started) * 1000
+        self._stats['last_flush_ms'] = flush_ms
+        if flush_ms > self._stats['max_flush_ms']:
+            self._stats['max_flush_ms'] = flush_ms
+
+    def _write_rows(self, batch: List) -> None:
+        groups = defaultdict(list)
+        for symbol, ts_msc, bid, ask, flags in batch:
+            groups[(symbol, _day_of(ts_msc))].append((ts_msc, bid, ask, flags))
+        for (symbol, day), rows in groups.items():
+            try:
+                ticks = np.array(rows, dtype=TICK_DTYPE)
+                ticks = ticks[np.argsort(ticks['ts_msc'], kind='stable')]
+                path = archive_path(self.path, symbol, day)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'ab') as f:
+                    if f.tell() == 0:
+                        f.write(_archive_header())
+                    f.write(encode_chunk(ticks))
+                self._stats['written'] += len(rows)
+            except Exception as e:
+                self._stats['errors'] += 1
+                self.logger.error(f"[TICK-ARCHIVE] Errore scrittura {symbol} {day}: {e}")
+
+
+def get_tick_recorder(root: str = None, **kwargs) -> TickArchiveWriter:
+    """Recorder condiviso per la cartella (default data/ticks nella root del progetto)."""
+    if root is None:
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        root = os.path.join(project_root, 'data', 'ticks')
+    return get_async_writer(root, lambda: TickArchiveWriter(root, **kwargs))
+
+
+# ----------------------------------------------------------------------
+# Lettura
+# ----------------------------------------------------------------------
+class TickArchiveFile:
+    """
+    File giornaliero aperto in memory map. L'indice dei chunk (first_ts, last_ts, offset, count)
+    si costruisce leggendo solo gli header; read() decomprime i soli chunk che intersecano
+    l'intervallo richiesto. Un chunk troncato in coda (scrittura interrotta) viene ignorato.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        header = self._map[:ARCHIVE_HEADER_SIZE]
+        if len(header) < ARCHIVE_HEADER_SIZE or header[:4] != ARCHIVE_MAGIC:
+            self.close()
+            raise ValueError(f"File archivio tick non valido: {path}")
+        version = int.from_bytes(header[4:6], 'little')
+        if version != ARCHIVE_VERSION:
+            self.close()
+            raise ValueError(f"Versione archivio tick non supportata: {version} ({path})")
+        self.index = self._build_index(size)
+
+    def _build_index(self, size: int) -> np.ndarray:
+        entries = []
+        offset = ARCHIVE_HEADER_SIZE
+        while offset + CHUNK_HEADER.size <= size:
+            magic, count, first_ts, last_ts, *lengths = CHUNK_HEADER.unpack_from(self._map, offset)
+            end = offset + CHUNK_HEADER.size + sum(lengths)
+            if magic != CHUNK_MAGIC or end > size:
+                break
+            entries.append((first_ts, last_ts, offset, count))
+            offset = end
+        return np.array(entries, dtype=INDEX_DTYPE)
+
+    def __len__(self) -> int:
+        return int(self.index['count'].sum())
+
+    def read(self, start_msc: Optional[int] = None, end_msc: Optional[int] = None) -> np.ndarray:
+        """Tick con start_msc <= ts_msc <= end_msc (estremi opzionali)."""
+        index = self.index
+        mask = np.ones(len(index), dtype=bool)
+        if start_msc is not None:
+            mask &= index['last_ts'] >= start_msc
+        if end_msc is not None:
+            mask &= index['first_ts'] <= end_msc
+        parts = [decode_chunk(self._map, int(offset)) for offset in index['offset'][mask]]
+        if not parts:
+            return np.empty(0, dtype=TICK_DTYPE)
+        ticks = np.concatenate(parts)
+        keep = np.ones(len(ticks), dtype=bool)
+        if start_msc is not None:
+            keep &= ticks['ts_msc'] >= start_msc
+        if end_msc is not None:
+            keep &= ticks['ts_msc'] <= end_msc
+        return ticks[keep]
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def archive_symbols(root: str) -> List[str]:
+    return sorted(d for d in os.listdir(root) if os.path.isdir(os.path.join(root, d))) if os.path.isdir(root) else []
+
+
+def archive_files(root: str, symbol: str, start_msc: Optional[int] = None, end_msc: Optional[int] = None) -> List[str]:
+    """File giornalieri del simbolo che possono contenere tick nell'intervallo, in ordine cronologico."""
+    first_day = _day_of(start_msc) if start_msc is not None else None
+    last_day = _day_of(end_msc) if end_msc is not None else None
+    files = []
+    for path in sorted(glob.glob(os.path.join(root, symbol, '*' + ARCHIVE_EXT))):
+        day = datetime.date.fromisoformat(os.path.basename(path)[:-len(ARCHIVE_EXT)])
+        if (first_day is None or day >= first_day) and (last_day is None or day <= last_day):
+            files.append(path)
+    return files
+
+
+def read_ticks(root: str, symbol: str, start_msc: Optional[int] = None, end_msc: Optional[int] = None) -> np.ndarray:
+    """Tick archiviati di un simbolo nell'intervallo [start_msc, end_msc], ordinati per ts_msc."""
+    parts = []
+    for path in archive_files(root, symbol, start_msc, end_msc):
+        with TickArchiveFile(path) as archive:
+            parts.append(archive.read(start_msc, end_msc))
+    if not parts:
+        return np.empty(0, dtype=TICK_DTYPE)
+    ticks = np.concatenate(parts)
+    return ticks[np.argsort(ticks['ts_msc'], kind='stable')]
+
+
+def load_archive(root: str, symbols=None, start_msc: Optional[int] = None,
+                 end_msc: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """{symbol: tick} per i simboli indicati (default: tutti quelli presenti nell'archivio)."""
+    return {symbol: read_ticks(root, symbol, start_msc, end_msc) for symbol in (symbols or archive_symbols(root))}
@@ -7,6 +7,7 @@ import time
 import json
 
 from utils.constants import DEFAULT_LOG_FILE, DEFAULT_LOG_LEVEL, DEFAULT_LOG_FORMAT, DEFAULT_LOG_MAX_BYTES, DEFAULT_LOG_BACKUP_COUNT
+from utils.async_writer import get_async_csv_writer
 
 # Funzione parse_time_range già presente
 def setup_logger(config_path=None):
@@ -60,52 +61,26 @@ def parse_time_range(time_str: str) -> tuple:
     return (dt_time(0, 0), dt_time(23, 59))
 
 def log_signal_tick(symbol, tick, reason=None, log_path=None):
-    """Logga un tick di segnale su file CSV."""
+    """Logga un tick di segnale su file CSV (non bloccante: scrittura a batch nel writer asincrono)."""
     try:
         if log_path is None:
             # Scrivi nella cartella logs della root principale
             project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
             log_path = os.path.join(project_root, 'logs', 'signals_tick_log.csv')
-        # Rotazione: se il file supera 10MB, rinomina con timestamp
-        max_size_mb = 10
-        if os.path.isfile(log_path) and os.path.getsize(log_path) > max_size_mb * 1024 * 1024:
-            base, ext = os.path.splitext(log_path)
-            ts = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-            rotated = f"{base}_{ts}{ext}"
-            os.rename(log_path, rotated)
-        file_exists = os.path.isfile(log_path)
-        with open(log_path, 'a', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            if not file_exists:
-                writer.writerow(['timestamp', 'symbol', 'tick', 'reason'])
-            writer.writerow([
-                datetime.datetime.now().isoformat(sep=' ', timespec='seconds'),
-                symbol,
-                tick,
-                reason if reason else ''
-            ])
+        get_async_csv_writer(log_path, ['timestamp', 'symbol', 'tick', 'reason']).write([
+            datetime.datetime.now().isoformat(sep=' ', timespec='seconds'),
+            symbol,
+            tick,
+            reason if reason else ''
+        ])
     except Exception as e:
         logging.getLogger("phoenix_quantum").error(f"Errore log_signal_tick: {str(e)}")
 
 def write_report_row(symbol, step, detail, extra=None, report_path=None):
-    """Scrive una riga di report trade decision su file CSV."""
+    """Scrive una riga di report trade decision (sink condiviso: batch, rotazione, motivi ripetuti accorpati)."""
     try:
-        if report_path is None:
-            # Scrivi nella cartella logs della root principale
-            project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-            report_path = os.path.join(project_root, 'logs', 'trade_decision_report.csv')
-        file_exists = os.path.isfile(report_path)
-        with open(report_path, 'a', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            if not file_exists:
-                writer.writerow(['timestamp', 'symbol', 'step', 'detail', 'extra'])
-            writer.writerow([
-                datetime.datetime.now().isoformat(sep=' ', timespec='seconds'),
-                symbol,
-                step,
-                detail,
-                extra if extra is not None else ''
-            ])
+        from utils.decision_report import get_decision_report
+        get_decision_report(report_path).write(symbol, step, detail, extra)
     except Exception as e:
         logging.getLogger("phoenix_quantum").error(f"Errore scrittura report trade decision: {str(e)}")
 